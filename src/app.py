@@ -1,37 +1,154 @@
+import argparse
+import os
+import queue
+import threading
+import time
+
 import cv2
+import numpy as np
 from cv2.typing import MatLike
 
 from mode_handlers.base import BaseModeHandler
-from mode_handlers.modes import mode_map, modes2keys
-
-# Get camera frame size
-cap = cv2.VideoCapture(0)
-ret, test_frame = cap.read()
-if not ret:
-    raise RuntimeError("Cannot read from camera")
-cam_height, cam_width = test_frame.shape[:2]
-ratio = cam_width / cam_height
-print(f"Camera resolution: {cam_width}x{cam_height}, ratio: {ratio:.2f}")
-# My camera is 640x480, so I want to scale to make it bigger
-cam_width = int(cam_width * 1.5)
-cam_height = int(cam_height * 1.5)
-print(f"New Camera resolution: {cam_width}x{cam_height}, ratio: {ratio:.2f}")
+from mode_handlers.buffers import BufferPool
+from mode_handlers.frame_context import FrameContext
+from mode_handlers.modes import load_handler, mode_map, modes2keys, register_pipelines
+from mode_handlers.windows import window_manager
+from runtime.capture import CaptureThread
+from runtime.compare import CompareView
+from runtime.display import DisplayLoop
+from runtime.handler_pool import HandlerPool
+from runtime.metrics import LatencyMetrics
+from runtime.overlay import OverlayCache, draw_status_text
+from runtime.presets import apply_params, preset_params, save_preset
+from runtime.recorder import Recorder
+from runtime.scheduler import FrameScheduler
+from runtime.static_gate import StaticSceneGate
+from runtime.streaming import start_stream_server
+from runtime.sources import open_source
+
+app_start = time.perf_counter()
+
+parser = argparse.ArgumentParser(description="Interactive OpenCV playground")
+parser.add_argument(
+    "--source",
+    default="camera:0",
+    help="camera:<index>, video:<file>, images:<dir> or synthetic:<chessboard|aruco|shapes> (default: camera:0)",
+)
+parser.add_argument("--width", type=int, default=None, help="Requested frame width")
+parser.add_argument("--height", type=int, default=None, help="Requested frame height")
+parser.add_argument("--fps", type=float, default=0.0, help="Playback rate for file and synthetic sources (0 = unpaced)")
+parser.add_argument("--loop", action="store_true", help="Restart video files and image folders at the end")
+parser.add_argument("--metrics-out", default=None, help="Append per-stage latency percentiles to this JSON lines file")
+parser.add_argument("--metrics-interval", type=float, default=10.0, help="Seconds between metrics snapshots")
+parser.add_argument("--hud", action="store_true", help="Start with the latency HUD visible (toggle with 'i')")
+parser.add_argument("--handler-pool-size", type=int, default=8, help="Number of built handlers kept alive (LRU)")
+parser.add_argument(
+    "--target-fps",
+    type=float,
+    default=0.0,
+    help="Degrade slow handlers (proxy resolution, then frame skipping) to hold this frame rate (0 = off)",
+)
+parser.add_argument(
+    "--compare",
+    default=None,
+    help="Handlers for the compare view ('p') as <mode><submode> keys, e.g. 5q,5r,6e (default: current mode)",
+)
+parser.add_argument("--record-dir", default="recordings", help="Folder for recordings started with 'v'")
+parser.add_argument("--record-fps", type=float, default=30.0, help="Frame rate written into recordings")
+parser.add_argument("--stream-port", type=int, default=0, help="Serve processed frames over HTTP (MJPEG) on this port")
+parser.add_argument("--stream-host", default="0.0.0.0", help="Interface the stream server listens on")
+parser.add_argument("--stream-quality", type=int, default=80, help="JPEG quality of the stream")
+parser.add_argument(
+    "--static-threshold",
+    type=float,
+    default=0.0,
+    help="Reuse the last output while no downsampled pixel changes by more than this many gray levels (0 = off)",
+)
+parser.add_argument("--display-fps", type=float, default=60.0, help="Refresh rate of the main window and key polling")
+parser.add_argument(
+    "--presets", default="presets.json", help="Slider values per submode, applied when it is built and saved with 'k'"
+)
+parser.add_argument("--pipelines", default=None, help="JSON file of extra handler pipelines for the Pipelines mode")
+args = parser.parse_args()
+
+HUD_KEY = "i"
+RESET_HANDLER_KEY = "o"
+COMPARE_KEY = "p"
+RECORD_KEY = "v"
+SAVE_PRESET_KEY = "k"
+if args.pipelines:
+    # Submode keys are only read after these keys, so pipelines may not use them
+    register_pipelines(
+        args.pipelines, reserved_keys=frozenset({HUD_KEY, RESET_HANDLER_KEY, COMPARE_KEY, RECORD_KEY, SAVE_PRESET_KEY})
+    )
 
+# Open the frame source on the capture thread while the UI comes up
+capture = CaptureThread(
+    lambda: open_source(args.source, width=args.width, height=args.height, fps=args.fps, loop=args.loop),
+    maxlen=2,
+)
+capture.start()
+
+# The real frame size is only known once the source delivers; start with 640x480 scaled by 1.5
+cam_width, cam_height = int(640 * 1.5), int(480 * 1.5)
 scaled_height = cam_width
-cv2.namedWindow("frame", cv2.WINDOW_NORMAL)
-cv2.resizeWindow("frame", cam_width, cam_height)
+window_manager.open("frame", cv2.WINDOW_NORMAL, (cam_width, cam_height))
 
 # Start with Color Channel mode (mode "1")
 mode = "Color Channel"
 submode = "RGB"
+submode_key = "q"
 last_key = -1
 current_handler: BaseModeHandler = None  # Track the current submode handler
+# Built handlers stay alive across switches, so switching back to an expensive mode is instant
+# Evicted handlers take their control panels and extra windows with them
+handler_pool = HandlerPool(max_size=args.handler_pool_size, on_evict=lambda key, handler: evict_handler(key, handler))
+# Slider values of evicted handlers, restored when the submode is built again in this session
+session_params: dict[tuple[str, str], dict[str, int]] = {}
+
+# Steps heavy handlers down to a proxy resolution / every Nth frame when they exceed the frame budget
+scheduler = FrameScheduler(args.target_fps) if args.target_fps > 0 else None
+
+# Skips the handler entirely while the scene and its parameters stay the same (None when off)
+static_gate = StaticSceneGate(args.static_threshold) if args.static_threshold > 0 else None
+
+# Derived per-frame products (gray, HSV, ...) are written into the same arrays every frame
+context_buffers = BufferPool()
+
+# Side-by-side view of several handlers run in parallel on the same frame (None when off)
+compare_view: CompareView | None = None
+
+# Processed frames for viewers on other machines: http://<host>:<port>/ (page), /stream.mjpg, /frame.jpg
+stream_server, stream = None, None
+if args.stream_port:
+    stream_server, stream = start_stream_server(args.stream_host, args.stream_port, args.stream_quality)
+    print(f"Streaming on http://{args.stream_host}:{args.stream_port}/ (stream.mjpg, frame.jpg)")
+
+# Background encoder of the displayed frames, toggled with RECORD_KEY (None when not recording)
+recorder: Recorder | None = None
+
+# The main thread only refreshes the window and reads keys; frames are processed on a worker thread
+display = DisplayLoop("frame", args.display_fps)
+# Handlers fill their own windows (histogram, panorama captures) from the worker thread; shown with the main window
+window_manager.image_sink = display.publish_window
+# Held while a frame is processed; key handling takes it before swapping handlers or views
+processing_lock = threading.Lock()
+# Keys for the current handler's own handle_key (e.g. Panorama), applied with the next processed frame
+handler_keys: queue.SimpleQueue[tuple[BaseModeHandler, int]] = queue.SimpleQueue()
+
+metrics = LatencyMetrics()
+if args.hud:
+    metrics.toggle_hud()
 
 
 def recreate_window_default():
-    cv2.destroyAllWindows()
-    cv2.namedWindow("frame", cv2.WINDOW_NORMAL)
-    cv2.resizeWindow("frame", cam_width, cam_height)
+    # Only the main window is needed; other windows are hidden, not destroyed
+    window_manager.show_only(["frame"])
+
+
+def evict_handler(key, handler):
+    session_params[key] = handler.param_values()
+    handler.close_windows()
 
 
 def get_submode_info(mode_key, submode_key):
@@ -40,9 +157,137 @@ def get_submode_info(mode_key, submode_key):
     return submode_map.get(submode_key, {"name": "RGB", "handler": None})
 
 
-def handle_key_mode(frame=None):
-    global mode, submode, last_key, current_handler
-    polling_key = cv2.waitKey(1) & 0xFF
+def get_pooled_handler(mode_key, submode_key):
+    """Return (handler, created) for a submode, or (None, False) if it has no handler."""
+    submode_info = get_submode_info(mode_key, submode_key)
+    # The handler module is imported the first time its mode is selected
+    handler_class = load_handler(submode_info.get("handler"))
+    if not handler_class:
+        return None, False
+    handler, created = handler_pool.get((mode_key, submode_key), handler_class)
+    if created:
+        # Each submode gets its own control panel, so trackbars are built once and keep their values
+        handler.setup_window("frame", f"{submode_info['name']} controls", cam_width, cam_height)
+        # Saved preset first, then whatever was tuned earlier in this session
+        values = preset_params(args.presets, mode_key, submode_key)
+        values.update(session_params.get((mode_key, submode_key), {}))
+        unknown = apply_params(handler, values, strict=False)
+        if unknown:
+            print(f"Ignoring unknown preset parameters for {submode_info['name']}: {', '.join(unknown)}")
+    return handler, created
+
+
+def switch_handler(mode_key, new_submode_key):
+    global current_handler, submode_key
+    if compare_view is not None:
+        close_compare()
+    submode_key = new_submode_key
+    if scheduler is not None:
+        # The measured cost belongs to the previous handler
+        scheduler.reset()
+    if static_gate is not None:
+        static_gate.reset()
+    current_handler, created = get_pooled_handler(mode_key, submode_key)
+    if current_handler is None:
+        recreate_window_default()
+    elif not created:
+        current_handler.show_windows()
+        print(f"Reusing pooled handler: {current_handler.__class__.__name__}")
+
+
+def parse_compare_keys(spec: str) -> list[tuple[str, str]]:
+    """"5q,5r,6e" -> [("5", "q"), ("5", "r"), ("6", "e")]"""
+    keys = []
+    for item in spec.split(","):
+        item = item.strip()
+        if len(item) != 2 or item[0] not in mode_map or item[1] not in mode_map[item[0]]["submodes"]:
+            raise ValueError(f"Unknown handler '{item}' in --compare, expected <mode key><submode key> like 5q")
+        keys.append((item[0], item[1]))
+    return keys
+
+
+def open_compare():
+    global compare_view, submode
+    if args.compare:
+        keys = parse_compare_keys(args.compare)
+    else:
+        current_mode_key = modes2keys[mode.lower()]
+        keys = [(current_mode_key, key) for key in mode_map[current_mode_key]["submodes"]]
+    # Every compared handler must stay pooled while the view is open
+    handler_pool.max_size = max(handler_pool.max_size, len(keys) + 1)
+    entries = []
+    for mode_key, key in keys:
+        handler, _ = get_pooled_handler(mode_key, key)
+        if handler is not None:
+            entries.append((get_submode_info(mode_key, key)["name"], handler))
+    if not entries:
+        return
+    compare_view = CompareView(entries)
+    # Show every compared handler's controls at once
+    window_manager.show_only(["frame"] + [name for _, handler in entries for name in handler.window_names])
+    submode = f"Compare ({len(entries)})"
+    print(f"Comparing: {', '.join(label for label, _ in entries)}")
+
+
+def close_compare():
+    global compare_view, submode
+    compare_view.close()
+    compare_view = None
+    handler_pool.max_size = max(1, args.handler_pool_size)
+    submode = get_submode_info(modes2keys[mode.lower()], submode_key)["name"]
+    if current_handler is not None:
+        current_handler.show_windows()
+    else:
+        recreate_window_default()
+
+
+def toggle_recording():
+    global recorder
+    if recorder is None:
+        os.makedirs(args.record_dir, exist_ok=True)
+        path = os.path.join(args.record_dir, time.strftime("recording_%Y%m%d_%H%M%S.mp4"))
+        recorder = Recorder(path, args.record_fps)
+        recorder.start()
+        print(f"Recording to {path}")
+    else:
+        stop_recording()
+
+
+def stop_recording():
+    global recorder
+    recorder.stop()
+    print(f"Saved {recorder.path}: {recorder.written} frames written, {recorder.dropped} dropped")
+    if recorder.error is not None:
+        print(f"Recording failed: {recorder.error}")
+    recorder = None
+
+
+def handle_keys():
+    """Apply the keys queued by the display loop. Returns False on ESC."""
+    while True:
+        try:
+            key = display.keys.get_nowait()
+        except queue.Empty:
+            return True
+        # Wait for the frame in flight, so handlers and views are never swapped mid-frame
+        with processing_lock:
+            if not handle_key_mode(key):
+                return False
+
+
+def save_current_preset():
+    if current_handler is None or compare_view is not None:
+        return
+    values = current_handler.param_values()
+    if not values:
+        print(f"{submode} has no parameters to save")
+        return
+    save_preset(args.presets, modes2keys[mode.lower()], submode_key, values)
+    print(f"Saved preset for {submode} to {args.presets}")
+
+
+def handle_key_mode(polling_key: int):
+    global mode, submode, last_key
     if polling_key != 0xFF:
         last_key = polling_key
         print(
@@ -51,19 +296,42 @@ def handle_key_mode(frame=None):
             f"({last_key})",
         )
 
-        # If current handler has handle_key (e.g., PanoramaHandler), call it
+        # If current handler has handle_key (e.g., PanoramaHandler), it gets the key with the next frame
         if (
             current_handler
             and hasattr(current_handler, "handle_key")
             and current_handler.__class__.__name__ == "PanoramaHandler"
         ):
-            current_handler.handle_key(last_key, frame)
+            handler_keys.put((current_handler, last_key))
 
         if last_key == 27:  # ESC
             return False
 
+        if chr(last_key) == HUD_KEY:
+            metrics.toggle_hud()
+
+        elif chr(last_key) == RECORD_KEY:
+            toggle_recording()
+
+        elif chr(last_key) == COMPARE_KEY:
+            if compare_view is None:
+                open_compare()
+            else:
+                close_compare()
+
+        elif chr(last_key) == SAVE_PRESET_KEY:
+            save_current_preset()
+
+        elif chr(last_key) == RESET_HANDLER_KEY:
+            # Throw away the pooled instance of the current submode and build a fresh one
+            current_mode_key = modes2keys[mode.lower()]
+            handler_pool.reset((current_mode_key, submode_key))
+            session_params.pop((current_mode_key, submode_key), None)
+            switch_handler(current_mode_key, submode_key)
+            print(f"Reset handler for submode: {submode}")
+
         # Allow switching modes at any time
-        if chr(last_key) in mode_map.keys():
+        elif chr(last_key) in mode_map.keys():
             mode_key = chr(last_key)
             mode_info = mode_map[mode_key]
             mode = mode_info["name"]
@@ -72,14 +340,7 @@ def handle_key_mode(frame=None):
             submode = next(iter(submodes.values()))["name"] if submodes else "RGB"
 
             # Instantiate handler for default submode
-            submode_info = get_submode_info(mode_key, "q")
-            handler_class = submode_info.get("handler")
-            if handler_class:
-                current_handler = handler_class()
-                current_handler.setup_window("frame", "controls", cam_width, cam_height)
-            else:
-                current_handler = None
-                recreate_window_default()
+            switch_handler(mode_key, "q")
             print(f"Switched to mode: {mode}")
 
         # Allow submode switching for all modes with submodes
@@ -87,31 +348,41 @@ def handle_key_mode(frame=None):
             current_mode_key = modes2keys[mode.lower()]
             submodes = mode_map[current_mode_key]["submodes"]
             if chr(last_key) in submodes:
-                submode_key = chr(last_key)
-                submode_info = submodes[submode_key]
-                submode = submode_info["name"]
-                handler_class = submode_info.get("handler")
-                if handler_class:
-                    current_handler = handler_class()
-                    current_handler.setup_window("frame", "controls", cam_width, cam_height)
-                else:
-                    current_handler = None
-                    recreate_window_default()
+                submode = submodes[chr(last_key)]["name"]
+                switch_handler(current_mode_key, chr(last_key))
                 print(f"Switched to submode: {submode}")
     return True
 
 
 def handle_mode(frame: MatLike):
     global current_handler, submode
-    if current_handler:
-        display_frame = current_handler.process_frame(frame)
+    if compare_view is not None:
+        display_frame = compare_view.process(frame, FrameContext(frame, context_buffers))
+    elif current_handler:
+        # Fresh context per frame: derived products (gray, HSV, ...) are computed at most once
+        ctx = FrameContext(frame, context_buffers)
+
+        def run():
+            if scheduler is not None:
+                return scheduler.process(current_handler, frame, ctx)
+            return current_handler.process_frame(frame, ctx)
+
+        display_frame = static_gate.process(current_handler, frame, run) if static_gate is not None else run()
     else:
         display_frame = frame
     # No resizing, just return the frame as-is
     return display_frame
 
 
+overlay_cache = OverlayCache()
+
+
 def put_display_text(frame: MatLike):
+    # The text only changes with the mode/submode, so it is rendered once and blitted every frame
+    return overlay_cache.apply(frame, (mode, submode), draw_display_text)
+
+
+def draw_display_text(frame: MatLike):
     # Common style
     color_fg = (0, 0, 0)  # black text
     color_bg = (255, 255, 255)  # white background
@@ -193,21 +464,169 @@ def put_display_text(frame: MatLike):
     return frame
 
 
-while True:
-    ret, frame = cap.read()
+def wait_for_source():
+    """Keep the window responsive with a placeholder until the first frame arrives."""
+    global cam_width, cam_height
+    placeholder = np.zeros((cam_height, cam_width, 3), np.uint8)
+    cv2.putText(placeholder, f"Opening {args.source} ...", (20, 40), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (255, 255, 255), 2)
+    while not capture.wait_first_frame(timeout=0.03):
+        cv2.imshow("frame", placeholder)
+        if cv2.waitKey(1) & 0xFF == 27:
+            return False
+    if capture.frame_size is None:
+        raise RuntimeError(f"Cannot read from source: {args.source}") from capture.error
+
+    # Get camera frame size
+    cam_width, cam_height = capture.frame_size
+    ratio = cam_width / cam_height
+    print(f"Camera resolution: {cam_width}x{cam_height}, ratio: {ratio:.2f}")
+    # My camera is 640x480, so I want to scale to make it bigger
+    cam_width = int(cam_width * 1.5)
+    cam_height = int(cam_height * 1.5)
+    print(f"New Camera resolution: {cam_width}x{cam_height}, ratio: {ratio:.2f}")
+    window_manager.resize("frame", (cam_width, cam_height))
+    return True
+
+
+def needs_main_thread() -> bool:
+    """Whether the active handler(s) call HighGUI while processing and so must run on the main thread."""
+    if compare_view is not None:
+        return any(handler.main_thread_only for handler in compare_view.handlers)
+    return current_handler is not None and current_handler.main_thread_only
+
+
+def process_next_frame(on_main_thread: bool) -> bool:
+    """Capture, process and publish one frame. Returns False when the source has ended."""
+    global reported_dropped, last_drop_report, last_metrics_export
+    with metrics.time(mode, submode, "capture"):
+        ret, frame = capture.read()
     if not ret:
-        print("Can't receive frame (stream end?). Exiting ...")
-        break
+        return False
 
-    not_backspace = handle_key_mode(frame)
-    if not_backspace is False:
-        break
+    with processing_lock:
+        if needs_main_thread() != on_main_thread:
+            # The handler changed hands while this frame was read; the other thread takes over
+            return True
+        while not handler_keys.empty():
+            handler, key = handler_keys.get()
+            # Keys meant for a handler that was switched away from in the meantime are dropped
+            if handler is current_handler:
+                handler.handle_key(key, frame)
+        with metrics.time(mode, submode, "process"):
+            display_frame = handle_mode(frame)
+        with metrics.time(mode, submode, "overlay"):
+            display_frame = put_display_text(display_frame)
+            if recorder is not None:
+                # Copied into the recorder's ring; encoding happens on its own thread
+                recorder.submit(display_frame)
+            if stream is not None:
+                # Copied only while someone watches; JPEG encoding and sending happen on other threads
+                stream.publish(display_frame)
+            status_texts = [
+                compare_view.status() if compare_view is not None else scheduler and scheduler.status(),
+                compare_view is None and static_gate and static_gate.status(),
+                recorder and recorder.status(),
+            ]
+            for line, text in enumerate(text for text in status_texts if text):
+                display_frame = draw_status_text(display_frame, text, line)
+        display_frame = metrics.draw_hud(display_frame, mode, submode)
+        # Copied; the main thread shows it at the next refresh
+        display.publish(display_frame)
+    metrics.tick(mode, submode)
+
+    # Report dropped frames at most once per second so we can see when a handler cannot keep up
+    now = time.perf_counter()
+    if args.metrics_out and now - last_metrics_export >= args.metrics_interval:
+        metrics.export(args.metrics_out)
+        last_metrics_export = now
+    if capture.dropped > reported_dropped and now - last_drop_report >= 1.0:
+        print(f"Dropped frames: {capture.dropped}/{capture.captured} (+{capture.dropped - reported_dropped})")
+        reported_dropped = capture.dropped
+        last_drop_report = now
+    return True
 
-    display_frame = handle_mode(frame)
-    display_frame = put_display_text(display_frame)
 
-    cv2.imshow("frame", display_frame)
+def processing_loop():
+    """Worker thread: process frames as fast as the handler allows, independent of the display refresh."""
+    global processing_error
+    try:
+        while running:
+            if needs_main_thread():
+                time.sleep(0.005)
+                continue
+            if not process_next_frame(on_main_thread=False):
+                break
+    except Exception as error:
+        # Reported and re-raised by the UI loop, like capture.error for the capture thread
+        processing_error = error
+    source_ended.set()
+
+
+# Capture runs on its own thread; processing runs on another and always takes the freshest frame
+running = wait_for_source()
+source_ended = threading.Event()
+processing_error: Exception | None = None
+time_to_first_frame = None
+reported_dropped = 0
+last_drop_report = time.perf_counter()
+last_metrics_export = time.perf_counter()
+processing_thread = threading.Thread(target=processing_loop, name="processing", daemon=True)
+processing_thread.start()
+
+# UI loop: refresh the window at --display-fps and dispatch keys
+while running:
+    start = time.perf_counter()
+    if display.show_latest():
+        metrics.record(mode, submode, "display", time.perf_counter() - start)
+        if time_to_first_frame is None:
+            # Cold-start cost: app start -> first processed frame on screen
+            time_to_first_frame = time.perf_counter() - app_start
+            metrics.set_startup(
+                time_to_first_frame_ms=round(time_to_first_frame * 1000, 1),
+                source_open_ms=round((capture.opened_at - app_start) * 1000, 1),
+                first_capture_ms=round((capture.first_frame_at - app_start) * 1000, 1),
+            )
+            print(f"Time to first frame: {time_to_first_frame * 1000:.0f} ms")
+    display.show_windows()
+
+    main_thread_processing = needs_main_thread()
+    # Handlers that use HighGUI themselves are processed right here, paced by the source as before
+    display.wait_key(wait=not main_thread_processing)
+    with metrics.time(mode, submode, "keys"):
+        running = handle_keys()
+    if not running:
+        break
+    if processing_error is not None:
+        print(f"Processing failed ({processing_error!r}). Exiting ...")
+        break
+    if source_ended.is_set() or (main_thread_processing and not process_next_frame(on_main_thread=True)):
+        print("Can't receive frame (stream end?). Exiting ...")
+        break
 
-cap.release()
+running = False
+capture.stop()
+processing_thread.join(timeout=2.0)
+if compare_view is not None:
+    compare_view.close()
+if recorder is not None:
+    stop_recording()
+if stream is not None:
+    print(f"Stream: {stream.status()}")
+    stream.stop()
+    stream_server.shutdown()
+print(f"Captured {capture.captured} frames, dropped {capture.dropped}; display {display.status()}")
+if static_gate is not None:
+    print(f"{static_gate.status()} frames")
+buffer_pools = [context_buffers] + [pool for handler in handler_pool.handlers() for pool in handler.buffer_pools()]
+print(
+    f"Frame buffers: {sum(pool.bytes for pool in buffer_pools) / 1e6:.1f} MB held, "
+    f"peak {sum(pool.peak_bytes for pool in buffer_pools) / 1e6:.1f} MB"
+)
+if args.metrics_out:
+    metrics.export(args.metrics_out, final=True)
+    print(f"Latency metrics written to {args.metrics_out}")
+capture.release()
 cv2.destroyAllWindows()
 cv2.destroyAllWindows()
+if processing_error is not None:
+    raise RuntimeError(f"Processing failed in {mode} / {submode}") from processing_error
@@ -0,0 +1,210 @@
+"""
+Headless batch processing: apply any mode_map handler to a video or an image folder.
+
+Examples (run from src/):
+    python batch.py clip.mp4 out.mp4 --mode 5 --submode q --param "Canny Threshold1=50"
+    python batch.py frames/ out_frames/ --mode 4 --submode t --param "Kernel Size=9" --workers 8
+
+The input is split into chunks of consecutive frames that are processed by a process pool and
+written back in order. Handlers that carry state between frames (Panorama, Camera Calibration)
+restart at each chunk boundary, so run those with --workers 1 --chunk-size 0.
+"""
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import cv2
+
+from runtime.frames import to_bgr8
+from runtime.headless import build_handler, parse_params
+from runtime.presets import preset_params
+from runtime.recorder import VIDEO_FOURCC, open_writer
+from runtime.sources import IMAGE_EXTENSIONS
+
+# Intermediate chunks are decoded and encoded again when reassembled, so they are written losslessly
+# (HuffYUV, or FFV1 where it is missing)
+CHUNK_FOURCCS = ("HFYU", "FFV1")
+
+
+def is_video_path(path: str) -> bool:
+    return os.path.splitext(path)[1].lower() in VIDEO_FOURCC
+
+
+def open_at(path: str, start: int) -> cv2.VideoCapture:
+    """
+    Capture whose next read() returns frame `start`. Seeking is not frame-accurate on every backend and
+    codec, so the position is checked after the seek; if it is off, frames are grabbed from the beginning.
+    """
+    cap = cv2.VideoCapture(path)
+    if start <= 0:
+        return cap
+    cap.set(cv2.CAP_PROP_POS_FRAMES, start)
+    if int(cap.get(cv2.CAP_PROP_POS_FRAMES)) != start:
+        cap.release()
+        cap = cv2.VideoCapture(path)
+        for _ in range(start):
+            if not cap.grab():
+                break
+    return cap
+
+
+def open_chunk_writer(path: str, fps: float, size: tuple[int, int]) -> cv2.VideoWriter:
+    for fourcc in CHUNK_FOURCCS:
+        writer = cv2.VideoWriter(path, cv2.CAP_FFMPEG, cv2.VideoWriter_fourcc(*fourcc), fps, size)
+        if writer.isOpened():
+            return writer
+    raise RuntimeError(f"No lossless codec ({', '.join(CHUNK_FOURCCS)}) available for intermediate chunks")
+
+
+def read_chunk(job: dict):
+    """Yield the input frames of one chunk."""
+    if job["files"] is not None:
+        for file in job["files"]:
+            frame = cv2.imread(file, cv2.IMREAD_COLOR)
+            if frame is not None:
+                yield os.path.basename(file), frame
+        return
+    cap = open_at(job["input"], job["start"])
+    index = job["start"]
+    # The last chunk reads to the end of the file, whose reported frame count may be short
+    while job["end"] is None or index < job["end"]:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        yield f"{index:06d}.png", frame
+        index += 1
+    cap.release()
+
+
+def process_chunk(job: dict) -> tuple[str | None, int]:
+    """Worker: run the handler over one chunk and write it to a temporary video or the output folder."""
+    cv2.setNumThreads(job["threads"])
+    handler = build_handler(job["mode"], job["submode"], job["params"], job["width"], job["height"])
+    writer = None
+    count = 0
+    for name, frame in read_chunk(job):
+        output = to_bgr8(handler.process_frame(frame))
+        if job["chunk_path"] is not None:
+            if writer is None:
+                writer = open_chunk_writer(job["chunk_path"], job["fps"], (output.shape[1], output.shape[0]))
+            writer.write(output)
+        else:
+            cv2.imwrite(os.path.join(job["output"], os.path.splitext(name)[0] + ".png"), output)
+        count += 1
+    if writer is not None:
+        writer.release()
+    return job["chunk_path"] if writer is not None else None, count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Apply a mode handler to a video or image folder without a GUI")
+    parser.add_argument("input", help="Input video file or image folder")
+    parser.add_argument("output", help="Output video file (.mp4/.avi/.mkv/.mov) or image folder")
+    parser.add_argument("--mode", required=True, help="Mode key from mode_map, e.g. 5")
+    parser.add_argument("--submode", default="q", help="Submode key, e.g. q (default: q)")
+    parser.add_argument(
+        "--param",
+        action="append",
+        default=[],
+        metavar="NAME=VALUE",
+        help='Trackbar value, e.g. "Canny Threshold1=50" (repeatable)',
+    )
+    parser.add_argument("--preset", default=None, help="Preset file saved from the app; --param values override it")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Worker processes (default: all cores)")
+    parser.add_argument("--chunk-size", type=int, default=0, help="Frames per chunk (default: split evenly)")
+    parser.add_argument("--fps", type=float, default=30.0, help="Output FPS for image folder input (default: 30)")
+    args = parser.parse_args()
+
+    params = {**preset_params(args.preset, args.mode, args.submode), **parse_params(args.param)}
+    workers = max(1, args.workers or 1)
+
+    # Work out the frames to process and the frame size handlers are set up with
+    if os.path.isdir(args.input):
+        files = sorted(
+            os.path.join(args.input, name)
+            for name in os.listdir(args.input)
+            if name.lower().endswith(IMAGE_EXTENSIONS)
+        )
+        total = len(files)
+        first = cv2.imread(files[0], cv2.IMREAD_COLOR) if files else None
+        height, width = first.shape[:2] if first is not None else (480, 640)
+        fps = args.fps
+    else:
+        files = None
+        cap = cv2.VideoCapture(args.input)
+        if not cap.isOpened():
+            raise RuntimeError(f"Cannot open input: {args.input}")
+        total = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        fps = cap.get(cv2.CAP_PROP_FPS) or args.fps
+        cap.release()
+    if total <= 0:
+        raise RuntimeError(f"No frames found in input: {args.input}")
+
+    # Fail early on bad mode keys or parameter names instead of inside every worker
+    build_handler(args.mode, args.submode, params, width, height)
+
+    chunk_size = args.chunk_size if args.chunk_size > 0 else -(-total // workers)
+    to_video = is_video_path(args.output)
+    if not to_video:
+        os.makedirs(args.output, exist_ok=True)
+    temp_dir = tempfile.mkdtemp(prefix="batch_chunks_")
+    jobs = []
+    for start in range(0, total, chunk_size):
+        end = min(total, start + chunk_size)
+        jobs.append(
+            {
+                "input": args.input,
+                "files": files[start:end] if files is not None else None,
+                "start": start,
+                "end": end if end < total else None,
+                "output": args.output,
+                "chunk_path": os.path.join(temp_dir, f"chunk_{len(jobs):05d}.avi") if to_video else None,
+                "mode": args.mode,
+                "submode": args.submode,
+                "params": params,
+                "width": width,
+                "height": height,
+                "fps": fps,
+                # OpenCV's own thread pool would oversubscribe the cores when several workers run
+                "threads": 1 if workers > 1 else -1,
+            }
+        )
+    print(f"Processing {total} frames in {len(jobs)} chunks with {workers} workers...")
+
+    start_time = time.perf_counter()
+    processed = 0
+    writer = None
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            # map() yields results in submission order, so chunks are appended as soon as they are ready
+            for chunk_path, count in executor.map(process_chunk, jobs):
+                processed += count
+                if chunk_path is None:
+                    continue
+                chunk = cv2.VideoCapture(chunk_path)
+                while True:
+                    ret, frame = chunk.read()
+                    if not ret:
+                        break
+                    if writer is None:
+                        writer = open_writer(args.output, fps, (frame.shape[1], frame.shape[0]))
+                    writer.write(frame)
+                chunk.release()
+                os.remove(chunk_path)
+    finally:
+        if writer is not None:
+            writer.release()
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    elapsed = time.perf_counter() - start_time
+    print(f"Wrote {processed} frames to {args.output} in {elapsed:.1f}s ({processed / max(elapsed, 1e-9):.1f} FPS)")
+
+
+if __name__ == "__main__":
+    main()
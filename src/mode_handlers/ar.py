@@ -4,9 +4,12 @@ import cv2
 import numpy as np
 
 from .base import BaseModeHandler
+from .frame_context import FrameContext
 
 
 class ARHandler(BaseModeHandler):
+    allow_proxy_resolution = False
+
     def __init__(self):
         # --- AR & Pinhole Explorer State ---
         self.mtx = np.eye(3)
@@ -51,11 +54,11 @@ class ARHandler(BaseModeHandler):
         else:
             print("WARNING: 'calibration.npz' not found. AR and Pinhole modes will not be accurate.")
 
-    def process_frame(self, frame):
-        return self._draw_ar_mode(frame)
+    def process_frame(self, frame, ctx: FrameContext | None = None):
+        return self._draw_ar_mode(frame, ctx)
 
-    def _draw_trex(self, frame, camera_matrix):
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+    def _draw_trex(self, frame, camera_matrix, ctx: FrameContext | None = None):
+        gray = FrameContext.ensure(frame, ctx).gray
         corners, ids, _ = self.aruco_detector.detectMarkers(gray)
 
         if ids is not None:
@@ -152,5 +155,5 @@ class ARHandler(BaseModeHandler):
     #     frame = cv2.flip(frame, 1)  # Flip only once at the end for display
     #     return frame
 
-    def _draw_ar_mode(self, frame):
-        return self._draw_trex(frame, self.mtx)
+    def _draw_ar_mode(self, frame, ctx: FrameContext | None = None):
+        return self._draw_trex(frame, self.mtx, ctx)
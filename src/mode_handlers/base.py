@@ -1,23 +1,158 @@
 import cv2
 from cv2.typing import MatLike
 
+from .buffers import BufferPool
+from .frame_context import FrameContext
+from .params import Param, ParamStore
+from .trackers import Tracker
+from .windows import window_manager
+
 
 class BaseModeHandler:
+    # Whether the frame scheduler may run this handler on a downscaled copy of the frame.
+    # Handlers tied to real pixel geometry (calibration, pose, stitching) turn this off.
+    allow_proxy_resolution = True
+    # Handlers that call HighGUI or touch shared state in process_frame must stay on the main thread
+    # (images for a handler's own windows go through window_manager.show_image, which is safe anywhere)
+    main_thread_only = False
+    # Whether the output may be reused while the scene is static (no state carried between frames)
+    allow_static_reuse = True
+    # Detectors set this to what they found in the last frame (lines, circles, corner pixels), e.g. for sweeps
+    detections: int | None = None
+    # Whether the output is a binary edge map (0/255), and whether the handler can take one instead of
+    # detecting edges itself; pipelines set edges_from_upstream on such a stage following an edge detector
+    produces_edge_map = False
+    accepts_edge_map = False
+    edges_from_upstream = False
+
     def setup_window(
         self,
-        main_window_name: str,
-        control_window_name: str,
+        main_window_name: str | None,
+        control_window_name: str | None,
         main_window_width: int,
         main_window_height: int,
         have_control_window: bool = False,
     ):
-        """Set up the window and any trackbars needed for this mode."""
-        cv2.destroyAllWindows()
-        cv2.namedWindow(main_window_name, cv2.WINDOW_NORMAL)
-        cv2.resizeWindow(main_window_name, main_window_width, main_window_height)
+        """
+        Set up the window and any trackbars needed for this mode.
+        Windows are created once through the window manager and only shown or hidden afterwards,
+        so this is meant to be called once per handler instance (see show_windows).
+        Pass main_window_name=None to run headless: no windows are created and trackers keep
+        their values in Python only (see set_param).
+        """
+        self.headless = main_window_name is None
+        self.main_window_name = main_window_name
+        self.window_names = []
+        if self.headless:
+            return
+        self.open_window(main_window_name, cv2.WINDOW_NORMAL, (main_window_width, main_window_height))
         if have_control_window:
-            cv2.namedWindow(control_window_name, cv2.WINDOW_AUTOSIZE)
+            self.open_window(control_window_name, cv2.WINDOW_AUTOSIZE)
+        self.show_windows()
+
+    def open_window(self, name: str, flags: int, size: tuple[int, int] | None = None):
+        """Create (or reuse) a window that belongs to this handler."""
+        window_manager.open(name, flags, size)
+        if name not in self.window_names:
+            self.window_names.append(name)
+        window_manager.show(name)
+
+    def show_windows(self):
+        """Show this handler's windows and hide every other one."""
+        window_manager.show_only(self.window_names)
+
+    def close_windows(self):
+        """Destroy the handler's own windows (control panels, extra views), keeping the shared main window."""
+        for name in self.window_names:
+            if name != self.main_window_name:
+                window_manager.close(name)
+        self.window_names = [name for name in self.window_names if name == self.main_window_name]
+
+    @property
+    def buffers(self) -> BufferPool:
+        """
+        Output and scratch arrays reused frame to frame. The array a handler returns may be one of
+        these, so it is only valid until the next process_frame call; copy it to keep it longer.
+        """
+        pool = self.__dict__.get("_buffer_pool")
+        if pool is None:
+            pool = self._buffer_pool = BufferPool()
+        return pool
+
+    @property
+    def params(self) -> ParamStore:
+        """Every parameter of this handler; its trackers (and their trackbars) are views of this store."""
+        store = self.__dict__.get("_param_store")
+        if store is None:
+            store = self._param_store = ParamStore()
+        return store
+
+    def param_stores(self) -> list[ParamStore]:
+        """Every parameter store this handler reads (composite handlers add their parts' stores)."""
+        return [self.params]
+
+    def buffer_pools(self) -> list[BufferPool]:
+        """Every buffer pool this handler owns (composite handlers add their parts' pools)."""
+        return [self.buffers]
 
-    def process_frame(self, frame: MatLike) -> MatLike:
-        """Process the frame according to the submode."""
+    def process_frame(self, frame: MatLike, ctx: FrameContext | None = None) -> MatLike:
+        """
+        Process the frame according to the submode.
+        ctx holds memoized products of frame (gray, HSV, ...) shared with other consumers of the same frame.
+        """
         raise NotImplementedError
+
+    def trackers(self) -> list[Tracker]:
+        return [value for value in vars(self).values() if isinstance(value, Tracker)]
+
+    def param_state(self) -> tuple:
+        """Parameter versions; compares unequal as soon as any parameter changed."""
+        return tuple(store.version for store in self.param_stores())
+
+    def param_items(self) -> dict[str, tuple[Tracker, str]]:
+        """
+        Every parameter by its unique name -> (tracker, trackbar name). For a single handler the unique name
+        is the trackbar name; pipelines prefix it with the stage number, e.g. "2:Canny Threshold1".
+        """
+        items = {}
+        for tracker in self.trackers():
+            for name in tracker.trackbars:
+                if name in items:
+                    raise ValueError(f"{type(self).__name__} has two parameters named '{name}'")
+                items[name] = (tracker, name)
+        return items
+
+    def param_names(self) -> list[str]:
+        return list(self.param_items())
+
+    def param_values(self) -> dict[str, int]:
+        """Current slider value of every parameter, by unique name (what set_param and presets take)."""
+        return {name: tracker.params.get(trackbar) for name, (tracker, trackbar) in self.param_items().items()}
+
+    def param(self, name: str) -> Param:
+        """The parameter behind a name (its range, current value, ...)."""
+        tracker, trackbar = self._resolve_param(name)
+        return tracker.params[trackbar]
+
+    def set_param(self, name: str, value: int):
+        """Set a parameter by its unique name, exactly as if the slider had been moved to value."""
+        tracker, trackbar = self._resolve_param(name)
+        tracker.trackbars[trackbar](value)
+
+    def resolve_param_name(self, name: str) -> str:
+        """
+        The unique name of a parameter. A pipeline stage parameter may also be given without its stage
+        number as long as only one stage has it; ambiguous names raise ValueError instead of picking one.
+        """
+        items = self.param_items()
+        if name in items:
+            return name
+        matches = [unique for unique in items if unique.endswith(f":{name}")]
+        if len(matches) == 1:
+            return matches[0]
+        if matches:
+            raise ValueError(f"Parameter name '{name}' of {type(self).__name__} is ambiguous, use one of {matches}")
+        raise KeyError(f"{type(self).__name__} has no parameter '{name}', available: {list(items)}")
+
+    def _resolve_param(self, name: str) -> tuple[Tracker, str]:
+        return self.param_items()[self.resolve_param_name(name)]
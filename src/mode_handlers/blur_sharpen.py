@@ -3,12 +3,21 @@ import numpy as np
 from cv2.typing import MatLike
 
 from .base import BaseModeHandler
+from .frame_context import FrameContext
 from .trackers import BilateralSigmaTracker, KernelSizeTracker, SigmaTracker
 
+SHARPEN_KERNEL = np.array(
+    [
+        [0, -1, 0],
+        [-1, 5, -1],
+        [0, -1, 0],
+    ]
+)
+
 
 class BlurSharpenHandler(BaseModeHandler):
     # For default submode
-    def process_frame(self, frame: MatLike) -> MatLike:
+    def process_frame(self, frame: MatLike, ctx: FrameContext | None = None) -> MatLike:
         return frame
 
 
@@ -28,11 +37,11 @@ class AverageBlurHandler(BaseModeHandler):
             main_window_height,
             have_control_window,
         )
-        self.kernelsize_tracker = KernelSizeTracker(control_window_name)
+        self.kernelsize_tracker = KernelSizeTracker(control_window_name, self.params)
 
-    def process_frame(self, frame: MatLike) -> MatLike:
+    def process_frame(self, frame: MatLike, ctx: FrameContext | None = None) -> MatLike:
         kernel_size = self.kernelsize_tracker.get_effective_kernel_size()
-        return cv2.blur(frame, (kernel_size, kernel_size))
+        return cv2.blur(frame, (kernel_size, kernel_size), dst=self.buffers.like("out", frame))
 
 
 class GaussianBlurHandler(BaseModeHandler):
@@ -51,13 +60,13 @@ class GaussianBlurHandler(BaseModeHandler):
             main_window_height,
             have_control_window,
         )
-        self.kernelsize_tracker = KernelSizeTracker(control_window_name)
-        self.sigma_tracker = SigmaTracker(control_window_name)
+        self.kernelsize_tracker = KernelSizeTracker(control_window_name, self.params)
+        self.sigma_tracker = SigmaTracker(control_window_name, self.params)
 
-    def process_frame(self, frame: MatLike) -> MatLike:
+    def process_frame(self, frame: MatLike, ctx: FrameContext | None = None) -> MatLike:
         sigma = self.sigma_tracker.get_sigma()
         kernel_size = self.kernelsize_tracker.get_effective_kernel_size()
-        return cv2.GaussianBlur(frame, (kernel_size, kernel_size), sigmaX=sigma)
+        return cv2.GaussianBlur(frame, (kernel_size, kernel_size), sigmaX=sigma, dst=self.buffers.like("out", frame))
 
 
 class GaussianBlurAutoHandler(BaseModeHandler):
@@ -76,12 +85,12 @@ class GaussianBlurAutoHandler(BaseModeHandler):
             main_window_height,
             have_control_window,
         )
-        self.sigma_tracker = SigmaTracker(control_window_name)
+        self.sigma_tracker = SigmaTracker(control_window_name, self.params)
 
-    def process_frame(self, frame: MatLike) -> MatLike:
+    def process_frame(self, frame: MatLike, ctx: FrameContext | None = None) -> MatLike:
         sigma = self.sigma_tracker.get_sigma()
-        kernel_size = self.get_effective_kernel_size_for_gaussian(sigma)
-        return cv2.GaussianBlur(frame, (kernel_size, kernel_size), sigmaX=sigma)
+        kernel_size = self.params.derived("kernel_size", lambda: self.get_effective_kernel_size_for_gaussian(sigma))
+        return cv2.GaussianBlur(frame, (kernel_size, kernel_size), sigmaX=sigma, dst=self.buffers.like("out", frame))
 
     def get_effective_kernel_size_for_gaussian(self, sigma: int) -> int:
         kernel_size = int(np.ceil(2 * np.pi * sigma))
@@ -106,11 +115,11 @@ class MedianBlurHandler(BaseModeHandler):
             main_window_height,
             have_control_window,
         )
-        self.kernelsize_tracker = KernelSizeTracker(control_window_name)
+        self.kernelsize_tracker = KernelSizeTracker(control_window_name, self.params)
 
-    def process_frame(self, frame: MatLike) -> MatLike:
+    def process_frame(self, frame: MatLike, ctx: FrameContext | None = None) -> MatLike:
         kernel_size = self.kernelsize_tracker.get_effective_kernel_size()
-        return cv2.medianBlur(frame, kernel_size)
+        return cv2.medianBlur(frame, kernel_size, dst=self.buffers.like("out", frame))
 
 
 class BilateralBlurHandler(BaseModeHandler):
@@ -129,23 +138,18 @@ class BilateralBlurHandler(BaseModeHandler):
             main_window_height,
             have_control_window,
         )
-        self.kernelsize_tracker = KernelSizeTracker(control_window_name)
-        self.bilateral_sigma_tracker = BilateralSigmaTracker(control_window_name)
+        self.kernelsize_tracker = KernelSizeTracker(control_window_name, self.params)
+        self.bilateral_sigma_tracker = BilateralSigmaTracker(control_window_name, self.params)
 
-    def process_frame(self, frame: MatLike) -> MatLike:
+    def process_frame(self, frame: MatLike, ctx: FrameContext | None = None) -> MatLike:
         kernel_size = self.kernelsize_tracker.get_effective_kernel_size()
         sigma_color = self.bilateral_sigma_tracker.get_sigma_color()
         sigma_space = self.bilateral_sigma_tracker.get_sigma_space()
-        return cv2.bilateralFilter(frame, d=kernel_size, sigmaColor=sigma_color, sigmaSpace=sigma_space)
+        return cv2.bilateralFilter(
+            frame, d=kernel_size, sigmaColor=sigma_color, sigmaSpace=sigma_space, dst=self.buffers.like("out", frame)
+        )
 
 
 class SharpenHandler(BaseModeHandler):
-    def process_frame(self, frame: MatLike) -> MatLike:
-        kernel = np.array(
-            [
-                [0, -1, 0],
-                [-1, 5, -1],
-                [0, -1, 0],
-            ]
-        )
-        return cv2.filter2D(frame, -1, kernel)
+    def process_frame(self, frame: MatLike, ctx: FrameContext | None = None) -> MatLike:
+        return cv2.filter2D(frame, -1, SHARPEN_KERNEL, dst=self.buffers.like("out", frame))
@@ -0,0 +1,40 @@
+from typing import Hashable
+
+import numpy as np
+from cv2.typing import MatLike
+
+
+class BufferPool:
+    """
+    Output and scratch arrays of one handler, reused frame to frame.
+    A buffer is looked up by name and only reallocated when the requested shape or dtype changes
+    (e.g. the source resolution changed), so steady-state processing allocates nothing.
+    Handlers write into these with OpenCV dst= arguments or NumPy out= arguments.
+    """
+
+    def __init__(self):
+        self._buffers: dict[Hashable, np.ndarray] = {}
+        self.allocations = 0  # Number of (re)allocations so far
+        self.bytes = 0  # Bytes currently held
+        self.peak_bytes = 0  # Most bytes ever held at once
+
+    def get(self, name: Hashable, shape: tuple[int, ...], dtype=np.uint8) -> np.ndarray:
+        """Uninitialized buffer; callers must overwrite every element they read back."""
+        buffer = self._buffers.get(name)
+        if buffer is not None and buffer.shape == tuple(shape) and buffer.dtype == dtype:
+            return buffer
+        if buffer is not None:
+            self.bytes -= buffer.nbytes
+        buffer = self._buffers[name] = np.empty(shape, dtype)
+        self.allocations += 1
+        self.bytes += buffer.nbytes
+        self.peak_bytes = max(self.peak_bytes, self.bytes)
+        return buffer
+
+    def like(self, name: Hashable, frame: MatLike, dtype=None) -> np.ndarray:
+        """Buffer with the shape of frame (and its dtype unless one is given)."""
+        return self.get(name, frame.shape, frame.dtype if dtype is None else dtype)
+
+    def clear(self):
+        self._buffers.clear()
+        self.bytes = 0
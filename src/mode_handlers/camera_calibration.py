@@ -4,6 +4,7 @@ import cv2
 import numpy as np
 
 from .base import BaseModeHandler
+from .frame_context import FrameContext
 
 # calibrate_camera.py
 #
@@ -62,21 +63,26 @@ TARGET_IMAGES = 20  # Number of images to capture for calibration
 
 
 class CameraCalibrationHandler(BaseModeHandler):
+    allow_proxy_resolution = False
+    main_thread_only = True
+    allow_static_reuse = False
+
     def __init__(self):
         super().__init__()
         self.images_captured = 0
         self.last_capture_time = time.time()
         self.finished = False
 
-    def process_frame(self, frame):
+    def process_frame(self, frame, ctx: FrameContext | None = None):
         if self.images_captured == 0:
             print("Starting camera calibration...")
             print(f"Show the {CHESSBOARD_SIZE} chessboard to the camera.")
             print(f"Need to capture {TARGET_IMAGES} good views.")
 
         if self.images_captured < TARGET_IMAGES:
-            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-            display_frame = frame.copy()
+            gray = FrameContext.ensure(frame, ctx).gray
+            display_frame = self.buffers.like("out", frame)
+            np.copyto(display_frame, frame)
 
             # Find the chess board corners
             ret_corners, corners = cv2.findChessboardCorners(gray, CHESSBOARD_SIZE, None)
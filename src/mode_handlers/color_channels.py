@@ -1,45 +1,43 @@
-import cv2
 from cv2.typing import MatLike
 
 from .base import BaseModeHandler
+from .frame_context import FrameContext
+
+
+def keep_channel(display_frame: MatLike, frame: MatLike, channel: int) -> MatLike:
+    """Write frame into display_frame with every channel but one zeroed out."""
+    display_frame.fill(0)
+    display_frame[:, :, channel] = frame[:, :, channel]
+    return display_frame
 
 
 class RGBHandler(BaseModeHandler):
-    def process_frame(self, frame: MatLike) -> MatLike:
+    def process_frame(self, frame: MatLike, ctx: FrameContext | None = None) -> MatLike:
         return frame
 
 
 class RedChannelHandler(BaseModeHandler):
-    def process_frame(self, frame: MatLike) -> MatLike:
-        display_frame = frame.copy()
-        display_frame[:, :, 0] = 0  # Zero out Blue channel
-        display_frame[:, :, 1] = 0  # Zero out Green channel
-        return display_frame
+    def process_frame(self, frame: MatLike, ctx: FrameContext | None = None) -> MatLike:
+        return keep_channel(self.buffers.like("out", frame), frame, 2)
 
 
 class GreenChannelHandler(BaseModeHandler):
-    def process_frame(self, frame: MatLike) -> MatLike:
-        display_frame = frame.copy()
-        display_frame[:, :, 0] = 0  # Zero out Blue channel
-        display_frame[:, :, 2] = 0  # Zero out Red channel
-        return display_frame
+    def process_frame(self, frame: MatLike, ctx: FrameContext | None = None) -> MatLike:
+        return keep_channel(self.buffers.like("out", frame), frame, 1)
 
 
 class BlueChannelHandler(BaseModeHandler):
-    def process_frame(self, frame: MatLike) -> MatLike:
-        display_frame = frame.copy()
-        display_frame[:, :, 1] = 0  # Zero out Green channel
-        display_frame[:, :, 2] = 0  # Zero out Red channel
-        return display_frame
+    def process_frame(self, frame: MatLike, ctx: FrameContext | None = None) -> MatLike:
+        return keep_channel(self.buffers.like("out", frame), frame, 0)
 
 
 class GrayScaleHandler(BaseModeHandler):
-    def process_frame(self, frame: MatLike) -> MatLike:
-        display_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+    def process_frame(self, frame: MatLike, ctx: FrameContext | None = None) -> MatLike:
+        display_frame = FrameContext.ensure(frame, ctx).gray
         return display_frame
 
 
 class HSVHandler(BaseModeHandler):
-    def process_frame(self, frame: MatLike) -> MatLike:
-        display_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2HSV)
+    def process_frame(self, frame: MatLike, ctx: FrameContext | None = None) -> MatLike:
+        display_frame = FrameContext.ensure(frame, ctx).hsv
         return display_frame
@@ -3,7 +3,12 @@ import numpy as np
 from cv2.typing import MatLike
 
 from .base import BaseModeHandler
+from .buffers import BufferPool
+from .frame_context import FrameContext
+from .histogram import HistogramEngine
+from .point_ops import apply_table, contrast_table
 from .trackers import BrightnessTracker, ContrastTracker
+from .windows import window_manager
 
 
 class ContrastBrightnessHistogramHandler(BaseModeHandler):
@@ -12,12 +17,18 @@ class ContrastBrightnessHistogramHandler(BaseModeHandler):
         bins: int = 256,
         hist_height: int = 300,
         hist_width: int = 512,
+        hist_filled: bool = False,
+        hist_smoothing: float = 0.5,
+        hist_max_error: float = 0.002,
     ):
         super().__init__()
         # Histogram config
         self.bins = bins
         self.hist_height = hist_height
         self.hist_width = hist_width
+        self.hist_filled = hist_filled
+        # Subsampled, smoothed histograms drawn as one polyline per channel
+        self.histogram = HistogramEngine(bins, max_error=hist_max_error, smoothing=hist_smoothing)
         self.histogram_window_name = "Histogram"
 
     def setup_window(
@@ -35,54 +46,49 @@ class ContrastBrightnessHistogramHandler(BaseModeHandler):
             main_window_height,
             have_control_window=have_control_window,
         )
-        self.contrast_tracker = ContrastTracker(control_window_name)
-        self.brightness_tracker = BrightnessTracker(control_window_name)
+        self.create_trackers(control_window_name)
 
         # Histogram window
+        if self.headless:
+            return
         self.hist_width = max(self.hist_width, main_window_width // 2)
         self.hist_height = max(self.hist_height, min(400, main_window_height))
-        cv2.namedWindow(self.histogram_window_name, cv2.WINDOW_NORMAL)
-        cv2.resizeWindow(self.histogram_window_name, self.hist_width, self.hist_height)
-
-    # Histogram helpers
-    def _compute_channel_hist(self, image: np.ndarray, channel_index: int) -> np.ndarray:
-        hist = cv2.calcHist([image], [channel_index], None, [self.bins], [0, 256])
-        cv2.normalize(hist, hist, 0, self.hist_height, cv2.NORM_MINMAX)
-        return hist.flatten()
+        self.open_window(self.histogram_window_name, cv2.WINDOW_NORMAL, (self.hist_width, self.hist_height))
 
-    def _render_histogram(self, hists: list[np.ndarray], colors: list[tuple]) -> np.ndarray:
-        canvas = np.zeros((self.hist_height, self.hist_width, 3), dtype=np.uint8)
-        bin_w = max(1, int(self.hist_width / self.bins))
-        for hist, color in zip(hists, colors):
-            for i in range(1, self.bins):
-                x1 = (i - 1) * bin_w
-                x2 = i * bin_w
-                y1 = self.hist_height - int(hist[i - 1])
-                y2 = self.hist_height - int(hist[i])
-                cv2.line(canvas, (x1, y1), (x2, y2), color, 1, cv2.LINE_AA)
-        return canvas
+    def buffer_pools(self) -> list[BufferPool]:
+        return super().buffer_pools() + [self.histogram.buffers]
 
     def _update_histogram(self, frame: np.ndarray):
         if frame is None:
             return
+        canvas = self.buffers.get("histogram", (self.hist_height, self.hist_width, 3))
+        hists = self.histogram.compute(frame)
         if len(frame.shape) == 2 or frame.shape[2] == 1:
-            gray = frame if len(frame.shape) == 2 else frame[:, :, 0]
-            hist = self._compute_channel_hist(gray, 0)
-            hist_img = self._render_histogram([hist], [(200, 200, 200)])
+            colors = [(200, 200, 200)]
         else:
-            hists = [self._compute_channel_hist(frame, i) for i in range(3)]
-            hist_img = self._render_histogram(
-                hists,
-                [(255, 0, 0), (0, 255, 0), (0, 0, 255)],
-            )
-        cv2.imshow(self.histogram_window_name, hist_img)
+            colors = [(255, 0, 0), (0, 255, 0), (0, 0, 255)]
+        hist_img = self.histogram.render(hists, colors, canvas, self.hist_filled)
+        window_manager.show_image(self.histogram_window_name, hist_img)
 
-    def process_frame(self, frame: MatLike) -> MatLike:
-        if frame is None:
-            return frame
-        # Apply brightness / contrast using trackers
+    def create_trackers(self, control_window_name: str | None):
+        self.contrast_tracker = ContrastTracker(control_window_name, self.params)
+        self.brightness_tracker = BrightnessTracker(control_window_name, self.params)
+
+    def adjust(self, frame: MatLike, ctx: FrameContext | None = None) -> MatLike:
+        """The image shown (and histogrammed): brightness / contrast here, equalization in subclasses."""
+        # A lookup table rebuilt only when a slider moves
+        table = self.params.derived("table", self.brightness_contrast_table)
+        return apply_table(frame, table, dst=self.buffers.like("out", frame))
+
+    def brightness_contrast_table(self) -> np.ndarray:
         brightness = self.brightness_tracker.get_brightness()
         contrast = self.contrast_tracker.get_contrast()
-        adjusted = cv2.convertScaleAbs(frame, alpha=contrast / 50.0, beta=brightness - 50)
-        self._update_histogram(adjusted)
+        return contrast_table(contrast / 50.0, brightness - 50)
+
+    def process_frame(self, frame: MatLike, ctx: FrameContext | None = None) -> MatLike:
+        if frame is None:
+            return frame
+        adjusted = self.adjust(frame, ctx)
+        if not self.headless:
+            self._update_histogram(adjusted)
         return adjusted
@@ -3,8 +3,12 @@ import numpy as np
 from cv2.typing import MatLike
 
 from .base import BaseModeHandler
+from .frame_context import FrameContext
+from .morph import square_kernel
 from .trackers import HarrisParamsTracker
 
+RED = np.array([0, 0, 255], np.uint8)
+
 
 class CornerDetectionHandler(BaseModeHandler):
     # For default submode
@@ -16,10 +20,10 @@ class CornerDetectionHandler(BaseModeHandler):
             main_window_height,
             have_control_window=True,
         )
-        self.tracker = HarrisParamsTracker(control_window_name)
+        self.tracker = HarrisParamsTracker(control_window_name, self.params)
 
-    def process_frame(self, frame: MatLike) -> MatLike:
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY).astype("float32")
+    def process_frame(self, frame: MatLike, ctx: FrameContext | None = None) -> MatLike:
+        gray = FrameContext.ensure(frame, ctx).gray_f32
 
         block_size = self.tracker.get_block_size()
         sobel_ksize = self.tracker.get_sobel_ksize()  # Aperture size for Sobel operator
@@ -27,11 +31,16 @@ class CornerDetectionHandler(BaseModeHandler):
         threshold = self.tracker.get_threshold()  # lower threshold means more corners
 
         # Harris corner detection
-        harris_response = cv2.cornerHarris(gray, blockSize=block_size, ksize=sobel_ksize, k=0.04)
-        kernel = np.ones((dilate_ksize, dilate_ksize), np.uint8)
-        harris_response_dilated = cv2.dilate(harris_response, kernel)
-        corners = frame.copy()
+        harris_response = cv2.cornerHarris(
+            gray, blockSize=block_size, ksize=sobel_ksize, k=0.04, dst=self.buffers.like("harris", gray)
+        )
+        kernel = square_kernel(dilate_ksize)
+        harris_response_dilated = cv2.dilate(harris_response, kernel, dst=self.buffers.like("dilated", gray))
+        corners = self.buffers.like("out", frame)
+        np.copyto(corners, frame)
         # Thresholding to get the corners
         threshold_value = threshold * harris_response_dilated.max()
-        corners[harris_response_dilated > threshold_value] = [0, 0, 255]  # Mark corners in red
+        is_corner = np.greater(harris_response_dilated, threshold_value, out=self.buffers.like("mask", gray, bool))
+        np.copyto(corners, RED, where=is_corner[:, :, None])  # Mark corners in red
+        self.detections = cv2.countNonZero(is_corner.view(np.uint8))
         return corners
@@ -3,159 +3,119 @@ import numpy as np
 from cv2.typing import MatLike
 
 from .base import BaseModeHandler
+from .frame_context import FrameContext
 from .trackers import CannyThresholdTracker
 
 
+# Kernels are built once at import instead of on every frame
+ROBERTS_X = np.array([[0, 1], [-1, 0]])
+ROBERTS_Y = np.array(
+    [
+        [1, 0],
+        [0, -1],
+    ]
+)
+PREWITT_X = np.array(
+    [
+        [-1, 0, 1],
+        [-1, 0, 1],
+        [-1, 0, 1],
+    ]
+)
+PREWITT_Y = np.array(
+    [
+        [1, 1, 1],
+        [0, 0, 0],
+        [-1, -1, -1],
+    ]
+)
+SOBEL_X = np.array(
+    [
+        [-1, 0, 1],
+        [-2, 0, 2],
+        [-1, 0, 1],
+    ]
+)
+SOBEL_Y = np.array(
+    [
+        [1, 2, 1],
+        [0, 0, 0],
+        [-1, -2, -1],
+    ]
+)
+
+
 class EdgeDetectionHandler(BaseModeHandler):
     # For default submode
-    def process_frame(self, frame: MatLike) -> MatLike:
+    def process_frame(self, frame: MatLike, ctx: FrameContext | None = None) -> MatLike:
         return frame
 
 
 class RobertsXCrossHandler(BaseModeHandler):
-    def process_frame(self, frame: MatLike) -> MatLike:
-        kernel = np.array([[0, 1], [-1, 0]])
-        image_edges_x = cv2.filter2D(frame, -1, kernel)
-        return image_edges_x
+    def process_frame(self, frame: MatLike, ctx: FrameContext | None = None) -> MatLike:
+        return cv2.filter2D(frame, -1, ROBERTS_X, dst=self.buffers.like("out", frame))
 
 
 class RobertsYCrossHandler(BaseModeHandler):
-    def process_frame(self, frame: MatLike) -> MatLike:
-        kernel = np.array(
-            [
-                [1, 0],
-                [0, -1],
-            ]
-        )
-        image_edges_y = cv2.filter2D(frame, -1, kernel)
-        return image_edges_y
+    def process_frame(self, frame: MatLike, ctx: FrameContext | None = None) -> MatLike:
+        return cv2.filter2D(frame, -1, ROBERTS_Y, dst=self.buffers.like("out", frame))
 
 
 class RobertsXYCrossHandler(BaseModeHandler):
-    def process_frame(self, frame: MatLike) -> MatLike:
-        kernel_x = np.array(
-            [
-                [0, 1],
-                [-1, 0],
-            ]
-        )
-        kernel_y = np.array(
-            [
-                [1, 0],
-                [0, -1],
-            ]
-        )
-        image_edges_x = cv2.filter2D(frame, -1, kernel_x)
-        image_edges_y = cv2.filter2D(frame, -1, kernel_y)
-        image_edges = cv2.add(image_edges_x, image_edges_y)
+    def process_frame(self, frame: MatLike, ctx: FrameContext | None = None) -> MatLike:
+        image_edges_x = cv2.filter2D(frame, -1, ROBERTS_X, dst=self.buffers.like("x", frame))
+        image_edges_y = cv2.filter2D(frame, -1, ROBERTS_Y, dst=self.buffers.like("y", frame))
+        image_edges = cv2.add(image_edges_x, image_edges_y, dst=self.buffers.like("out", frame))
         return image_edges
 
 
 class PrewittXHandler(BaseModeHandler):
-    def process_frame(self, frame: MatLike) -> MatLike:
-        kernel = np.array(
-            [
-                [-1, 0, 1],
-                [-1, 0, 1],
-                [-1, 0, 1],
-            ]
-        )
-        image_edges_x = cv2.filter2D(frame, -1, kernel)
-        return image_edges_x
+    def process_frame(self, frame: MatLike, ctx: FrameContext | None = None) -> MatLike:
+        return cv2.filter2D(frame, -1, PREWITT_X, dst=self.buffers.like("out", frame))
 
 
 class PrewittYHandler(BaseModeHandler):
-    def process_frame(self, frame: MatLike) -> MatLike:
-        kernel = np.array(
-            [
-                [1, 1, 1],
-                [0, 0, 0],
-                [-1, -1, -1],
-            ]
-        )
-        image_edges_y = cv2.filter2D(frame, -1, kernel)
-        return image_edges_y
+    def process_frame(self, frame: MatLike, ctx: FrameContext | None = None) -> MatLike:
+        return cv2.filter2D(frame, -1, PREWITT_Y, dst=self.buffers.like("out", frame))
 
 
 class PrewittXYHandler(BaseModeHandler):
-    def process_frame(self, frame: MatLike) -> MatLike:
-        kernel_x = np.array(
-            [
-                [-1, 0, 1],
-                [-1, 0, 1],
-                [-1, 0, 1],
-            ]
-        )
-        kernel_y = np.array(
-            [
-                [1, 1, 1],
-                [0, 0, 0],
-                [-1, -1, -1],
-            ]
-        )
-        image_edges_x = cv2.filter2D(frame, -1, kernel_x)
-        image_edges_y = cv2.filter2D(frame, -1, kernel_y)
-        image_edges = cv2.add(image_edges_x, image_edges_y)
+    def process_frame(self, frame: MatLike, ctx: FrameContext | None = None) -> MatLike:
+        image_edges_x = cv2.filter2D(frame, -1, PREWITT_X, dst=self.buffers.like("x", frame))
+        image_edges_y = cv2.filter2D(frame, -1, PREWITT_Y, dst=self.buffers.like("y", frame))
+        image_edges = cv2.add(image_edges_x, image_edges_y, dst=self.buffers.like("out", frame))
         return image_edges
 
 
 class SobelXHandler(BaseModeHandler):
-    def process_frame(self, frame: MatLike) -> MatLike:
+    def process_frame(self, frame: MatLike, ctx: FrameContext | None = None) -> MatLike:
         # cv.Sobel(frame, cv.CV_64F, 1, 0, ksize=3)
-        kernel = np.array(
-            [
-                [-1, 0, 1],
-                [-2, 0, 2],
-                [-1, 0, 1],
-            ]
-        )
-        image_edges_x = cv2.filter2D(frame, -1, kernel)
-        return image_edges_x
+        return cv2.filter2D(frame, -1, SOBEL_X, dst=self.buffers.like("out", frame))
 
 
 class SobelYHandler(BaseModeHandler):
-    def process_frame(self, frame: MatLike) -> MatLike:
+    def process_frame(self, frame: MatLike, ctx: FrameContext | None = None) -> MatLike:
         # cv.Sobel(frame, cv.CV_64F, 0, 1, ksize=3)
-        kernel = np.array(
-            [
-                [1, 2, 1],
-                [0, 0, 0],
-                [-1, -2, -1],
-            ]
-        )
-        image_edges_y = cv2.filter2D(frame, -1, kernel)
-        return image_edges_y
+        return cv2.filter2D(frame, -1, SOBEL_Y, dst=self.buffers.like("out", frame))
 
 
 class SobelHandler(BaseModeHandler):
-    def process_frame(self, frame: MatLike) -> MatLike:
+    def process_frame(self, frame: MatLike, ctx: FrameContext | None = None) -> MatLike:
         # cv.Sobel(frame, cv.CV_64F, 1, 1, ksize=3)
-        kernel_x = np.array(
-            [
-                [-1, 0, 1],
-                [-2, 0, 2],
-                [-1, 0, 1],
-            ]
-        )
-        kernel_y = np.array(
-            [
-                [1, 2, 1],
-                [0, 0, 0],
-                [-1, -2, -1],
-            ]
-        )
-        image_edges_x = cv2.filter2D(frame, -1, kernel_x)
-        image_edges_y = cv2.filter2D(frame, -1, kernel_y)
-        image_edges = cv2.add(image_edges_x, image_edges_y)
+        image_edges_x = cv2.filter2D(frame, -1, SOBEL_X, dst=self.buffers.like("x", frame))
+        image_edges_y = cv2.filter2D(frame, -1, SOBEL_Y, dst=self.buffers.like("y", frame))
+        image_edges = cv2.add(image_edges_x, image_edges_y, dst=self.buffers.like("out", frame))
         return image_edges
 
 
 class LaplacianHandler(BaseModeHandler):
-    def process_frame(self, frame: MatLike) -> MatLike:
-        return cv2.Laplacian(frame, cv2.CV_64F)
+    def process_frame(self, frame: MatLike, ctx: FrameContext | None = None) -> MatLike:
+        return cv2.Laplacian(frame, cv2.CV_64F, dst=self.buffers.like("out", frame, np.float64))
 
 
 class CannyHandler(BaseModeHandler):
+    produces_edge_map = True
+
     def setup_window(
         self,
         main_window_name: str,
@@ -170,8 +130,9 @@ class CannyHandler(BaseModeHandler):
             main_window_height,
             have_control_window=True,
         )
-        self.canny_tracker = CannyThresholdTracker(control_window_name)
+        self.canny_tracker = CannyThresholdTracker(control_window_name, self.params)
 
-    def process_frame(self, frame: MatLike) -> MatLike:
+    def process_frame(self, frame: MatLike, ctx: FrameContext | None = None) -> MatLike:
         threshold1, threshold2 = self.canny_tracker.get_thresholds()
-        return cv2.Canny(frame, threshold1, threshold2, L2gradient=True)
+        edges = self.buffers.get("out", frame.shape[:2])
+        return cv2.Canny(frame, threshold1, threshold2, edges=edges, L2gradient=True)
@@ -0,0 +1,104 @@
+import cv2
+import numpy as np
+from cv2.typing import MatLike
+
+from .contrast_brightness import ContrastBrightnessHistogramHandler
+from .frame_context import FrameContext
+from .histogram import HistogramEngine
+from .point_ops import apply_table
+from .trackers import CLAHEParamsTracker, LutReuseTracker
+
+
+def equalization_table(hist: np.ndarray) -> np.ndarray:
+    """Lookup table of global histogram equalization, the same one cv2.equalizeHist builds."""
+    hist = hist.astype(np.int64).ravel()
+    table = np.zeros(256, np.uint8)
+    first = int(np.flatnonzero(hist)[0]) if hist.any() else 0
+    total = int(hist.sum())
+    if hist[first] == total:
+        # A single intensity: cv2.equalizeHist maps it to itself
+        table[first] = first
+        return table
+    scale = np.float32(255 / (total - hist[first]))
+    sums = np.cumsum(hist[first + 1 :])
+    table[first + 1 :] = np.clip(np.rint(sums.astype(np.float32) * scale), 0, 255)
+    return table
+
+
+class LumaEqualizationHandler(ContrastBrightnessHistogramHandler):
+    """Equalizes the luma (Y of YCrCb) only, so colours keep their hue and saturation."""
+
+    def create_trackers(self, control_window_name: str | None):
+        pass
+
+    def equalize(self, luma: MatLike, dst: np.ndarray) -> MatLike:
+        raise NotImplementedError
+
+    def adjust(self, frame: MatLike, ctx: FrameContext | None = None) -> MatLike:
+        if frame.ndim == 2:
+            return self.equalize(frame, self.buffers.like("out", frame))
+        ycrcb = self.buffers.like("ycrcb", frame)
+        cv2.cvtColor(frame, cv2.COLOR_BGR2YCrCb, dst=ycrcb)
+        luma = cv2.extractChannel(ycrcb, 0, dst=self.buffers.get("luma", frame.shape[:2]))
+        equalized = self.equalize(luma, self.buffers.get("equalized", frame.shape[:2]))
+        cv2.insertChannel(equalized, ycrcb, 0)
+        return cv2.cvtColor(ycrcb, cv2.COLOR_YCrCb2BGR, dst=self.buffers.like("out", frame))
+
+
+class EqualizeHistHandler(LumaEqualizationHandler):
+    """
+    cv2.equalizeHist on the luma. With LUT Reuse above 0 the table is kept while the scene is stable: a
+    32-bin histogram of a subsample (at most ~62k pixels, see HistogramEngine) is compared with the one the
+    table was built from, and the table is rebuilt once more than the LUT Reuse share of the pixels moved
+    between bins. Applying a kept table is cheaper than equalizeHist, which counts every pixel.
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.histogram_signature = HistogramEngine(bins=32, smoothing=0)
+        self._reference: tuple | None = None
+        self.table: np.ndarray | None = None
+        self.rebuilds = 0
+
+    def create_trackers(self, control_window_name: str | None):
+        self.lut_reuse_tracker = LutReuseTracker(control_window_name, self.params)
+
+    def scene_changed(self, luma: MatLike, tolerance: float) -> bool:
+        """Whether the table must be rebuilt for this frame."""
+        signature = self.histogram_signature.compute(luma)
+        key = (self.params.version, luma.shape)
+        if self._reference is not None and self._reference[0] == key:
+            # Share of pixels in different bins (total variation distance)
+            if 0.5 * float(np.abs(signature - self._reference[1]).sum()) < tolerance:
+                return False
+        self._reference = (key, signature.copy())
+        self.rebuilds += 1
+        return True
+
+    def equalize(self, luma: MatLike, dst: np.ndarray) -> MatLike:
+        tolerance = self.lut_reuse_tracker.get_tolerance()
+        if tolerance <= 0:
+            # Nothing to reuse: skip the signature and let OpenCV count and apply in one call
+            self._reference = None
+            return cv2.equalizeHist(luma, dst=dst)
+        if self.scene_changed(luma, tolerance) or self.table is None:
+            self.table = equalization_table(cv2.calcHist([luma], [0], None, [256], [0, 256]))
+        return apply_table(luma, self.table, dst=dst)
+
+
+class CLAHEHandler(LumaEqualizationHandler):
+    def create_trackers(self, control_window_name: str | None):
+        self.clahe_tracker = CLAHEParamsTracker(control_window_name, self.params)
+
+    def clahe(self) -> cv2.CLAHE:
+        # Recreated only when a slider moves
+        return self.params.derived(
+            "clahe",
+            lambda: cv2.createCLAHE(
+                self.clahe_tracker.get_clip_limit(),
+                (self.clahe_tracker.get_tile_grid(), self.clahe_tracker.get_tile_grid()),
+            ),
+        )
+
+    def equalize(self, luma: MatLike, dst: np.ndarray) -> MatLike:
+        return self.clahe().apply(luma, dst=dst)
@@ -0,0 +1,74 @@
+import threading
+from typing import Callable, Hashable
+
+import cv2
+import numpy as np
+from cv2.typing import MatLike
+
+from .buffers import BufferPool
+
+
+class FrameContext:
+    """
+    Derived products of one input frame (gray, float gray, HSV, median-blurred gray),
+    computed on first use and memoized, so every handler or view consuming the same frame
+    pays for each product once. Products are shared: treat them as read-only.
+    Products are written into buffers; pass a long-lived BufferPool to reuse the same arrays for
+    every frame (products of the previous context are then overwritten).
+    """
+
+    def __init__(self, frame: MatLike, buffers: BufferPool | None = None):
+        self.frame = frame
+        self.buffers = buffers if buffers is not None else BufferPool()
+        self._cache: dict[Hashable, MatLike] = {}
+        # Handlers may run on several threads over the same frame (compare mode)
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def ensure(frame: MatLike, ctx: "FrameContext | None") -> "FrameContext":
+        """The given context, or a fresh one for callers that did not pass any."""
+        return ctx if ctx is not None else FrameContext(frame)
+
+    def get(self, key: Hashable, compute: Callable[[], MatLike]) -> MatLike:
+        """Generic memoization hook for products not covered by the helpers below."""
+        value = self._cache.get(key)
+        if value is None:
+            with self._lock:
+                value = self._cache.get(key)
+                if value is None:
+                    value = self._cache[key] = compute()
+        return value
+
+    def put(self, key: Hashable, value: MatLike):
+        """Store a product computed elsewhere (e.g. the gray image a pipeline stage already has)."""
+        with self._lock:
+            self._cache[key] = value
+
+    @property
+    def gray(self) -> MatLike:
+        if self.frame.ndim == 2:
+            return self.frame
+        return self.get("gray", lambda: cv2.cvtColor(self.frame, cv2.COLOR_BGR2GRAY, dst=self._dst("gray")))
+
+    @property
+    def gray_f32(self) -> MatLike:
+        return self.get("gray_f32", lambda: self._copy_to(self.gray, self._dst("gray_f32", np.float32)))
+
+    @property
+    def hsv(self) -> MatLike:
+        return self.get(
+            "hsv", lambda: cv2.cvtColor(self.frame, cv2.COLOR_BGR2HSV, dst=self.buffers.like("hsv", self.frame))
+        )
+
+    def median_gray(self, ksize: int = 5) -> MatLike:
+        key = ("median_gray", ksize)
+        return self.get(key, lambda: cv2.medianBlur(self.gray, ksize, dst=self._dst(key)))
+
+    def _dst(self, key: Hashable, dtype=np.uint8) -> np.ndarray:
+        """Buffer with the frame's height and width and a single channel."""
+        return self.buffers.get(key, self.frame.shape[:2], dtype)
+
+    @staticmethod
+    def _copy_to(src: MatLike, dst: np.ndarray) -> np.ndarray:
+        np.copyto(dst, src)
+        return dst
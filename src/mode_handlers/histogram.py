@@ -0,0 +1,108 @@
+import math
+
+import cv2
+import numpy as np
+from cv2.typing import MatLike
+
+from .buffers import BufferPool
+
+
+class HistogramEngine:
+    """
+    Per-channel histograms of a frame for display.
+    Histograms are counted on a random subsample, as small as max_error allows: with n pixels drawn at
+    random the standard error of any bin's fraction is at most 0.5 / sqrt(n), so n >= (0.5 / max_error)^2
+    (62.5k pixels for the default 0.002). The positions are drawn once per frame size, and every channel is
+    counted in one np.bincount pass.
+    Results are smoothed over time with an exponential moving average (smoothing = weight of the previous
+    histogram, 0 disables it) and drawn as one polyline (or filled polygon) per channel.
+    """
+
+    def __init__(self, bins: int = 256, max_error: float = 0.002, smoothing: float = 0.5, seed: int = 0):
+        self.bins = bins
+        self.max_error = max_error
+        self.smoothing = smoothing
+        self.seed = seed
+        self.buffers = BufferPool()
+        # Bin of every 8-bit value, for cv2.LUT
+        self._bin_of = (np.arange(256) * bins // 256).astype(np.uint8)
+        self._sampling_key = None
+        self._smoothed: np.ndarray | None = None
+
+    def sample_size(self, shape: tuple[int, ...]) -> int:
+        """Pixels to draw from a frame of this shape to keep the error bound (all of them if it is smaller)."""
+        pixels = shape[0] * shape[1]
+        if self.max_error <= 0:
+            return pixels
+        return min(pixels, math.ceil((0.5 / self.max_error) ** 2))
+
+    def _sampling(self, shape: tuple[int, ...], channels: int):
+        """Flat indices of every channel of the sampled pixels (None for all), and the channel * bins offset of each."""
+        key = (shape[:2], channels)
+        if self._sampling_key != key:
+            pixels = shape[0] * shape[1]
+            count = self.sample_size(shape)
+            if count >= pixels:
+                # Every pixel is counted, nothing to gather
+                self._indices = None
+            else:
+                # Drawn without replacement, sorted so the gather walks the frame in memory order
+                positions = np.sort(np.random.default_rng(self.seed).choice(pixels, count, replace=False))
+                self._indices = (positions[:, None] * channels + np.arange(channels)).ravel().astype(np.intp)
+            self._offsets = np.tile(np.arange(channels, dtype=np.uint16) * self.bins, count)
+            self._sampling_key = key
+        return self._indices, self._offsets
+
+    def compute(self, image: MatLike) -> np.ndarray:
+        """(channels, bins) array of the fraction of pixels in each bin, smoothed over previous calls."""
+        channels = 1 if image.ndim == 2 else image.shape[2]
+        indices, offsets = self._sampling(image.shape, channels)
+        sample = image.reshape(-1)
+        if indices is not None:
+            sample = np.take(sample, indices, out=self.buffers.get("sample", indices.shape, image.dtype))
+        if sample.dtype != np.uint8:
+            sample = np.clip(sample, 0, 255).astype(np.uint8)
+        if self.bins != 256:
+            sample = cv2.LUT(sample, self._bin_of, dst=self.buffers.get("binned", sample.shape))
+        # Every channel in one count: the key of a sampled value is channel * bins + bin
+        keys = np.add(sample, offsets, out=self.buffers.get("keys", sample.shape, np.uint16), dtype=np.uint16)
+        counts = np.bincount(keys, minlength=channels * self.bins)
+        hists = self.buffers.get("hists", (channels, self.bins), np.float32)
+        sampled = len(offsets) // channels
+        np.multiply(counts.reshape(channels, self.bins), 1.0 / sampled, out=hists, casting="unsafe")
+
+        if self._smoothed is None or self._smoothed.shape != hists.shape or self.smoothing <= 0:
+            self._smoothed = hists.copy()
+        else:
+            # smoothed = smoothing * smoothed + (1 - smoothing) * hists
+            self._smoothed *= self.smoothing
+            self._smoothed += (1 - self.smoothing) * hists
+        return self._smoothed
+
+    def render(
+        self,
+        hists: np.ndarray,
+        colors: list[tuple],
+        canvas: np.ndarray,
+        filled: bool = False,
+    ) -> np.ndarray:
+        """Draw every channel scaled to the canvas height (min-max per channel, like cv2.NORM_MINMAX)."""
+        canvas.fill(0)
+        height = canvas.shape[0]
+        bin_w = max(1, int(canvas.shape[1] / self.bins))
+        low = hists.min(axis=1, keepdims=True)
+        span = np.maximum(hists.max(axis=1, keepdims=True) - low, 1e-12)
+        ys = height - ((hists - low) * (height / span)).astype(np.int32)
+        xs = np.broadcast_to(np.arange(self.bins, dtype=np.int32) * bin_w, ys.shape)
+        points = np.stack([xs, ys], axis=2)
+        for channel_points, color in zip(points, colors):
+            if filled:
+                # Added on top of each other, so overlapping channels mix instead of hiding each other
+                layer = self.buffers.like("layer", canvas)
+                layer.fill(0)
+                base = [[channel_points[-1, 0], height], [0, height]]
+                cv2.fillPoly(layer, [np.concatenate([channel_points, base]).astype(np.int32)], color)
+                cv2.add(canvas, layer, dst=canvas)
+            else:
+                cv2.polylines(canvas, [channel_points], False, color, 1, cv2.LINE_AA)
+        return canvas
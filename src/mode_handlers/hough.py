@@ -3,10 +3,13 @@ import numpy as np
 from cv2.typing import MatLike
 
 from .base import BaseModeHandler
+from .frame_context import FrameContext
 from .trackers import CannyThresholdTracker, HoughCirclesParamsTracker, HoughLinesParamsTracker
 
 
 class HoughLinesHandler(BaseModeHandler):
+    accepts_edge_map = True
+
     def setup_window(
         self,
         main_window_name,
@@ -22,16 +25,23 @@ class HoughLinesHandler(BaseModeHandler):
             main_window_height,
             have_control_window,
         )
-        self.canny_tracker = CannyThresholdTracker(control_window_name)
-        self.hough_tracker = HoughLinesParamsTracker(control_window_name)
+        if not self.edges_from_upstream:
+            self.canny_tracker = CannyThresholdTracker(control_window_name, self.params)
+        self.hough_tracker = HoughLinesParamsTracker(control_window_name, self.params)
 
-    def process_frame(self, frame: MatLike) -> MatLike:
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-        canny_low, canny_high = self.canny_tracker.get_thresholds()
+    def process_frame(self, frame: MatLike, ctx: FrameContext | None = None) -> MatLike:
+        gray = FrameContext.ensure(frame, ctx).gray
         hough_threshold = self.hough_tracker.get_threshold()
-        edges = cv2.Canny(gray, canny_low, canny_high, L2gradient=True)
+        if self.edges_from_upstream:
+            # The frame already is an edge map (e.g. Canny earlier in a pipeline)
+            edges = gray
+        else:
+            canny_low, canny_high = self.canny_tracker.get_thresholds()
+            edges = cv2.Canny(gray, canny_low, canny_high, edges=self.buffers.like("edges", gray), L2gradient=True)
         lines = cv2.HoughLines(edges, 1, np.pi / 180, hough_threshold)
-        hough_image = frame.copy()
+        self.detections = 0 if lines is None else len(lines)
+        hough_image = self.buffers.like("out", frame)
+        np.copyto(hough_image, frame)
         if lines is not None:
             for rho, theta in lines[:, 0]:
                 a = np.cos(theta)
@@ -62,11 +72,10 @@ class HoughCirclesHandler(BaseModeHandler):
             main_window_height,
             have_control_window,
         )
-        self.hough_tracker = HoughCirclesParamsTracker(control_window_name)
+        self.hough_tracker = HoughCirclesParamsTracker(control_window_name, self.params)
 
-    def process_frame(self, frame: MatLike) -> MatLike:
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-        gray = cv2.medianBlur(gray, 5)
+    def process_frame(self, frame: MatLike, ctx: FrameContext | None = None) -> MatLike:
+        gray = FrameContext.ensure(frame, ctx).median_gray(5)
 
         circles = cv2.HoughCircles(
             gray,
@@ -78,7 +87,9 @@ class HoughCirclesHandler(BaseModeHandler):
             minRadius=self.hough_tracker.min_radius,
             maxRadius=self.hough_tracker.max_radius,
         )
-        hough_image = frame.copy()
+        self.detections = 0 if circles is None else circles.shape[1]
+        hough_image = self.buffers.like("out", frame)
+        np.copyto(hough_image, frame)
         if circles is not None:
             circles = np.uint16(np.around(circles))
             for i in circles[0, :]:
@@ -1,153 +1,131 @@
-from mode_handlers.ar import ARHandler
-from mode_handlers.blur_sharpen import (
-    AverageBlurHandler,
-    BilateralBlurHandler,
-    GaussianBlurAutoHandler,
-    GaussianBlurHandler,
-    MedianBlurHandler,
-    SharpenHandler,
-)
-from mode_handlers.camera_calibration import CameraCalibrationHandler
-from mode_handlers.color_channels import (
-    BlueChannelHandler,
-    GrayScaleHandler,
-    GreenChannelHandler,
-    HSVHandler,
-    RedChannelHandler,
-    RGBHandler,
-)
-from mode_handlers.contrast_brightness import ContrastBrightnessHistogramHandler
-from mode_handlers.corner import CornerDetectionHandler
-from mode_handlers.edges import (
-    CannyHandler,
-    LaplacianHandler,
-    PrewittXHandler,
-    PrewittXYHandler,
-    PrewittYHandler,
-    RobertsXCrossHandler,
-    RobertsXYCrossHandler,
-    RobertsYCrossHandler,
-    SobelHandler,
-    SobelXHandler,
-    SobelYHandler,
-)
-from mode_handlers.hough import HoughCirclesHandler, HoughLinesHandler
-from mode_handlers.morph import (
-    BlackHatHandler,
-    ClosingHandler,
-    DilationHandler,
-    ErosionHandler,
-    MorphologicalGradientHandler,
-    OpeningHandler,
-    TopHatHandler,
-)
-from mode_handlers.sift import PanoramaHandler
-from mode_handlers.transformation import (
-    ExponentialHandler,
-    LogarithmicHandler,
-    NegativeHandler,
-    PowerLawHandler,
-    ThresholdingHandler,
-)
-from mode_handlers.translate_rotate_scale import TranslateHandler
+import functools
+import importlib
+import json
+
+# Handlers are referenced as "module:ClassName" inside the mode_handlers package and only imported
+# the first time their mode is selected (see load_handler), so startup does not pay for ArUco/SIFT.
+# A pipeline chains several handlers: "module:ClassName > module:ClassName > ..." (see PipelineHandler).
+PIPELINE_SEPARATOR = ">"
 
 mode_map = {
     "1": {
         "name": "Color Channel",
         "submodes": {
-            "q": {"name": "RGB", "handler": RGBHandler},
-            "w": {"name": "Gray scale", "handler": GrayScaleHandler},
-            "e": {"name": "HSV", "handler": HSVHandler},
-            "r": {"name": "Red Channel", "handler": RedChannelHandler},
-            "t": {"name": "Green Channel", "handler": GreenChannelHandler},
-            "y": {"name": "Blue Channel", "handler": BlueChannelHandler},
+            "q": {"name": "RGB", "handler": "color_channels:RGBHandler"},
+            "w": {"name": "Gray scale", "handler": "color_channels:GrayScaleHandler"},
+            "e": {"name": "HSV", "handler": "color_channels:HSVHandler"},
+            "r": {"name": "Red Channel", "handler": "color_channels:RedChannelHandler"},
+            "t": {"name": "Green Channel", "handler": "color_channels:GreenChannelHandler"},
+            "y": {"name": "Blue Channel", "handler": "color_channels:BlueChannelHandler"},
         },
     },
     "2": {
         "name": "Contrast & Brightness & Histogram",
         "submodes": {
-            "q": {"name": "Main", "handler": ContrastBrightnessHistogramHandler},
+            "q": {"name": "Main", "handler": "contrast_brightness:ContrastBrightnessHistogramHandler"},
+            "w": {"name": "Equalize Histogram", "handler": "equalization:EqualizeHistHandler"},
+            "e": {"name": "CLAHE", "handler": "equalization:CLAHEHandler"},
         },
     },
     "3": {
         "name": "Transformations",
         "submodes": {
-            "q": {"name": "Logarithmic", "handler": LogarithmicHandler},
-            "w": {"name": "Exponential", "handler": ExponentialHandler},
-            "e": {"name": "Power-law", "handler": PowerLawHandler},
-            "r": {"name": "Thresholding", "handler": ThresholdingHandler},
-            "t": {"name": "Negative", "handler": NegativeHandler},
+            "q": {"name": "Logarithmic", "handler": "transformation:LogarithmicHandler"},
+            "w": {"name": "Exponential", "handler": "transformation:ExponentialHandler"},
+            "e": {"name": "Power-law", "handler": "transformation:PowerLawHandler"},
+            "r": {"name": "Thresholding", "handler": "transformation:ThresholdingHandler"},
+            "t": {"name": "Negative", "handler": "transformation:NegativeHandler"},
         },
     },
     "4": {
         "name": "Blur and Sharpen",
         "submodes": {
-            "q": {"name": "Averaging", "handler": AverageBlurHandler},
-            "w": {"name": "Gaussian", "handler": GaussianBlurHandler},
-            "e": {"name": "GaussianAuto", "handler": GaussianBlurAutoHandler},
-            "r": {"name": "Median", "handler": MedianBlurHandler},
-            "t": {"name": "Bilateral", "handler": BilateralBlurHandler},
-            "y": {"name": "Sharpening", "handler": SharpenHandler},
+            "q": {"name": "Averaging", "handler": "blur_sharpen:AverageBlurHandler"},
+            "w": {"name": "Gaussian", "handler": "blur_sharpen:GaussianBlurHandler"},
+            "e": {"name": "GaussianAuto", "handler": "blur_sharpen:GaussianBlurAutoHandler"},
+            "r": {"name": "Median", "handler": "blur_sharpen:MedianBlurHandler"},
+            "t": {"name": "Bilateral", "handler": "blur_sharpen:BilateralBlurHandler"},
+            "y": {"name": "Sharpening", "handler": "blur_sharpen:SharpenHandler"},
         },
     },
     "5": {
         "name": "Edge Detection",
         "submodes": {
-            "q": {"name": "Canny", "handler": CannyHandler},
-            "a": {"name": "Robert X", "handler": RobertsXCrossHandler},
-            "s": {"name": "Robert Y", "handler": RobertsYCrossHandler},
-            "d": {"name": "Robert XY", "handler": RobertsXYCrossHandler},
-            "z": {"name": "Prewitt X", "handler": PrewittXHandler},
-            "x": {"name": "Prewitt Y", "handler": PrewittYHandler},
-            "c": {"name": "Prewitt XY", "handler": PrewittXYHandler},
-            "w": {"name": "Sobel X", "handler": SobelXHandler},
-            "e": {"name": "Sobel Y", "handler": SobelYHandler},
-            "r": {"name": "Sobel XY", "handler": SobelHandler},
-            "t": {"name": "Laplacian", "handler": LaplacianHandler},
+            "q": {"name": "Canny", "handler": "edges:CannyHandler"},
+            "a": {"name": "Robert X", "handler": "edges:RobertsXCrossHandler"},
+            "s": {"name": "Robert Y", "handler": "edges:RobertsYCrossHandler"},
+            "d": {"name": "Robert XY", "handler": "edges:RobertsXYCrossHandler"},
+            "z": {"name": "Prewitt X", "handler": "edges:PrewittXHandler"},
+            "x": {"name": "Prewitt Y", "handler": "edges:PrewittYHandler"},
+            "c": {"name": "Prewitt XY", "handler": "edges:PrewittXYHandler"},
+            "w": {"name": "Sobel X", "handler": "edges:SobelXHandler"},
+            "e": {"name": "Sobel Y", "handler": "edges:SobelYHandler"},
+            "r": {"name": "Sobel XY", "handler": "edges:SobelHandler"},
+            "t": {"name": "Laplacian", "handler": "edges:LaplacianHandler"},
         },
     },
     "6": {
         "name": "Morphological Operations",
         "submodes": {
-            "q": {"name": "Erosion", "handler": ErosionHandler},
-            "w": {"name": "Dilation", "handler": DilationHandler},
-            "e": {"name": "Opening", "handler": OpeningHandler},
-            "r": {"name": "Closing", "handler": ClosingHandler},
-            "t": {"name": "Morphological Gradient", "handler": MorphologicalGradientHandler},
-            "y": {"name": "Top Hat", "handler": TopHatHandler},
-            "u": {"name": "Black Hat", "handler": BlackHatHandler},
+            "q": {"name": "Erosion", "handler": "morph:ErosionHandler"},
+            "w": {"name": "Dilation", "handler": "morph:DilationHandler"},
+            "e": {"name": "Opening", "handler": "morph:OpeningHandler"},
+            "r": {"name": "Closing", "handler": "morph:ClosingHandler"},
+            "t": {"name": "Morphological Gradient", "handler": "morph:MorphologicalGradientHandler"},
+            "y": {"name": "Top Hat", "handler": "morph:TopHatHandler"},
+            "u": {"name": "Black Hat", "handler": "morph:BlackHatHandler"},
         },
     },
     "7": {
         "name": "Corner Detection and Hough Transform",
         "submodes": {
-            "q": {"name": "Harris Corner", "handler": CornerDetectionHandler},
-            "w": {"name": "Hough Lines", "handler": HoughLinesHandler},
-            "e": {"name": "Hough Circles", "handler": HoughCirclesHandler},
+            "q": {"name": "Harris Corner", "handler": "corner:CornerDetectionHandler"},
+            "w": {"name": "Hough Lines", "handler": "hough:HoughLinesHandler"},
+            "e": {"name": "Hough Circles", "handler": "hough:HoughCirclesHandler"},
         },
     },
     "8": {
         "name": "Transform Image",
         "submodes": {
-            "q": {"name": "Translate/Rotate/Scale", "handler": TranslateHandler},
+            "q": {"name": "Translate/Rotate/Scale", "handler": "translate_rotate_scale:TranslateHandler"},
         },
     },
     "9": {
         "name": "Panorama",
         "submodes": {
-            "q": {"name": "Panorama", "handler": PanoramaHandler},
+            "q": {"name": "Panorama", "handler": "sift:PanoramaHandler"},
         },
     },
     "0": {
         "name": "Camera Calibration",
         "submodes": {
-            "q": {"name": "Camera Calibration", "handler": CameraCalibrationHandler},
+            "q": {"name": "Camera Calibration", "handler": "camera_calibration:CameraCalibrationHandler"},
         },
     },
     "-": {
         "name": "AR",
         "submodes": {
-            "q": {"name": "AR", "handler": ARHandler},
+            "q": {"name": "AR", "handler": "ar:ARHandler"},
+        },
+    },
+    "=": {
+        "name": "Pipelines",
+        "submodes": {
+            "q": {"name": "Median > Canny", "handler": "blur_sharpen:MedianBlurHandler > edges:CannyHandler"},
+            "w": {
+                "name": "Median > Canny > Hough Lines",
+                "handler": "blur_sharpen:MedianBlurHandler > edges:CannyHandler > hough:HoughLinesHandler",
+            },
+            "e": {"name": "Gaussian > Sobel XY", "handler": "blur_sharpen:GaussianBlurHandler > edges:SobelHandler"},
+            "r": {
+                "name": "Bilateral > Negative",
+                "handler": "blur_sharpen:BilateralBlurHandler > transformation:NegativeHandler",
+            },
+            "t": {
+                "name": "Log > Power-law > Negative",
+                "handler": "transformation:LogarithmicHandler > transformation:PowerLawHandler"
+                " > transformation:NegativeHandler",
+            },
         },
     },
 }
@@ -155,3 +133,52 @@ mode_map = {
 keys2modes = {k: v["name"].lower() for k, v in mode_map.items()}
 
 modes2keys = {v.lower(): k for k, v in keys2modes.items()}
+
+_handler_cache = {}
+
+
+def load_handler(path: str | None):
+    """Resolve a "module:ClassName" handler path, importing the module on first use."""
+    if path is None:
+        return None
+    handler_class = _handler_cache.get(path)
+    if handler_class is None:
+        if PIPELINE_SEPARATOR in path:
+            from .pipeline import PipelineHandler
+
+            stages = [load_handler(stage.strip()) for stage in path.split(PIPELINE_SEPARATOR)]
+            handler_class = functools.partial(PipelineHandler, stages)
+        else:
+            module_name, class_name = path.split(":")
+            module = importlib.import_module(f"mode_handlers.{module_name}")
+            handler_class = getattr(module, class_name)
+        _handler_cache[path] = handler_class
+    return handler_class
+
+
+def register_pipelines(path: str, mode_key: str = "=", reserved_keys: frozenset[str] = frozenset()):
+    """
+    Add pipelines from a JSON file as submodes of the Pipelines mode, e.g.
+    {"a": {"name": "Blur > Edges", "stages": ["blur_sharpen:GaussianBlurHandler", "edges:CannyHandler"]}}
+    Submode keys must be single characters that are neither mode keys nor in reserved_keys (the application's
+    own keys), which are handled first and would make the pipeline impossible to select.
+    """
+    with open(path) as f:
+        pipelines = json.load(f)
+    submodes = mode_map[mode_key]["submodes"]
+    for submode_key, pipeline in pipelines.items():
+        if len(submode_key) != 1:
+            raise ValueError(f"Pipeline '{pipeline['name']}' in {path}: submode key '{submode_key}' is not one key")
+        if submode_key in mode_map or submode_key in reserved_keys:
+            raise ValueError(
+                f"Pipeline '{pipeline['name']}' in {path}: submode key '{submode_key}' is already used by the "
+                f"application (mode keys {''.join(mode_map)}, other keys {''.join(sorted(reserved_keys))})"
+            )
+        submodes[submode_key] = {
+            "name": pipeline["name"],
+            "handler": f" {PIPELINE_SEPARATOR} ".join(pipeline["stages"]),
+        }
+
+
+def get_handler_class(mode_key: str, submode_key: str):
+    return load_handler(mode_map[mode_key]["submodes"][submode_key].get("handler"))
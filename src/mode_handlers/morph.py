@@ -1,21 +1,31 @@
+import functools
+
 import cv2
 import numpy as np
 from cv2.typing import MatLike
 
 from .base import BaseModeHandler
+from .frame_context import FrameContext
 from .trackers import IntensityThresholdTracker, KernelSize3579Tracker
 
 
-def binarize(frame: MatLike, intensity_threshold: int) -> MatLike:
-    # Convert to grayscale if not already
-    if len(frame.shape) == 3:
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-    else:
-        gray = frame
-    _, binary = cv2.threshold(gray, intensity_threshold, 255, cv2.THRESH_BINARY)
+def binarize(
+    frame: MatLike, intensity_threshold: int, ctx: FrameContext | None = None, dst: MatLike | None = None
+) -> MatLike:
+    # Grayscale from the shared frame context (returns frame itself if already gray)
+    gray = FrameContext.ensure(frame, ctx).gray
+    _, binary = cv2.threshold(gray, intensity_threshold, 255, cv2.THRESH_BINARY, dst=dst)
     return binary
 
 
+@functools.cache
+def square_kernel(kernel_size: int) -> np.ndarray:
+    """All-ones structuring element, built once per size instead of on every frame."""
+    kernel = np.ones((kernel_size, kernel_size), np.uint8)
+    kernel.flags.writeable = False
+    return kernel
+
+
 class MorphologicalHandler(BaseModeHandler):
     def setup_window(
         self,
@@ -32,11 +42,11 @@ class MorphologicalHandler(BaseModeHandler):
             main_window_height,
             have_control_window,
         )
-        self.threshold_tracker = IntensityThresholdTracker(control_window_name)
+        self.threshold_tracker = IntensityThresholdTracker(control_window_name, self.params)
 
-    def process_frame(self, frame: MatLike) -> MatLike:
+    def process_frame(self, frame: MatLike, ctx: FrameContext | None = None) -> MatLike:
         intensity_threshold = self.threshold_tracker.get_threshold()
-        binary = binarize(frame, intensity_threshold)
+        binary = binarize(frame, intensity_threshold, ctx, dst=self.buffers.get("out", frame.shape[:2]))
         return binary
 
 
@@ -56,15 +66,15 @@ class ErosionHandler(BaseModeHandler):
             main_window_height,
             have_control_window,
         )
-        self.kernel_tracker = KernelSize3579Tracker(control_window_name)
-        self.threshold_tracker = IntensityThresholdTracker(control_window_name)
+        self.kernel_tracker = KernelSize3579Tracker(control_window_name, self.params)
+        self.threshold_tracker = IntensityThresholdTracker(control_window_name, self.params)
 
-    def process_frame(self, frame: MatLike) -> MatLike:
+    def process_frame(self, frame: MatLike, ctx: FrameContext | None = None) -> MatLike:
         intensity_threshold = self.threshold_tracker.get_threshold()
-        binary = binarize(frame, intensity_threshold)
+        binary = binarize(frame, intensity_threshold, ctx, dst=self.buffers.get("binary", frame.shape[:2]))
         kernel_size = self.kernel_tracker.get_kernel_size()
-        kernel = np.ones((kernel_size, kernel_size), np.uint8)
-        eroded = cv2.erode(binary, kernel, iterations=1)
+        kernel = square_kernel(kernel_size)
+        eroded = cv2.erode(binary, kernel, iterations=1, dst=self.buffers.like("out", binary))
         return eroded
 
 
@@ -84,15 +94,15 @@ class DilationHandler(BaseModeHandler):
             main_window_height,
             have_control_window,
         )
-        self.kernel_tracker = KernelSize3579Tracker(control_window_name)
-        self.threshold_tracker = IntensityThresholdTracker(control_window_name)
+        self.kernel_tracker = KernelSize3579Tracker(control_window_name, self.params)
+        self.threshold_tracker = IntensityThresholdTracker(control_window_name, self.params)
 
-    def process_frame(self, frame: MatLike) -> MatLike:
+    def process_frame(self, frame: MatLike, ctx: FrameContext | None = None) -> MatLike:
         intensity_threshold = self.threshold_tracker.get_threshold()
-        binary = binarize(frame, intensity_threshold)
+        binary = binarize(frame, intensity_threshold, ctx, dst=self.buffers.get("binary", frame.shape[:2]))
         kernel_size = self.kernel_tracker.get_kernel_size()
-        kernel = np.ones((kernel_size, kernel_size), np.uint8)
-        dilated = cv2.dilate(binary, kernel, iterations=1)
+        kernel = square_kernel(kernel_size)
+        dilated = cv2.dilate(binary, kernel, iterations=1, dst=self.buffers.like("out", binary))
         return dilated
 
 
@@ -112,15 +122,15 @@ class OpeningHandler(BaseModeHandler):
             main_window_height,
             have_control_window,
         )
-        self.kernel_tracker = KernelSize3579Tracker(control_window_name)
-        self.threshold_tracker = IntensityThresholdTracker(control_window_name)
+        self.kernel_tracker = KernelSize3579Tracker(control_window_name, self.params)
+        self.threshold_tracker = IntensityThresholdTracker(control_window_name, self.params)
 
-    def process_frame(self, frame: MatLike) -> MatLike:
+    def process_frame(self, frame: MatLike, ctx: FrameContext | None = None) -> MatLike:
         intensity_threshold = self.threshold_tracker.get_threshold()
-        binary = binarize(frame, intensity_threshold)
+        binary = binarize(frame, intensity_threshold, ctx, dst=self.buffers.get("binary", frame.shape[:2]))
         kernel_size = self.kernel_tracker.get_kernel_size()
-        kernel = np.ones((kernel_size, kernel_size), np.uint8)
-        opened = cv2.morphologyEx(binary, cv2.MORPH_OPEN, kernel)
+        kernel = square_kernel(kernel_size)
+        opened = cv2.morphologyEx(binary, cv2.MORPH_OPEN, kernel, dst=self.buffers.like("out", binary))
         return opened
 
 
@@ -140,15 +150,15 @@ class ClosingHandler(BaseModeHandler):
             main_window_height,
             have_control_window,
         )
-        self.kernel_tracker = KernelSize3579Tracker(control_window_name)
-        self.threshold_tracker = IntensityThresholdTracker(control_window_name)
+        self.kernel_tracker = KernelSize3579Tracker(control_window_name, self.params)
+        self.threshold_tracker = IntensityThresholdTracker(control_window_name, self.params)
 
-    def process_frame(self, frame: MatLike) -> MatLike:
+    def process_frame(self, frame: MatLike, ctx: FrameContext | None = None) -> MatLike:
         intensity_threshold = self.threshold_tracker.get_threshold()
-        binary = binarize(frame, intensity_threshold)
+        binary = binarize(frame, intensity_threshold, ctx, dst=self.buffers.get("binary", frame.shape[:2]))
         kernel_size = self.kernel_tracker.get_kernel_size()
-        kernel = np.ones((kernel_size, kernel_size), np.uint8)
-        closed = cv2.morphologyEx(binary, cv2.MORPH_CLOSE, kernel)
+        kernel = square_kernel(kernel_size)
+        closed = cv2.morphologyEx(binary, cv2.MORPH_CLOSE, kernel, dst=self.buffers.like("out", binary))
         return closed
 
 
@@ -168,15 +178,15 @@ class MorphologicalGradientHandler(BaseModeHandler):
             main_window_height,
             have_control_window,
         )
-        self.kernel_tracker = KernelSize3579Tracker(control_window_name)
-        self.threshold_tracker = IntensityThresholdTracker(control_window_name)
+        self.kernel_tracker = KernelSize3579Tracker(control_window_name, self.params)
+        self.threshold_tracker = IntensityThresholdTracker(control_window_name, self.params)
 
-    def process_frame(self, frame: MatLike) -> MatLike:
+    def process_frame(self, frame: MatLike, ctx: FrameContext | None = None) -> MatLike:
         intensity_threshold = self.threshold_tracker.get_threshold()
-        binary = binarize(frame, intensity_threshold)
+        binary = binarize(frame, intensity_threshold, ctx, dst=self.buffers.get("binary", frame.shape[:2]))
         kernel_size = self.kernel_tracker.get_kernel_size()
-        kernel = np.ones((kernel_size, kernel_size), np.uint8)
-        gradient = cv2.morphologyEx(binary, cv2.MORPH_GRADIENT, kernel)
+        kernel = square_kernel(kernel_size)
+        gradient = cv2.morphologyEx(binary, cv2.MORPH_GRADIENT, kernel, dst=self.buffers.like("out", binary))
         return gradient
 
 
@@ -196,15 +206,15 @@ class TopHatHandler(BaseModeHandler):
             main_window_height,
             have_control_window,
         )
-        self.kernel_tracker = KernelSize3579Tracker(control_window_name)
-        self.threshold_tracker = IntensityThresholdTracker(control_window_name)
+        self.kernel_tracker = KernelSize3579Tracker(control_window_name, self.params)
+        self.threshold_tracker = IntensityThresholdTracker(control_window_name, self.params)
 
-    def process_frame(self, frame: MatLike) -> MatLike:
+    def process_frame(self, frame: MatLike, ctx: FrameContext | None = None) -> MatLike:
         intensity_threshold = self.threshold_tracker.get_threshold()
-        binary = binarize(frame, intensity_threshold)
+        binary = binarize(frame, intensity_threshold, ctx, dst=self.buffers.get("binary", frame.shape[:2]))
         kernel_size = self.kernel_tracker.get_kernel_size()
-        kernel = np.ones((kernel_size, kernel_size), np.uint8)
-        tophat = cv2.morphologyEx(binary, cv2.MORPH_TOPHAT, kernel)
+        kernel = square_kernel(kernel_size)
+        tophat = cv2.morphologyEx(binary, cv2.MORPH_TOPHAT, kernel, dst=self.buffers.like("out", binary))
         return tophat
 
 
@@ -224,13 +234,13 @@ class BlackHatHandler(BaseModeHandler):
             main_window_height,
             have_control_window,
         )
-        self.kernel_tracker = KernelSize3579Tracker(control_window_name)
-        self.threshold_tracker = IntensityThresholdTracker(control_window_name)
+        self.kernel_tracker = KernelSize3579Tracker(control_window_name, self.params)
+        self.threshold_tracker = IntensityThresholdTracker(control_window_name, self.params)
 
-    def process_frame(self, frame: MatLike) -> MatLike:
+    def process_frame(self, frame: MatLike, ctx: FrameContext | None = None) -> MatLike:
         intensity_threshold = self.threshold_tracker.get_threshold()
-        binary = binarize(frame, intensity_threshold)
+        binary = binarize(frame, intensity_threshold, ctx, dst=self.buffers.get("binary", frame.shape[:2]))
         kernel_size = self.kernel_tracker.get_kernel_size()
-        kernel = np.ones((kernel_size, kernel_size), np.uint8)
-        blackhat = cv2.morphologyEx(binary, cv2.MORPH_BLACKHAT, kernel)
+        kernel = square_kernel(kernel_size)
+        blackhat = cv2.morphologyEx(binary, cv2.MORPH_BLACKHAT, kernel, dst=self.buffers.like("out", binary))
         return blackhat
@@ -0,0 +1,92 @@
+from typing import Callable, Hashable
+
+
+class Param:
+    """
+    One integer parameter (a slider position) limited to [minimum, maximum].
+    Every change bumps `version` and calls the subscribed callbacks with the new value.
+    """
+
+    def __init__(self, name: str, value: int, maximum: int, minimum: int = 0):
+        self.name = name
+        self.minimum = minimum
+        self.maximum = maximum
+        self.value = self.clamp(value)
+        self.version = 0
+        self._callbacks: list[Callable[[int], None]] = []
+
+    def clamp(self, value: int) -> int:
+        return max(self.minimum, min(self.maximum, int(value)))
+
+    def set(self, value: int) -> bool:
+        """Set the value (clamped to the range). Returns False if nothing changed."""
+        value = self.clamp(value)
+        if value == self.value:
+            return False
+        self.value = value
+        self.version += 1
+        for callback in list(self._callbacks):
+            callback(value)
+        return True
+
+    def subscribe(self, callback: Callable[[int], None]):
+        self._callbacks.append(callback)
+
+
+class ParamStore:
+    """
+    All parameters of one handler, by name. Trackers subscribe to the parameters they expose and
+    trackbars are only a view: moving a slider, set_param() or a preset all go through set().
+    Handlers can keep derived state (matrices, kernels, ...) in derived(), which recomputes it only
+    when the versions of the parameters it depends on change.
+    """
+
+    def __init__(self):
+        self._params: dict[str, Param] = {}
+        self._derived: dict[Hashable, tuple[tuple[int, ...], object]] = {}
+
+    def add(self, name: str, value: int, maximum: int, minimum: int = 0) -> Param:
+        if name in self._params:
+            raise ValueError(f"Parameter '{name}' already exists")
+        param = self._params[name] = Param(name, value, maximum, minimum)
+        return param
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._params
+
+    def __getitem__(self, name: str) -> Param:
+        return self._params[name]
+
+    def names(self) -> list[str]:
+        return list(self._params)
+
+    def get(self, name: str) -> int:
+        return self._params[name].value
+
+    def set(self, name: str, value: int) -> bool:
+        return self._params[name].set(value)
+
+    def values(self) -> dict[str, int]:
+        return {name: param.value for name, param in self._params.items()}
+
+    @property
+    def version(self) -> int:
+        """Changes whenever any parameter changes (versions only ever grow)."""
+        return sum(param.version for param in self._params.values())
+
+    def versions(self, *names: str) -> tuple[int, ...]:
+        params = [self._params[name] for name in names] if names else self._params.values()
+        return tuple(param.version for param in params)
+
+    def subscribe(self, callback: Callable[[str, int], None], *names: str):
+        """Call callback(name, value) when one of names (default: any parameter) changes."""
+        for name in names or self.names():
+            self._params[name].subscribe(lambda value, name=name: callback(name, value))
+
+    def derived(self, key: Hashable, compute: Callable[[], object], *names: str):
+        """compute()'s result, cached until one of names (default: any parameter) changes."""
+        versions = self.versions(*names)
+        entry = self._derived.get(key)
+        if entry is None or entry[0] != versions:
+            entry = self._derived[key] = (versions, compute())
+        return entry[1]
@@ -0,0 +1,129 @@
+import cv2
+import numpy as np
+from cv2.typing import MatLike
+
+from .base import BaseModeHandler
+from .buffers import BufferPool
+from .frame_context import FrameContext
+from .params import ParamStore
+from .point_ops import apply_table, compose
+from .trackers import Tracker
+from .transformation import PointOpHandler
+
+
+class PipelineHandler(BaseModeHandler):
+    """
+    Chains existing handlers: each stage processes the output of the previous one.
+    Intermediate outputs are brought back to the layout of the input frame (uint8, same channels)
+    in the pipeline's buffer pool, so after the first frame the chain itself allocates nothing.
+    Consecutive point operations (log, gamma, negative, ...) are fused into one lookup table.
+    """
+
+    def __init__(self, stage_classes: list[type[BaseModeHandler]]):
+        self.stages = [stage_class() for stage_class in stage_classes]
+        for previous, stage in zip(self.stages, self.stages[1:]):
+            # e.g. Canny > Hough Lines: Hough takes the Canny output instead of running Canny again
+            stage.edges_from_upstream = previous.produces_edge_map and stage.accepts_edge_map
+        self.main_thread_only = any(stage.main_thread_only for stage in self.stages)
+        self.allow_static_reuse = all(stage.allow_static_reuse for stage in self.stages)
+        # Derived products (gray, HSV, ...) of each intermediate image, reused frame to frame
+        self.context_buffers = [BufferPool() for _ in self.stages]
+        # Runs of stage indices processed together: a point operation joins the previous one if it
+        # works on the same channels (only the first stage of a run may binarize the gray image)
+        self.groups: list[list[int]] = []
+        for i, stage in enumerate(self.stages):
+            previous = self.stages[i - 1] if i > 0 else None
+            if isinstance(stage, PointOpHandler) and isinstance(previous, PointOpHandler) and not stage.gray_input:
+                self.groups[-1].append(i)
+            else:
+                self.groups.append([i])
+        self._fused_tables: dict[int, tuple[list[np.ndarray], np.ndarray]] = {}
+
+    def setup_window(
+        self,
+        main_window_name: str | None,
+        control_window_name: str | None,
+        main_window_width: int,
+        main_window_height: int,
+        have_control_window: bool = False,
+    ):
+        super().setup_window(main_window_name, control_window_name, main_window_width, main_window_height)
+        for i, stage in enumerate(self.stages):
+            # One control window per stage, so stages with the same trackbar names do not collide
+            stage_control = None if self.headless else f"{control_window_name} {i + 1}: {type(stage).__name__}"
+            stage.setup_window(main_window_name, stage_control, main_window_width, main_window_height)
+            for name in stage.window_names:
+                if name not in self.window_names:
+                    self.window_names.append(name)
+
+    def trackers(self) -> list[Tracker]:
+        return [tracker for stage in self.stages for tracker in stage.trackers()]
+
+    def param_items(self) -> dict[str, tuple[Tracker, str]]:
+        # Stages may use the same trackbar names (e.g. two Canny thresholds), so names carry the stage number
+        return {
+            f"{i + 1}:{name}": item for i, stage in enumerate(self.stages) for name, item in stage.param_items().items()
+        }
+
+    def param_stores(self) -> list[ParamStore]:
+        return super().param_stores() + [store for stage in self.stages for store in stage.param_stores()]
+
+    def buffer_pools(self) -> list[BufferPool]:
+        stage_pools = [pool for stage in self.stages for pool in stage.buffer_pools()]
+        return super().buffer_pools() + self.context_buffers + stage_pools
+
+    def close_windows(self):
+        for stage in self.stages:
+            stage.close_windows()
+        super().close_windows()
+
+    def process_frame(self, frame: MatLike, ctx: FrameContext | None = None) -> MatLike:
+        output = frame
+        for group in self.groups:
+            i = group[0]
+            if i > 0:
+                edge_map = output
+                output = self._to_input_layout(i, output, frame)
+                # Derived products of an intermediate image are only valid for that image
+                ctx = FrameContext(output, self.context_buffers[i])
+                if self.stages[i].edges_from_upstream and edge_map.ndim == 2:
+                    # The edge map is the gray image of its BGR copy; skip converting it back
+                    ctx.put("gray", edge_map)
+            if len(group) == 1:
+                output = self.stages[i].process_frame(output, ctx)
+            else:
+                output = self._process_fused(group, output, ctx)
+        return output
+
+    def _process_fused(self, group: list[int], image: MatLike, ctx: FrameContext | None) -> MatLike:
+        """Apply a run of point operations as one table, recomposed only when one of their tables changed."""
+        first = self.stages[group[0]]
+        tables = [self.stages[i].table() for i in group]
+        entry = self._fused_tables.get(group[0])
+        if entry is None or any(old is not new for old, new in zip(entry[0], tables)):
+            entry = self._fused_tables[group[0]] = (tables, compose(*tables))
+        if first.gray_input:
+            image = FrameContext.ensure(image, ctx).gray
+        return apply_table(image, entry[1], dst=self.buffers.like((group[0], "fused"), image))
+
+    def _to_input_layout(self, index: int, output: MatLike, like: MatLike) -> MatLike:
+        """Convert a stage output to the dtype and channel count of like, writing into reused buffers."""
+        if output.dtype != np.uint8:
+            converted = self.buffers.get((index, "uint8"), output.shape, np.uint8)
+            if output.dtype in (np.float32, np.float64):
+                # Same mapping as cv2.imshow (float [0, 1] -> [0, 255]), so the next stage sees what was displayed
+                clipped = self.buffers.get((index, "float"), output.shape, output.dtype)
+                np.clip(output, 0, 1, out=clipped)
+                cv2.convertScaleAbs(clipped, dst=converted, alpha=255)
+            else:
+                cv2.convertScaleAbs(output, dst=converted)
+            output = converted
+        if output.ndim == 2 and like.ndim == 3:
+            color = self.buffers.get((index, "bgr"), output.shape + (3,), np.uint8)
+            cv2.cvtColor(output, cv2.COLOR_GRAY2BGR, dst=color)
+            output = color
+        elif output.ndim == 3 and like.ndim == 2:
+            gray = self.buffers.get((index, "gray"), output.shape[:2], np.uint8)
+            cv2.cvtColor(output, cv2.COLOR_BGR2GRAY, dst=gray)
+            output = gray
+        return output
@@ -0,0 +1,66 @@
+"""
+Intensity transforms of 8-bit images as 256-entry lookup tables.
+Each output pixel only depends on its input value, so a transform (or a chain of them, see compose)
+is computed once for the 256 possible values and applied to a frame with a single cv2.LUT pass.
+The tables use the same float32 arithmetic and truncation the per-pixel versions used.
+"""
+
+import cv2
+import numpy as np
+from cv2.typing import MatLike
+
+_VALUES = np.arange(256, dtype=np.float32)
+
+
+def _to_table(values: np.ndarray) -> np.ndarray:
+    table = np.empty(256, np.uint8)
+    np.copyto(table, values, casting="unsafe")  # Truncates like astype(np.uint8)
+    return table
+
+
+def identity_table() -> np.ndarray:
+    return np.arange(256, dtype=np.uint8)
+
+
+def log_table() -> np.ndarray:
+    """s = 255 / log(256) * log(1 + r)"""
+    return _to_table(np.log(_VALUES + 1) * np.float32(255 / np.log(256)))
+
+
+def exp_table(alpha: float) -> np.ndarray:
+    """s = 255 * (exp(alpha * r) - 1) / (exp(alpha * 255) - 1)"""
+    return _to_table((np.exp(_VALUES * np.float32(alpha)) - 1) * np.float32(255 / (np.exp(alpha * 255) - 1)))
+
+
+def power_table(gamma: float) -> np.ndarray:
+    """s = 255 * (r / 255) ^ gamma"""
+    return _to_table(np.power(_VALUES * np.float32(1 / 255), np.float32(gamma)) * 255)
+
+
+def negative_table() -> np.ndarray:
+    return 255 - identity_table()
+
+
+def threshold_table(threshold: int) -> np.ndarray:
+    """Binary threshold, like cv2.THRESH_BINARY: 255 above threshold, 0 otherwise."""
+    return np.where(identity_table() > threshold, 255, 0).astype(np.uint8)
+
+
+def contrast_table(alpha: float, beta: float) -> np.ndarray:
+    """s = |alpha * r + beta|, rounded and saturated like cv2.convertScaleAbs."""
+    table = np.empty(256, np.uint8)
+    cv2.convertScaleAbs(identity_table(), dst=table, alpha=alpha, beta=beta)
+    return table
+
+
+def compose(*tables: np.ndarray) -> np.ndarray:
+    """One table applying the given tables in order."""
+    result = identity_table()
+    for table in tables:
+        result = table[result]
+    return result
+
+
+def apply_table(frame: MatLike, table: np.ndarray, dst: np.ndarray | None = None) -> MatLike:
+    """Apply a table to every channel of an 8-bit frame."""
+    return cv2.LUT(frame, table, dst=dst)
@@ -3,9 +3,14 @@ import numpy as np
 from cv2.typing import MatLike
 
 from .base import BaseModeHandler
+from .frame_context import FrameContext
+from .windows import window_manager
 
 
 class PanoramaHandler(BaseModeHandler):
+    allow_proxy_resolution = False
+    allow_static_reuse = False
+
     def __init__(self):
         super().__init__()
         self.captured_images = []
@@ -18,19 +23,22 @@ class PanoramaHandler(BaseModeHandler):
         **kwargs,
     ):
         super().setup_window(have_control_window=False, *args, **kwargs)
-        cv2.namedWindow("Panorama Captures", cv2.WINDOW_AUTOSIZE)
+        if self.headless:
+            return
+        self.open_window("Panorama Captures", cv2.WINDOW_AUTOSIZE)
         # main_window_width = kwargs.get("main_window_width", 640)
         # main_window_height = kwargs.get("main_window_height", 480)
         # cv2.resizeWindow("Panorama Captures", main_window_width, main_window_height)
 
-    def process_frame(self, frame: MatLike) -> MatLike:
+    def process_frame(self, frame: MatLike, ctx: FrameContext | None = None) -> MatLike:
+        if self.headless:
+            return frame
         # Show stitched panorama if available
         if self.panorama is not None:
-            cv2.imshow("Panorama Captures", self.panorama)
+            window_manager.show_image("Panorama Captures", self.panorama)
         elif self.stitch_error:
-            shape = frame.shape
-            dtype = frame.dtype
-            error_img = np.zeros(shape, dtype)
+            error_img = self.buffers.like("captures", frame)
+            error_img.fill(0)
             cv2.putText(
                 error_img,
                 "Stitching failed",
@@ -49,10 +57,11 @@ class PanoramaHandler(BaseModeHandler):
                 (255, 255, 255),
                 2,
             )
-            cv2.imshow("Panorama Captures", error_img)
+            window_manager.show_image("Panorama Captures", error_img)
         else:
-            empty_img = np.zeros_like(frame)
-            cv2.imshow("Panorama Captures", empty_img)
+            empty_img = self.buffers.like("captures", frame)
+            empty_img.fill(0)
+            window_manager.show_image("Panorama Captures", empty_img)
         return frame
 
     def handle_key(self, key, frame: MatLike):
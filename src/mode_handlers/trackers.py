@@ -1,13 +1,50 @@
 import cv2
 
+from .params import ParamStore
 
-class BrightnessTracker:
-    def __init__(self, window_name: str):
+
+class Tracker:
+    """
+    Base for parameter trackers. The values live in a ParamStore (the handler's, or one of its own);
+    a tracker subscribes its on-change converters to them and shows them as trackbars.
+    Each trackbar may name the getter of the value the handler actually uses (clamped, mapped to a
+    float, forced odd, ...), see converted_value.
+    With window_name=None no trackbars are created (headless use).
+    """
+
+    def __init__(self, window_name: str | None, params: ParamStore | None = None):
         self.window_name = window_name
+        self.params = params if params is not None else ParamStore()
+        self.trackbars = {}  # trackbar name -> setter, same effect as moving the slider
+        self.converters = {}  # trackbar name -> getter of the converted value, for trackbars not used as is
+
+    def create_trackbar(self, name: str, value: int, count: int, on_change, converted=None):
+        param = self.params.add(name, value, count)
+        if converted is not None:
+            self.converters[name] = converted
+        param.subscribe(on_change)
+        self.trackbars[name] = param.set
+        if self.window_name is not None:
+            cv2.createTrackbar(name, self.window_name, value, count, param.set)
+            # Keep the slider in sync when the value is set from code (set_param, presets)
+            param.subscribe(lambda value: self._sync_trackbar(name, value))
+
+    def converted_value(self, name: str):
+        """The value the handler uses for a trackbar's current position (the position itself if used as is)."""
+        converter = self.converters.get(name)
+        return converter() if converter is not None else self.params.get(name)
+
+    def _sync_trackbar(self, name: str, value: int):
+        if cv2.getTrackbarPos(name, self.window_name) != value:
+            cv2.setTrackbarPos(name, self.window_name, value)
+
+
+class BrightnessTracker(Tracker):
+    def __init__(self, window_name: str | None, params: ParamStore | None = None):
+        super().__init__(window_name, params)
         self.brightness = 50
-        cv2.createTrackbar(
+        self.create_trackbar(
             "Brightness",
-            self.window_name,
             self.brightness,
             100,
             self.on_brightness_change,
@@ -20,13 +57,12 @@ class BrightnessTracker:
         return self.brightness
 
 
-class ContrastTracker:
-    def __init__(self, window_name: str):
-        self.window_name = window_name
+class ContrastTracker(Tracker):
+    def __init__(self, window_name: str | None, params: ParamStore | None = None):
+        super().__init__(window_name, params)
         self.contrast = 50
-        cv2.createTrackbar(
+        self.create_trackbar(
             "Contrast",
-            self.window_name,
             self.contrast,
             100,
             self.on_contrast_change,
@@ -39,16 +75,16 @@ class ContrastTracker:
         return self.contrast
 
 
-class KernelSizeTracker:
-    def __init__(self, window_name: str):
-        self.window_name = window_name
+class KernelSizeTracker(Tracker):
+    def __init__(self, window_name: str | None, params: ParamStore | None = None):
+        super().__init__(window_name, params)
         self.kernel_size = 1
-        cv2.createTrackbar(
+        self.create_trackbar(
             "Kernel Size",
-            self.window_name,
             self.kernel_size,
             20,
             self.on_kernel_size_change,
+            self.get_effective_kernel_size,
         )
 
     def on_kernel_size_change(self, value: int):
@@ -68,16 +104,16 @@ class KernelSizeTracker:
             return self.kernel_size + 1
 
 
-class SigmaTracker:
-    def __init__(self, window_name: str):
-        self.window_name = window_name
+class SigmaTracker(Tracker):
+    def __init__(self, window_name: str | None, params: ParamStore | None = None):
+        super().__init__(window_name, params)
         self.sigma = 1
-        cv2.createTrackbar(
+        self.create_trackbar(
             "Sigma",
-            self.window_name,
             self.sigma,
             20,
             self.on_sigma_change,
+            self.get_sigma,
         )
 
     def on_sigma_change(self, value: int):
@@ -87,24 +123,24 @@ class SigmaTracker:
         return self.sigma
 
 
-class BilateralSigmaTracker:
-    def __init__(self, window_name: str):
-        self.window_name = window_name
+class BilateralSigmaTracker(Tracker):
+    def __init__(self, window_name: str | None, params: ParamStore | None = None):
+        super().__init__(window_name, params)
         self.sigma_color = 75
         self.sigma_space = 75
-        cv2.createTrackbar(
+        self.create_trackbar(
             "Bilateral Sigma Color",
-            self.window_name,
             self.sigma_color,
             200,
             self.on_sigma_color_change,
+            self.get_sigma_color,
         )
-        cv2.createTrackbar(
+        self.create_trackbar(
             "Bilateral Sigma Space",
-            self.window_name,
             self.sigma_space,
             200,
             self.on_sigma_space_change,
+            self.get_sigma_space,
         )
 
     def on_sigma_color_change(self, value: int):
@@ -120,24 +156,24 @@ class BilateralSigmaTracker:
         return self.sigma_space
 
 
-class CannyThresholdTracker:
-    def __init__(self, window_name: str):
-        self.window_name = window_name
+class CannyThresholdTracker(Tracker):
+    def __init__(self, window_name: str | None, params: ParamStore | None = None):
+        super().__init__(window_name, params)
         self.threshold1 = 100
         self.threshold2 = 200
-        cv2.createTrackbar(
+        self.create_trackbar(
             "Canny Threshold1",
-            self.window_name,
             self.threshold1,
             255,
             self.on_threshold1_change,
+            lambda: self.threshold1,
         )
-        cv2.createTrackbar(
+        self.create_trackbar(
             "Canny Threshold2",
-            self.window_name,
             self.threshold2,
             255,
             self.on_threshold2_change,
+            lambda: self.threshold2,
         )
 
     def on_threshold1_change(self, value: int):
@@ -150,16 +186,16 @@ class CannyThresholdTracker:
         return self.threshold1, self.threshold2
 
 
-class KernelSize3579Tracker:
-    def __init__(self, window_name: str):
-        self.window_name = window_name
+class KernelSize3579Tracker(Tracker):
+    def __init__(self, window_name: str | None, params: ParamStore | None = None):
+        super().__init__(window_name, params)
         self.kernel_size = 3
-        cv2.createTrackbar(
+        self.create_trackbar(
             "Kernel Size (3,5,7,9)",
-            self.window_name,
             0,
             3,
             self.on_kernel_size_change,
+            self.get_kernel_size,
         )
 
     def on_kernel_size_change(self, value: int):
@@ -176,16 +212,16 @@ class KernelSize3579Tracker:
         return self.kernel_size
 
 
-class IntensityThresholdTracker:
-    def __init__(self, window_name: str):
-        self.window_name = window_name
+class IntensityThresholdTracker(Tracker):
+    def __init__(self, window_name: str | None, params: ParamStore | None = None):
+        super().__init__(window_name, params)
         self.threshold = 128
-        cv2.createTrackbar(
+        self.create_trackbar(
             "Intensity Threshold",
-            self.window_name,
             self.threshold,
             255,
             self.on_threshold_change,
+            self.get_threshold,
         )
 
     def on_threshold_change(self, value: int):
@@ -195,40 +231,149 @@ class IntensityThresholdTracker:
         return self.threshold
 
 
-class HarrisParamsTracker:
-    def __init__(self, window_name: str):
-        self.window_name = window_name
+class ExponentialTracker(Tracker):
+    def __init__(self, window_name: str | None, params: ParamStore | None = None):
+        super().__init__(window_name, params)
+        self.alpha = 10
+        self.create_trackbar(
+            "Alpha (0.001 to 0.05)",
+            self.alpha,
+            50,
+            self.on_alpha_change,
+            self.get_alpha,
+        )
+
+    def on_alpha_change(self, value: int):
+        self.alpha = max(1, min(50, value))
+
+    def get_alpha(self) -> float:
+        return self.alpha / 1000.0
+
+
+class GammaTracker(Tracker):
+    def __init__(self, window_name: str | None, params: ParamStore | None = None):
+        super().__init__(window_name, params)
+        self.gamma = 50
+        self.create_trackbar(
+            "Gamma (0.01 to 5.0)",
+            self.gamma,
+            500,
+            self.on_gamma_change,
+            self.get_gamma,
+        )
+
+    def on_gamma_change(self, value: int):
+        self.gamma = max(1, min(500, value))
+
+    def get_gamma(self) -> float:
+        return self.gamma / 100.0
+
+
+class BinaryThresholdTracker(Tracker):
+    def __init__(self, window_name: str | None, params: ParamStore | None = None):
+        super().__init__(window_name, params)
+        self.threshold = 100
+        self.create_trackbar(
+            "Threshold (0-255)",
+            self.threshold,
+            255,
+            self.on_threshold_change,
+            self.get_threshold,
+        )
+
+    def on_threshold_change(self, value: int):
+        self.threshold = max(0, min(255, value))
+
+    def get_threshold(self) -> int:
+        return self.threshold
+
+
+class CLAHEParamsTracker(Tracker):
+    def __init__(self, window_name: str | None, params: ParamStore | None = None):
+        super().__init__(window_name, params)
+        self.clip_limit = 20
+        self.tile_grid = 8
+        self.create_trackbar(
+            "Clip Limit (0.1 to 40)",
+            self.clip_limit,
+            400,
+            self.on_clip_limit_change,
+            self.get_clip_limit,
+        )
+        self.create_trackbar(
+            "Tile Grid (1-32)",
+            self.tile_grid,
+            32,
+            self.on_tile_grid_change,
+            self.get_tile_grid,
+        )
+
+    def on_clip_limit_change(self, value: int):
+        self.clip_limit = max(1, min(400, value))
+
+    def on_tile_grid_change(self, value: int):
+        self.tile_grid = max(1, min(32, value))
+
+    def get_clip_limit(self) -> float:
+        return self.clip_limit / 10.0
+
+    def get_tile_grid(self) -> int:
+        return self.tile_grid
+
+
+class LutReuseTracker(Tracker):
+    def __init__(self, window_name: str | None, params: ParamStore | None = None):
+        super().__init__(window_name, params)
+        self.tolerance = 2
+        self.create_trackbar(
+            "LUT Reuse (0-20% change)",
+            self.tolerance,
+            20,
+            self.on_tolerance_change,
+            self.get_tolerance,
+        )
+
+    def on_tolerance_change(self, value: int):
+        self.tolerance = max(0, min(20, value))
+
+    def get_tolerance(self) -> float:
+        return self.tolerance / 100.0
+
+
+class HarrisParamsTracker(Tracker):
+    def __init__(self, window_name: str | None, params: ParamStore | None = None):
+        super().__init__(window_name, params)
         self.block_size = 5
         self.sobel_ksize = 5
         self.dilate_ksize = 5
         self.threshold = 10
-        cv2.createTrackbar(
+        self.create_trackbar(
             "Harris Block Size (3,5,7,9)",
-            self.window_name,
-            0,
+            1,  # 5, the initial size
             3,
             self.on_block_size_change,
+            self.get_block_size,
         )
-        cv2.createTrackbar(
+        self.create_trackbar(
             "Sobel Kernel Size (3,5,7,9)",
-            self.window_name,
-            0,
+            1,  # 5, the initial size
             3,
             self.on_sobel_ksize_change,
+            self.get_sobel_ksize,
         )
-        cv2.createTrackbar(
+        self.create_trackbar(
             "Dilate Kernel Size (3,5,7,9)",
-            self.window_name,
-            0,
+            1,  # 5, the initial size
             3,
             self.on_dilate_ksize_change,
+            self.get_dilate_ksize,
         )
-        cv2.createTrackbar(
+        self.create_trackbar(
             "Threshold (0.01 to 0.2)",
-            self.window_name,
             self.threshold,
             20,
             self.on_threshold_change,
+            self.get_threshold,
         )
 
     def on_block_size_change(self, value: int):
@@ -277,16 +422,16 @@ class HarrisParamsTracker:
         return self.threshold / 100.0
 
 
-class HoughLinesParamsTracker:
-    def __init__(self, window_name: str):
-        self.window_name = window_name
+class HoughLinesParamsTracker(Tracker):
+    def __init__(self, window_name: str | None, params: ParamStore | None = None):
+        super().__init__(window_name, params)
         self.hough_threshold = 100
-        cv2.createTrackbar(
+        self.create_trackbar(
             "Threshold (1-500)",
-            self.window_name,
             self.hough_threshold,
             500,
             self.on_threshold_change,
+            self.get_threshold,
         )
 
     def on_threshold_change(self, value: int):
@@ -296,56 +441,56 @@ class HoughLinesParamsTracker:
         return self.hough_threshold
 
 
-class HoughCirclesParamsTracker:
-    def __init__(self, window_name: str):
-        self.window_name = window_name
+class HoughCirclesParamsTracker(Tracker):
+    def __init__(self, window_name: str | None, params: ParamStore | None = None):
+        super().__init__(window_name, params)
         self.dp = 2
         self.min_dist = 500
         self.param1 = 200  # Canny high threshold
         self.param2 = 50  # Accumulator threshold
         self.min_radius = 0
         self.max_radius = 0
-        cv2.createTrackbar(
+        self.create_trackbar(
             "dp (1-3)",
-            self.window_name,
             self.dp,
             3,
             self.on_dp_change,
+            lambda: self.dp,
         )
-        cv2.createTrackbar(
+        self.create_trackbar(
             "Min Dist (1-1000)",
-            self.window_name,
             self.min_dist,
             1000,
             self.on_min_dist_change,
+            lambda: self.min_dist,
         )
-        cv2.createTrackbar(
+        self.create_trackbar(
             "Param1 (1-255)",
-            self.window_name,
             self.param1,
             255,
             self.on_param1_change,
+            lambda: self.param1,
         )
-        cv2.createTrackbar(
+        self.create_trackbar(
             "Param2 (1-100)",
-            self.window_name,
             self.param2,
             100,
             self.on_param2_change,
+            lambda: self.param2,
         )
-        cv2.createTrackbar(
+        self.create_trackbar(
             "Min Radius (0-100)",
-            self.window_name,
             self.min_radius,
             100,
             self.on_min_radius_change,
+            lambda: self.min_radius,
         )
-        cv2.createTrackbar(
+        self.create_trackbar(
             "Max Radius (0-100)",
-            self.window_name,
             self.max_radius,
             100,
             self.on_max_radius_change,
+            lambda: self.max_radius,
         )
 
     def on_dp_change(self, value: int):
@@ -367,41 +512,40 @@ class HoughCirclesParamsTracker:
         self.max_radius = max(0, value)
 
 
-class TranslateTracker:
-    def __init__(self, window_name: str):
-        self.window_name = window_name
+class TranslateTracker(Tracker):
+    def __init__(self, window_name: str | None, params: ParamStore | None = None):
+        super().__init__(window_name, params)
         self.translate_x = 0
         self.translate_y = 0
         self.rotate_angle = 0
         self.scale_factor = 100  # 100 = 1.0x scale
 
-        cv2.createTrackbar(
+        self.create_trackbar(
             "Translate X (-200 to 200)",
-            self.window_name,
             200,  # Center position (0 offset)
             400,
             self.on_translate_x_change,
+            self.get_translate_x,
         )
-        cv2.createTrackbar(
+        self.create_trackbar(
             "Translate Y (-200 to 200)",
-            self.window_name,
             200,  # Center position (0 offset)
             400,
             self.on_translate_y_change,
+            self.get_translate_y,
         )
-        cv2.createTrackbar(
+        self.create_trackbar(
             "Rotate Angle (0-360)",
-            self.window_name,
             self.rotate_angle,
             360,
             self.on_rotate_change,
         )
-        cv2.createTrackbar(
+        self.create_trackbar(
             "Scale (50-200%)",
-            self.window_name,
             self.scale_factor,
             200,
             self.on_scale_change,
+            self.get_scale_factor,
         )
 
     def on_translate_x_change(self, value: int):
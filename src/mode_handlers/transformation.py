@@ -1,17 +1,40 @@
-import cv2
 import numpy as np
 from cv2.typing import MatLike
 
 from .base import BaseModeHandler
+from .frame_context import FrameContext
+from .point_ops import apply_table, exp_table, log_table, negative_table, power_table, threshold_table
+from .trackers import BinaryThresholdTracker, ExponentialTracker, GammaTracker
 
 
 class TransformationHandler(BaseModeHandler):
     # For default submode
-    def process_frame(self, frame: MatLike) -> MatLike:
+    def process_frame(self, frame: MatLike, ctx: FrameContext | None = None) -> MatLike:
         return frame
 
 
-class LogarithmicHandler(BaseModeHandler):
+class PointOpHandler(BaseModeHandler):
+    """
+    Intensity transforms: every output pixel only depends on the input pixel value, so the transform
+    is a 256-entry table (see point_ops), rebuilt only when a parameter changes and applied with one
+    cv2.LUT pass. Pipelines fuse consecutive point operations into a single table.
+    """
+
+    # Apply the table to the gray image instead of every channel (thresholding)
+    gray_input = False
+
+    def point_table(self) -> np.ndarray:
+        raise NotImplementedError
+
+    def table(self) -> np.ndarray:
+        return self.params.derived("point_table", self.point_table)
+
+    def process_frame(self, frame: MatLike, ctx: FrameContext | None = None) -> MatLike:
+        image = FrameContext.ensure(frame, ctx).gray if self.gray_input else frame
+        return apply_table(image, self.table(), dst=self.buffers.like("out", image))
+
+
+class LogarithmicHandler(PointOpHandler):
     def setup_window(
         self,
         main_window_name: str,
@@ -21,63 +44,79 @@ class LogarithmicHandler(BaseModeHandler):
     ):
         super().setup_window(main_window_name, control_window_name, main_window_width, main_window_height)
 
-    def process_frame(self, frame: MatLike) -> MatLike:
-        log_image = np.log(frame.astype(np.float32) + 1)
-        log_image = log_image / np.log(256) * 255
-        return log_image.astype(np.uint8)
+    def point_table(self) -> np.ndarray:
+        return log_table()
 
 
-class ExponentialHandler(BaseModeHandler):
+class ExponentialHandler(PointOpHandler):
     def setup_window(
         self,
         main_window_name: str,
         control_window_name: str,
         main_window_width: int,
         main_window_height: int,
+        have_control_window=True,
     ):
-        super().setup_window(main_window_name, control_window_name, main_window_width, main_window_height)
+        super().setup_window(
+            main_window_name,
+            control_window_name,
+            main_window_width,
+            main_window_height,
+            have_control_window,
+        )
+        self.exponential_tracker = ExponentialTracker(control_window_name, self.params)
 
-    def process_frame(self, frame: MatLike) -> MatLike:
-        alpha = 0.01
-        exp_image = np.exp(alpha * frame.astype(np.float32)) - 1
-        exp_image = exp_image / (np.exp(alpha * 255) - 1) * 255
-        return exp_image.astype(np.uint8)
+    def point_table(self) -> np.ndarray:
+        return exp_table(self.exponential_tracker.get_alpha())
 
 
-class PowerLawHandler(BaseModeHandler):
+class PowerLawHandler(PointOpHandler):
     def setup_window(
         self,
         main_window_name: str,
         control_window_name: str,
         main_window_width: int,
         main_window_height: int,
+        have_control_window=True,
     ):
-        super().setup_window(main_window_name, control_window_name, main_window_width, main_window_height)
+        super().setup_window(
+            main_window_name,
+            control_window_name,
+            main_window_width,
+            main_window_height,
+            have_control_window,
+        )
+        self.gamma_tracker = GammaTracker(control_window_name, self.params)
 
-    def process_frame(self, frame: MatLike) -> MatLike:
-        gamma = 0.5
-        power_image = np.power(frame.astype(np.float32) / 255, gamma) * 255
-        return power_image.astype(np.uint8)
+    def point_table(self) -> np.ndarray:
+        return power_table(self.gamma_tracker.get_gamma())
 
 
-class ThresholdingHandler(BaseModeHandler):
+class ThresholdingHandler(PointOpHandler):
+    gray_input = True
+
     def setup_window(
         self,
         main_window_name: str,
         control_window_name: str,
         main_window_width: int,
         main_window_height: int,
+        have_control_window=True,
     ):
-        super().setup_window(main_window_name, control_window_name, main_window_width, main_window_height)
+        super().setup_window(
+            main_window_name,
+            control_window_name,
+            main_window_width,
+            main_window_height,
+            have_control_window,
+        )
+        self.threshold_tracker = BinaryThresholdTracker(control_window_name, self.params)
 
-    def process_frame(self, frame: MatLike) -> MatLike:
-        threshold = 100
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-        _, thresh_image = cv2.threshold(gray, threshold, 255, cv2.THRESH_BINARY)
-        return thresh_image
+    def point_table(self) -> np.ndarray:
+        return threshold_table(self.threshold_tracker.get_threshold())
 
 
-class NegativeHandler(BaseModeHandler):
+class NegativeHandler(PointOpHandler):
     def setup_window(
         self,
         main_window_name: str,
@@ -87,5 +126,5 @@ class NegativeHandler(BaseModeHandler):
     ):
         super().setup_window(main_window_name, control_window_name, main_window_width, main_window_height)
 
-    def process_frame(self, frame: MatLike) -> MatLike:
-        return 255 - frame
+    def point_table(self) -> np.ndarray:
+        return negative_table()
@@ -1,7 +1,9 @@
 import cv2
+import numpy as np
 from cv2.typing import MatLike
 
 from .base import BaseModeHandler
+from .frame_context import FrameContext
 from .trackers import TranslateTracker
 
 
@@ -21,10 +23,19 @@ class TranslateHandler(BaseModeHandler):
             main_window_height,
             have_control_window,
         )
-        self.translate_tracker = TranslateTracker(control_window_name)
+        self.translate_tracker = TranslateTracker(control_window_name, self.params)
 
-    def process_frame(self, frame: MatLike) -> MatLike:
+    def process_frame(self, frame: MatLike, ctx: FrameContext | None = None) -> MatLike:
         height, width = frame.shape[:2]
+        # Only rebuilt when a slider moves (or the frame size changes)
+        rotation_matrix = self.params.derived(("matrix", width, height), lambda: self.build_matrix(width, height))
+
+        # Apply transformation
+        transformed_frame = cv2.warpAffine(frame, rotation_matrix, (width, height), dst=self.buffers.like("out", frame))
+
+        return transformed_frame
+
+    def build_matrix(self, width: int, height: int) -> np.ndarray:
         center = (width // 2, height // 2)
 
         # Get transformation parameters
@@ -39,8 +50,4 @@ class TranslateHandler(BaseModeHandler):
         # Add translation
         rotation_matrix[0, 2] += translate_x
         rotation_matrix[1, 2] += translate_y
-
-        # Apply transformation
-        transformed_frame = cv2.warpAffine(frame, rotation_matrix, (width, height))
-
-        return transformed_frame
+        return rotation_matrix
@@ -0,0 +1,87 @@
+from typing import Callable
+
+import cv2
+from cv2.typing import MatLike
+
+OFFSCREEN = (-10000, -10000)
+
+
+class WindowManager:
+    """
+    Creates HighGUI windows once and shows or hides them on mode switches instead of
+    destroying and recreating every window (and its trackbars) each time.
+    HighGUI has no portable hide call, so hidden windows are parked off screen.
+    Positions are read with getWindowImageRect, which gives the image origin, while moveWindow places the
+    window frame; the offset between the two (title bar, borders) is measured on the first restore.
+    """
+
+    def __init__(self):
+        # name -> {"visible": bool, "position": image (x, y) | None, "offset": image - window origin | None}
+        self.windows: dict[str, dict] = {}
+        # Takes (name, image) instead of cv2.imshow when set, so handlers off the UI thread can fill their windows
+        self.image_sink: Callable[[str, MatLike], None] | None = None
+
+    def open(self, name: str, flags: int = cv2.WINDOW_AUTOSIZE, size: tuple[int, int] | None = None) -> bool:
+        """Create the window if it does not exist yet. Returns True if it was created."""
+        if name in self.windows:
+            return False
+        cv2.namedWindow(name, flags)
+        if size is not None:
+            cv2.resizeWindow(name, *size)
+        self.windows[name] = {"visible": True, "position": None, "offset": None}
+        return True
+
+    def resize(self, name: str, size: tuple[int, int]):
+        if name in self.windows:
+            cv2.resizeWindow(name, *size)
+
+    def show(self, name: str):
+        state = self.windows.get(name)
+        if state is None or state["visible"]:
+            return
+        if state["position"] is not None:
+            x, y = state["position"]
+            dx, dy = state["offset"] or (0, 0)
+            cv2.moveWindow(name, x - dx, y - dy)
+            if state["offset"] is None:
+                image_x, image_y, _, _ = cv2.getWindowImageRect(name)
+                state["offset"] = (image_x - x, image_y - y)
+                if state["offset"] != (0, 0):
+                    cv2.moveWindow(name, x - state["offset"][0], y - state["offset"][1])
+        state["visible"] = True
+
+    def hide(self, name: str):
+        state = self.windows.get(name)
+        if state is None or not state["visible"]:
+            return
+        # Read every time: the user may have moved the window since it was last hidden
+        x, y, _, _ = cv2.getWindowImageRect(name)
+        state["position"] = (x, y)
+        cv2.moveWindow(name, *OFFSCREEN)
+        state["visible"] = False
+
+    def show_image(self, name: str, image: MatLike):
+        """imshow for a handler's own window (histogram, panorama captures), through image_sink if set."""
+        if self.image_sink is not None:
+            self.image_sink(name, image)
+        else:
+            cv2.imshow(name, image)
+
+    def show_only(self, names: list[str]):
+        """Show exactly these windows; every other managed window is hidden but kept alive."""
+        for name in self.windows:
+            if name not in names:
+                self.hide(name)
+        for name in names:
+            self.show(name)
+
+    def close(self, name: str):
+        if self.windows.pop(name, None) is not None:
+            cv2.destroyWindow(name)
+
+    def close_all(self):
+        self.windows.clear()
+        cv2.destroyAllWindows()
+
+
+window_manager = WindowManager()
@@ -0,0 +1,272 @@
+"""
+Run the same handler on several sources at once, one worker process per source.
+
+Examples (run from src/):
+    python multistream.py --source camera:0 --source camera:1 --mode 5 --submode q
+    python multistream.py --source video:a.mp4 --source video:b.mp4 --mode 4 --submode t --param "Kernel Size=9" --loop
+
+Each worker opens its own source, builds its own handler instance (no HighGUI) and writes the processed
+frames into a shared-memory frame ring, which this process reads without any pickling. The newest frame
+of every stream is tiled into one window, with per-stream FPS, processing time and capture-to-display
+latency. Streams never wait for each other: a worker with no free slot drops that frame, so throughput
+scales with the number of cores.
+"""
+
+import argparse
+import math
+import multiprocessing as mp
+import os
+import queue
+import time
+from collections import deque
+
+import cv2
+import numpy as np
+
+from mode_handlers.buffers import BufferPool
+from mode_handlers.frame_context import FrameContext
+from runtime.capture import CaptureThread
+from runtime.frames import to_bgr8
+from runtime.headless import build_handler, parse_params
+from runtime.metrics import RollingStat
+from runtime.presets import preset_params
+from runtime.shared_frames import SharedFrameRing
+from runtime.sources import open_source
+
+WINDOW_NAME = "multistream"
+
+
+def stream_worker(index: int, job: dict, lock, messages: mp.Queue, stop: mp.Event):
+    """Worker process: capture, process and hand back frames of one source until stopped or the source ends."""
+    cv2.setNumThreads(job["threads"])
+    capture = CaptureThread(
+        lambda: open_source(job["source"], width=job["width"], height=job["height"], fps=job["fps"], loop=job["loop"])
+    )
+    capture.start()
+    handler = None
+    ring = None
+    context_buffers = BufferPool()
+    seq = 0
+    try:
+        while not stop.is_set():
+            ret, frame = capture.read()
+            if not ret:
+                break
+            # perf_counter is per process; convert the capture time to wall-clock time for the compositor
+            captured_at = time.time() - (time.perf_counter() - capture.last_timestamp)
+            if handler is None:
+                handler = build_handler(job["mode"], job["submode"], job["params"], frame.shape[1], frame.shape[0])
+            start = time.perf_counter()
+            output = to_bgr8(handler.process_frame(frame, FrameContext(frame, context_buffers)))
+            process_ms = (time.perf_counter() - start) * 1000
+            if ring is None:
+                # The slot size is fixed by the first output
+                ring = SharedFrameRing.create(output.shape, output.dtype, lock, job["slots"], fields=3)
+                messages.put((index, "ring", ring.spec))
+                ring.owner = False  # The display process removes the segment, it may outlive this worker
+            slot = ring.claim()
+            if slot is None:
+                continue
+            if output.shape == ring.shape:
+                np.copyto(ring.frame(slot), output)
+            else:
+                cv2.resize(output, (ring.shape[1], ring.shape[0]), dst=ring.frame(slot))
+            seq += 1
+            ring.publish(slot, seq, captured_at, process_ms, ring.dropped + ring.overwritten)
+    finally:
+        capture.stop()
+        capture.release()
+        if ring is not None:
+            ring.close()
+        messages.put((index, "end", capture.error and str(capture.error)))
+
+
+class StreamStats:
+    def __init__(self, source: str, window: int = 120):
+        self.source = source
+        self.process_ms = RollingStat(window)
+        self.latency_ms = RollingStat(window)
+        self.arrivals = deque(maxlen=window)
+        self.received = 0
+        self.dropped = 0
+        self.ended = False
+
+    def add(self, captured_at: float, process_ms: float):
+        now = time.time()
+        self.process_ms.add(process_ms)
+        self.latency_ms.add((now - captured_at) * 1000)
+        self.arrivals.append(now)
+        self.received += 1
+
+    @property
+    def fps(self) -> float:
+        if len(self.arrivals) < 2:
+            return 0.0
+        return (len(self.arrivals) - 1) / max(self.arrivals[-1] - self.arrivals[0], 1e-9)
+
+    def summary(self) -> str:
+        p50, p95, _ = self.process_ms.percentiles()
+        l50, l95, _ = self.latency_ms.percentiles()
+        return (
+            f"{self.source}: {self.fps:5.1f} FPS, process p50/p95 {p50:.1f}/{p95:.1f} ms, "
+            f"latency p50/p95 {l50:.1f}/{l95:.1f} ms, received {self.received}, dropped {self.dropped}"
+        )
+
+
+def compose(frames: list[np.ndarray | None], stats: list[StreamStats], tile_width: int, buffers: BufferPool):
+    """Tile the newest frame of every stream into one image with a label per tile."""
+    columns = math.ceil(math.sqrt(len(frames)))
+    rows = math.ceil(len(frames) / columns)
+    sizes = [frame.shape[:2] for frame in frames if frame is not None]
+    height, width = sizes[0] if sizes else (480, 640)
+    tile_w, tile_h = tile_width, int(tile_width * height / width)
+    mosaic = buffers.get("mosaic", (tile_h * rows, tile_w * columns, 3))
+    mosaic.fill(0)
+    for i, (frame, stat) in enumerate(zip(frames, stats)):
+        x, y = (i % columns) * tile_w, (i // columns) * tile_h
+        if frame is not None:
+            tile = cv2.resize(frame, (tile_w, tile_h), dst=buffers.get(("tile", i), (tile_h, tile_w, 3)))
+            mosaic[y : y + tile_h, x : x + tile_w] = tile
+        label = f"{i}: {stat.source}  {stat.fps:.1f} FPS  {stat.latency_ms.percentiles()[0]:.0f} ms"
+        if stat.ended:
+            label += "  (ended)"
+        cv2.rectangle(mosaic, (x, y), (x + tile_w, y + 22), (0, 0, 0), -1)
+        cv2.putText(mosaic, label, (x + 5, y + 16), cv2.FONT_HERSHEY_SIMPLEX, 0.45, (255, 255, 255), 1, cv2.LINE_AA)
+    return mosaic
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run one mode handler on several sources, one process per source")
+    parser.add_argument(
+        "--source",
+        action="append",
+        required=True,
+        help="camera:<index>, video:<file>, images:<dir> or synthetic:<pattern> (repeat for more streams)",
+    )
+    parser.add_argument("--mode", required=True, help="Mode key from mode_map, e.g. 5")
+    parser.add_argument("--submode", default="q", help="Submode key, e.g. q (default: q)")
+    parser.add_argument(
+        "--param",
+        action="append",
+        default=[],
+        metavar="NAME=VALUE",
+        help='Trackbar value, e.g. "Canny Threshold1=50" (repeatable)',
+    )
+    parser.add_argument("--preset", default=None, help="Preset file saved from the app; --param values override it")
+    parser.add_argument("--width", type=int, default=None, help="Requested frame width for every source")
+    parser.add_argument("--height", type=int, default=None, help="Requested frame height for every source")
+    parser.add_argument("--fps", type=float, default=0.0, help="Playback rate for file and synthetic sources")
+    parser.add_argument("--loop", action="store_true", help="Restart video files and image folders at the end")
+    parser.add_argument("--slots", type=int, default=4, help="Shared-memory frame slots per stream (min 2)")
+    parser.add_argument("--tile-width", type=int, default=480, help="Width of each stream in the mosaic")
+    parser.add_argument("--no-display", action="store_true", help="Only print statistics (no HighGUI window)")
+    parser.add_argument("--duration", type=float, default=0.0, help="Stop after this many seconds (0 = until ESC)")
+    args = parser.parse_args()
+
+    params = {**preset_params(args.preset, args.mode, args.submode), **parse_params(args.param)}
+    # Fail early on bad mode keys or parameter names instead of inside every worker
+    build_handler(args.mode, args.submode, params)
+
+    streams = len(args.source)
+    # Share the cores between the workers instead of letting each OpenCV thread pool take all of them
+    threads = max(1, (os.cpu_count() or 1) // streams)
+    # spawn: forking a process that already runs OpenCV threads is not safe on every platform
+    context = mp.get_context("spawn")
+    stop = context.Event()
+    messages = context.Queue()  # Small control messages only; frames travel through the rings
+    locks = [context.Lock() for _ in args.source]
+    workers = []
+    for i, source in enumerate(args.source):
+        job = {
+            "source": source,
+            "mode": args.mode,
+            "submode": args.submode,
+            "params": params,
+            "width": args.width,
+            "height": args.height,
+            "fps": args.fps,
+            "loop": args.loop,
+            "threads": threads,
+            "slots": max(2, args.slots),
+        }
+        worker = context.Process(
+            target=stream_worker, args=(i, job, locks[i], messages, stop), name=f"stream-{i}", daemon=True
+        )
+        worker.start()
+        workers.append(worker)
+    print(f"Started {streams} stream workers ({threads} OpenCV threads each)")
+
+    stats = [StreamStats(source) for source in args.source]
+    rings: list[SharedFrameRing | None] = [None] * streams
+    held: list[int | None] = [None] * streams  # Slot each stream's displayed frame lives in
+    buffers = BufferPool()
+
+    def handle_message(index: int, kind: str, payload):
+        if kind == "ring":
+            rings[index] = SharedFrameRing.attach(payload, locks[index], owner=True)
+        elif kind == "end":
+            stats[index].ended = True
+            if payload:
+                print(f"Stream {index} ({args.source[index]}) failed: {payload}")
+
+    start_time = last_report = time.perf_counter()
+    try:
+        while not all(stat.ended for stat in stats):
+            while True:
+                try:
+                    handle_message(*messages.get_nowait())
+                except queue.Empty:
+                    break
+            for i, ring in enumerate(rings):
+                got = ring.acquire_latest() if ring is not None else None
+                if got is None:
+                    continue
+                # Keep the newest frame for display until a newer one replaces it
+                if held[i] is not None:
+                    ring.release(held[i])
+                held[i], _, (captured_at, process_ms, dropped) = got
+                stats[i].add(captured_at, process_ms)
+                stats[i].dropped = int(dropped) + ring.skipped
+
+            now = time.perf_counter()
+            if args.no_display:
+                time.sleep(0.005)
+                if now - last_report >= 2.0:
+                    for stat in stats:
+                        print(stat.summary())
+                    last_report = now
+            else:
+                frames = [ring.frame(slot) if slot is not None else None for ring, slot in zip(rings, held)]
+                cv2.imshow(WINDOW_NAME, compose(frames, stats, args.tile_width, buffers))
+                if cv2.waitKey(1) & 0xFF == 27:
+                    break
+            if args.duration and now - start_time >= args.duration:
+                break
+    finally:
+        stop.set()
+        for worker in workers:
+            worker.join(timeout=2.0)
+            if worker.is_alive():
+                worker.terminate()
+                worker.join()
+        # Rings announced after the loop stopped still have to be removed
+        while True:
+            try:
+                handle_message(*messages.get_nowait())
+            except queue.Empty:
+                break
+        for ring in rings:
+            if ring is not None:
+                ring.close()
+        if not args.no_display:
+            cv2.destroyAllWindows()
+
+    elapsed = time.perf_counter() - start_time
+    total = sum(stat.received for stat in stats)
+    print(f"Processed {total} frames from {streams} streams in {elapsed:.1f}s ({total / max(elapsed, 1e-9):.1f} FPS total)")
+    for stat in stats:
+        print(stat.summary())
+
+
+if __name__ == "__main__":
+    main()
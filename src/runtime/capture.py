@@ -0,0 +1,112 @@
+import threading
+import time
+from collections import deque
+
+from cv2.typing import MatLike
+
+
+class FrameQueue:
+    """Small bounded ring buffer of frames that drops the oldest frame when full."""
+
+    def __init__(self, maxlen: int = 2):
+        self._frames = deque(maxlen=maxlen)
+        self._cond = threading.Condition()
+        self.closed = False
+        self.pushed = 0  # Frames put into the queue
+        self.dropped = 0  # Frames overwritten or skipped before anyone processed them
+
+    def put(self, frame: MatLike, timestamp: float):
+        with self._cond:
+            if len(self._frames) == self._frames.maxlen:
+                self.dropped += 1  # deque drops the oldest entry on append
+            self._frames.append((frame, timestamp))
+            self.pushed += 1
+            self._cond.notify()
+
+    def get_latest(self, timeout: float | None = None) -> tuple[MatLike, float] | None:
+        """Wait for a frame and return the freshest one, discarding any older ones."""
+        with self._cond:
+            self._cond.wait_for(lambda: self._frames or self.closed, timeout)
+            if not self._frames:
+                return None
+            item = self._frames.pop()
+            self.dropped += len(self._frames)
+            self._frames.clear()
+            return item
+
+    def close(self):
+        with self._cond:
+            self.closed = True
+            self._cond.notify_all()
+
+
+class CaptureThread(threading.Thread):
+    """
+    Reads frames from a capture on its own thread so slow handlers never stall capture.
+    `cap` may also be a zero-argument callable that opens the source; it is then opened on the
+    capture thread, so a slow camera open does not hold up the UI.
+    """
+
+    def __init__(self, cap, maxlen: int = 2):
+        super().__init__(name="capture", daemon=True)
+        self._open = cap if not hasattr(cap, "read") else None
+        self.cap = cap if self._open is None else None
+        self.queue = FrameQueue(maxlen)
+        self.last_timestamp = 0.0  # Capture time of the frame most recently returned by read()
+        self.error: Exception | None = None  # Set if opening or reading the source failed
+        self.opened_at: float | None = None  # perf_counter() when the source finished opening
+        self.first_frame_at: float | None = None  # perf_counter() when the first frame arrived
+        self.frame_size: tuple[int, int] | None = None  # (width, height) of the first frame
+        self.first_frame = threading.Event()
+        self._stop_event = threading.Event()
+
+    def run(self):
+        try:
+            if self._open is not None:
+                self.cap = self._open()
+            self.opened_at = time.perf_counter()
+            while not self._stop_event.is_set():
+                ret, frame = self.cap.read()
+                if not ret:
+                    break
+                now = time.perf_counter()
+                if self.first_frame_at is None:
+                    self.first_frame_at = now
+                    self.frame_size = (frame.shape[1], frame.shape[0])
+                    self.first_frame.set()
+                self.queue.put(frame, now)
+        except Exception as e:
+            self.error = e
+        finally:
+            self.queue.close()
+            # Wake anyone waiting for a first frame that will never come
+            self.first_frame.set()
+
+    def wait_first_frame(self, timeout: float | None = None) -> bool:
+        """Wait until the first frame arrived or the source ended. Returns False on timeout."""
+        return self.first_frame.wait(timeout)
+
+    def read(self) -> tuple[bool, MatLike | None]:
+        """Same contract as cv2.VideoCapture.read(), but always returns the freshest frame."""
+        item = self.queue.get_latest()
+        if item is None:
+            return False, None
+        frame, self.last_timestamp = item
+        return True, frame
+
+    def stop(self):
+        self._stop_event.set()
+        self.queue.close()
+        self.join(timeout=1.0)
+
+    def release(self):
+        if self.cap is not None:
+            self.cap.release()
+
+    @property
+    def captured(self) -> int:
+        return self.queue.pushed
+
+    @property
+    def dropped(self) -> int:
+        return self.queue.dropped
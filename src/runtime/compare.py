@@ -0,0 +1,106 @@
+import math
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import cv2
+import numpy as np
+from cv2.typing import MatLike
+
+from mode_handlers.base import BaseModeHandler
+from mode_handlers.buffers import BufferPool
+from mode_handlers.frame_context import FrameContext
+from runtime.frames import to_bgr8
+from runtime.overlay import draw_status_text
+
+
+def smooth(previous: float | None, value: float, alpha: float = 0.2) -> float:
+    return value if previous is None else previous + alpha * (value - previous)
+
+
+class CompareView:
+    """
+    Runs several handlers on the same frame concurrently and tiles their outputs into one image,
+    each tile labelled with its name and processing time. OpenCV releases the GIL, so the handlers
+    really run on separate cores; they share one FrameContext, so gray/HSV are computed once.
+    """
+
+    def __init__(self, entries: list[tuple[str, BaseModeHandler]], max_workers: int | None = None):
+        self.entries = entries
+        self.columns = math.ceil(math.sqrt(len(entries)))
+        self.rows = math.ceil(len(entries) / self.columns)
+        self.executor = ThreadPoolExecutor(max_workers or min(len(entries), os.cpu_count() or 1), "compare")
+        self.tile_buffers = [BufferPool() for _ in entries]
+        self.buffers = BufferPool()
+        self.tile_ms = [None] * len(entries)  # Smoothed processing time per tile
+        self.wall_ms = None  # Smoothed time for the whole set
+
+    @property
+    def handlers(self) -> list[BaseModeHandler]:
+        return [handler for _, handler in self.entries]
+
+    def process(self, frame: MatLike, ctx: FrameContext | None = None) -> MatLike:
+        ctx = FrameContext.ensure(frame, ctx)
+        height, width = frame.shape[:2]
+        tile_w, tile_h = width // self.columns, height // self.columns
+        mosaic = self.buffers.get("mosaic", (tile_h * self.rows, tile_w * self.columns, 3))
+        mosaic.fill(0)
+
+        start = time.perf_counter()
+        tiles = [mosaic[y : y + tile_h, x : x + tile_w] for x, y in self._origins(tile_w, tile_h)]
+        futures = {
+            i: self.executor.submit(self._run_tile, i, handler, frame, ctx, tiles[i])
+            for i, handler in enumerate(self.handlers)
+            if not handler.main_thread_only
+        }
+        # The rest run here while the workers are busy
+        for i, handler in enumerate(self.handlers):
+            if handler.main_thread_only:
+                self._record(i, self._run_tile(i, handler, frame, ctx, tiles[i]))
+        for i, future in futures.items():
+            self._record(i, future.result())
+        self.wall_ms = smooth(self.wall_ms, (time.perf_counter() - start) * 1000)
+
+        for (label, _), (x, y), elapsed_ms in zip(self.entries, self._origins(tile_w, tile_h), self.tile_ms):
+            self._draw_label(mosaic, f"{label}  {elapsed_ms:.1f} ms", x + 6, y + tile_h - 8)
+        return mosaic
+
+    def _origins(self, tile_w: int, tile_h: int) -> list[tuple[int, int]]:
+        return [((i % self.columns) * tile_w, (i // self.columns) * tile_h) for i in range(len(self.entries))]
+
+    def _run_tile(self, index: int, handler: BaseModeHandler, frame: MatLike, ctx: FrameContext, tile: np.ndarray):
+        """Process the frame and write the result into this handler's tile. Returns milliseconds spent processing."""
+        start = time.perf_counter()
+        output = handler.process_frame(frame, ctx)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        buffers = self.tile_buffers[index]
+        # Shrink first: converting the tile-sized image to BGR is cheaper than converting the full frame
+        resized = cv2.resize(
+            output,
+            (tile.shape[1], tile.shape[0]),
+            dst=buffers.get("tile", tile.shape[:2] + output.shape[2:], output.dtype),
+            interpolation=cv2.INTER_AREA,
+        )
+        # Tiles are disjoint views of the mosaic, so workers can write them concurrently
+        np.copyto(tile, to_bgr8(resized, buffers))
+        return elapsed_ms
+
+    def _record(self, index: int, elapsed_ms: float):
+        self.tile_ms[index] = smooth(self.tile_ms[index], elapsed_ms)
+
+    def status(self) -> str:
+        total_ms = sum(self.tile_ms)
+        return f"{len(self.entries)} handlers: {self.wall_ms:.1f} ms wall / {total_ms:.1f} ms summed"
+
+    def draw_status(self, frame: MatLike) -> MatLike:
+        return draw_status_text(frame, self.status())
+
+    @staticmethod
+    def _draw_label(mosaic: np.ndarray, text: str, x: int, y: int):
+        font_face = cv2.FONT_HERSHEY_SIMPLEX
+        (text_w, text_h), baseline = cv2.getTextSize(text, font_face, 0.45, 1)
+        cv2.rectangle(mosaic, (x - 3, y - text_h - 3), (x + text_w + 3, y + baseline), (0, 0, 0), -1)
+        cv2.putText(mosaic, text, (x, y), font_face, 0.45, (255, 255, 255), 1, cv2.LINE_AA)
+
+    def close(self):
+        self.executor.shutdown(wait=True)
@@ -0,0 +1,107 @@
+import queue
+import threading
+import time
+
+import cv2
+import numpy as np
+from cv2.typing import MatLike
+
+from mode_handlers.buffers import BufferPool
+from mode_handlers.windows import window_manager
+
+
+class DisplayLoop:
+    """
+    Shows the newest completed frame at a fixed refresh rate and collects key presses, so
+    imshow/waitKey no longer sit between two processed frames.
+    publish() may be called from any thread: it copies the frame into whichever of two slots is not
+    being shown. show_latest() and wait_key() must run on the main thread, because HighGUI windows only
+    receive events on the thread that created them. Keys are queued in `keys` for the application.
+    Handlers' own windows are published the same way with publish_window() and shown by show_windows().
+    """
+
+    def __init__(self, window_name: str, refresh_hz: float = 60.0):
+        self.window_name = window_name
+        self.interval = 1.0 / refresh_hz
+        self.keys: queue.SimpleQueue[int] = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        self._slots: list[np.ndarray | None] = [None, None]
+        self._latest_slot = 0
+        self._showing_slot: int | None = None  # Never written by publish() while imshow reads it
+        self._seq = 0
+        self._shown_seq = 0
+        self._next_refresh = time.perf_counter()
+        # Handlers' own windows: name -> {"slots", "latest", "showing", "fresh"}, same scheme as the main window
+        self._windows: dict[str, dict] = {}
+        self.buffers = BufferPool()
+        self.published = 0
+        self.shown = 0
+
+    def publish(self, frame: MatLike):
+        with self._lock:
+            slot = 1 if self._showing_slot == 0 else 0
+            self._slots[slot] = self.buffers.like(("frame", slot), frame)
+            np.copyto(self._slots[slot], frame)
+            self._latest_slot = slot
+            self._seq += 1
+            self.published += 1
+
+    def show_latest(self) -> bool:
+        """imshow the newest published frame if it was not shown yet. Returns True if one was shown."""
+        with self._lock:
+            if self._seq == self._shown_seq:
+                return False
+            self._shown_seq = self._seq
+            self._showing_slot = self._latest_slot
+            frame = self._slots[self._showing_slot]
+        cv2.imshow(self.window_name, frame)
+        with self._lock:
+            self._showing_slot = None
+        self.shown += 1
+        return True
+
+    def publish_window(self, name: str, image: MatLike):
+        """publish() for one of a handler's own windows (a WindowManager.image_sink)."""
+        with self._lock:
+            state = self._windows.setdefault(
+                name, {"slots": [None, None], "latest": 0, "showing": None, "fresh": False}
+            )
+            slot = 1 if state["showing"] == 0 else 0
+            state["slots"][slot] = self.buffers.like(("window", name, slot), image)
+            np.copyto(state["slots"][slot], image)
+            state["latest"] = slot
+            state["fresh"] = True
+
+    def show_windows(self):
+        """imshow the newest image of every handler window that got a new one since the last call."""
+        with self._lock:
+            pending = []
+            for name, state in self._windows.items():
+                if state["fresh"]:
+                    state["fresh"] = False
+                    state["showing"] = state["latest"]
+                    pending.append((name, state["slots"][state["latest"]]))
+        for name, image in pending:
+            # A window closed since (handler dropped from the pool) must not be recreated by imshow
+            if name in window_manager.windows:
+                cv2.imshow(name, image)
+        with self._lock:
+            for name, _ in pending:
+                self._windows[name]["showing"] = None
+
+    def wait_key(self, wait: bool = True) -> int:
+        """
+        Handle window events until the next refresh is due (wait=False only pumps them once).
+        Returns the key pressed or -1; keys are also queued in `keys`.
+        """
+        now = time.perf_counter()
+        self._next_refresh = max(self._next_refresh + self.interval, now)
+        delay_ms = max(1, int((self._next_refresh - now) * 1000)) if wait else 1
+        key = cv2.waitKey(delay_ms) & 0xFF
+        if key == 0xFF:
+            return -1
+        self.keys.put(key)
+        return key
+
+    def status(self) -> str:
+        return f"shown {self.shown} of {self.published} processed frames"
@@ -0,0 +1,27 @@
+import cv2
+import numpy as np
+from cv2.typing import MatLike
+
+from mode_handlers.buffers import BufferPool
+
+
+def to_bgr8(frame: MatLike, buffers: BufferPool | None = None) -> MatLike:
+    """
+    Convert any handler output to 3-channel uint8 the way cv2.imshow would display it.
+    With buffers, intermediate and output arrays come from the pool and are reused on the next call.
+    """
+    if buffers is None:
+        buffers = BufferPool()
+    if frame.dtype != np.uint8:
+        converted = buffers.like("bgr8_uint8", frame, np.uint8)
+        if frame.dtype in (np.float32, np.float64):
+            # imshow maps float [0, 1] to [0, 255]
+            clipped = np.clip(frame, 0, 1, out=buffers.like("bgr8_float", frame))
+            frame = cv2.convertScaleAbs(clipped, dst=converted, alpha=255)
+        else:
+            frame = cv2.convertScaleAbs(frame, dst=converted)
+    if frame.ndim == 2:
+        return cv2.cvtColor(frame, cv2.COLOR_GRAY2BGR, dst=buffers.get("bgr8", frame.shape + (3,)))
+    if frame.shape[2] == 4:
+        return cv2.cvtColor(frame, cv2.COLOR_BGRA2BGR, dst=buffers.get("bgr8", frame.shape[:2] + (3,)))
+    return frame
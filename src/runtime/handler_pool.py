@@ -0,0 +1,51 @@
+from collections import OrderedDict
+from typing import Callable, Hashable
+
+from mode_handlers.base import BaseModeHandler
+
+
+class HandlerPool:
+    """
+    Keeps built handlers alive across mode switches so expensive constructors (ARHandler loading
+    the T-Rex model and calibration) run once and stateful handlers (PanoramaHandler captures)
+    keep their state. The least recently used handler is dropped when the pool is full.
+    """
+
+    def __init__(self, max_size: int = 8, on_evict: Callable[[Hashable, BaseModeHandler], None] | None = None):
+        self.max_size = max(1, max_size)
+        self.on_evict = on_evict
+        self._handlers: OrderedDict[Hashable, BaseModeHandler] = OrderedDict()
+
+    def get(self, key: Hashable, factory: Callable[[], BaseModeHandler]) -> tuple[BaseModeHandler, bool]:
+        """Return (handler, created). The handler is built with factory() only if it is not pooled."""
+        handler = self._handlers.get(key)
+        if handler is not None:
+            self._handlers.move_to_end(key)
+            return handler, False
+        handler = factory()
+        self._handlers[key] = handler
+        while len(self._handlers) > self.max_size:
+            old_key, old_handler = self._handlers.popitem(last=False)
+            self._evicted(old_key, old_handler)
+        return handler, True
+
+    def reset(self, key: Hashable | None = None):
+        """Drop one pooled handler (or all of them) so the next get() builds a fresh instance."""
+        keys = list(self._handlers) if key is None else [key]
+        for k in keys:
+            handler = self._handlers.pop(k, None)
+            if handler is not None:
+                self._evicted(k, handler)
+
+    def _evicted(self, key: Hashable, handler: BaseModeHandler):
+        if self.on_evict is not None:
+            self.on_evict(key, handler)
+
+    def handlers(self) -> list[BaseModeHandler]:
+        return list(self._handlers.values())
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._handlers
+
+    def __len__(self) -> int:
+        return len(self._handlers)
@@ -0,0 +1,33 @@
+from mode_handlers.base import BaseModeHandler
+from mode_handlers.modes import get_handler_class, mode_map
+from runtime.presets import apply_params
+
+
+def parse_params(items: list[str]) -> dict[str, int]:
+    """Parse repeated NAME=VALUE command-line arguments, e.g. "Canny Threshold1=50"."""
+    params = {}
+    for item in items or []:
+        name, sep, value = item.rpartition("=")
+        if not sep:
+            raise ValueError(f"Expected NAME=VALUE, got '{item}'")
+        params[name.strip()] = int(value)
+    return params
+
+
+def build_handler(
+    mode_key: str,
+    submode_key: str,
+    params: dict[str, int] | None = None,
+    width: int = 640,
+    height: int = 480,
+) -> BaseModeHandler:
+    """Instantiate a mode_map handler without any HighGUI window and apply trackbar values."""
+    if mode_key not in mode_map:
+        raise KeyError(f"Unknown mode key '{mode_key}', available: {list(mode_map)}")
+    submodes = mode_map[mode_key]["submodes"]
+    if submode_key not in submodes:
+        raise KeyError(f"Unknown submode key '{submode_key}' for mode '{mode_key}', available: {list(submodes)}")
+    handler = get_handler_class(mode_key, submode_key)()
+    handler.setup_window(None, None, width, height)
+    apply_params(handler, params or {})
+    return handler
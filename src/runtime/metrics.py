@@ -0,0 +1,150 @@
+import json
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+import cv2
+import numpy as np
+from cv2.typing import MatLike
+
+STAGES = ("capture", "keys", "process", "overlay", "display")
+
+
+class RollingStat:
+    """Keeps the last `window` samples so percentiles follow the current workload."""
+
+    def __init__(self, window: int):
+        self.samples = deque(maxlen=window)
+        self.count = 0
+
+    def add(self, value: float):
+        self.samples.append(value)
+        self.count += 1
+
+    def percentiles(self) -> tuple[float, float, float]:
+        if not self.samples:
+            return 0.0, 0.0, 0.0
+        # Copy first: samples may be appended from another thread (display vs processing stages)
+        p50, p95, p99 = np.percentile(np.array(list(self.samples), float), (50, 95, 99))
+        return float(p50), float(p95), float(p99)
+
+
+class LatencyMetrics:
+    """
+    Per-stage, per-handler timings keyed by the (mode, submode) names from mode_map.
+    Recording is a perf_counter pair and a deque append; percentiles are only computed
+    when the HUD refreshes or a snapshot is exported, so this can stay on all the time.
+    """
+
+    def __init__(self, window: int = 300, hud_refresh: float = 0.5):
+        self.window = window
+        self.stats: dict[tuple[str, str, str], RollingStat] = {}
+        self.frame_times: dict[tuple[str, str], deque] = {}
+        self.session_id = uuid.uuid4().hex[:12]
+        self.startup: dict[str, float] = {}
+        self._startup_exported = False
+        self.hud_enabled = False
+        self.hud_refresh = hud_refresh
+        self._hud_lines: list[str] = []
+        self._hud_key = None
+        self._hud_updated = 0.0
+
+    def record(self, mode: str, submode: str, stage: str, seconds: float):
+        key = (mode, submode, stage)
+        stat = self.stats.get(key)
+        if stat is None:
+            stat = self.stats[key] = RollingStat(self.window)
+        stat.add(seconds)
+
+    @contextmanager
+    def time(self, mode: str, submode: str, stage: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(mode, submode, stage, time.perf_counter() - start)
+
+    def tick(self, mode: str, submode: str):
+        """Mark the end of a frame for FPS calculation."""
+        times = self.frame_times.get((mode, submode))
+        if times is None:
+            times = self.frame_times[(mode, submode)] = deque(maxlen=self.window)
+        times.append(time.perf_counter())
+
+    def fps(self, mode: str, submode: str) -> float:
+        times = self.frame_times.get((mode, submode))
+        if not times or len(times) < 2 or times[-1] == times[0]:
+            return 0.0
+        return (len(times) - 1) / (times[-1] - times[0])
+
+    def summary(self, mode: str, submode: str) -> dict[str, dict]:
+        result = {}
+        for stage in STAGES:
+            stat = self.stats.get((mode, submode, stage))
+            if stat is None:
+                continue
+            p50, p95, p99 = stat.percentiles()
+            result[stage] = {
+                "count": stat.count,
+                "p50_ms": round(p50 * 1000, 3),
+                "p95_ms": round(p95 * 1000, 3),
+                "p99_ms": round(p99 * 1000, 3),
+            }
+        return result
+
+    def set_startup(self, **values: float):
+        """Record one-off cold-start timings (e.g. time to first frame); exported once per session."""
+        self.startup.update(values)
+        self._startup_exported = False
+
+    def toggle_hud(self):
+        self.hud_enabled = not self.hud_enabled
+        self._hud_key = None
+
+    def draw_hud(self, frame: MatLike, mode: str, submode: str) -> MatLike:
+        if not self.hud_enabled:
+            return frame
+        now = time.perf_counter()
+        if self._hud_key != (mode, submode) or now - self._hud_updated >= self.hud_refresh:
+            lines = [f"FPS: {self.fps(mode, submode):.1f}   p50 / p95 / p99 (ms)"]
+            for stage, s in self.summary(mode, submode).items():
+                lines.append(f"{stage:<8} {s['p50_ms']:7.2f} {s['p95_ms']:7.2f} {s['p99_ms']:7.2f}")
+            self._hud_lines = lines
+            self._hud_key = (mode, submode)
+            self._hud_updated = now
+
+        font_face = cv2.FONT_HERSHEY_SIMPLEX
+        font_scale = 0.45
+        line_h = 18
+        frame_h, frame_w = frame.shape[:2]
+        y0 = frame_h - 10 - line_h * (len(self._hud_lines) - 1)
+        x0 = frame_w - 320
+        cv2.rectangle(frame, (x0 - 6, y0 - line_h), (frame_w - 4, frame_h - 4), (0, 0, 0), -1)
+        for i, line in enumerate(self._hud_lines):
+            cv2.putText(frame, line, (x0, y0 + i * line_h), font_face, font_scale, (255, 255, 255), 1)
+        return frame
+
+    def export(self, path: str, final: bool = False):
+        """Append one JSON line per (mode, submode, stage) with the current rolling percentiles."""
+        now = datetime.now(timezone.utc).isoformat()
+        with open(path, "a") as f:
+            if self.startup and not self._startup_exported:
+                record = {"session": self.session_id, "time": now, "stage": "startup", **self.startup}
+                f.write(json.dumps(record) + "\n")
+                self._startup_exported = True
+            for mode, submode in sorted({(m, s) for m, s, _ in list(self.stats)}):
+                fps = self.fps(mode, submode)
+                for stage, s in self.summary(mode, submode).items():
+                    record = {
+                        "session": self.session_id,
+                        "time": now,
+                        "final": final,
+                        "mode": mode,
+                        "submode": submode,
+                        "stage": stage,
+                        "fps": round(fps, 2),
+                        **s,
+                    }
+                    f.write(json.dumps(record) + "\n")
@@ -0,0 +1,65 @@
+from typing import Callable, Hashable
+
+import cv2
+import numpy as np
+from cv2.typing import MatLike
+
+
+class OverlayCache:
+    """
+    Renders a static overlay once into a sprite plus mask and blits it with one masked copy per frame.
+    The sprite is re-rendered only when the key (e.g. mode/submode) or the frame size changes.
+    Each frame format (channels, dtype) gets a sprite drawn on a frame of that format, so the blit writes
+    exactly what drawing on the frame would have written (e.g. 255.0 in float frames, alpha 0 in BGRA).
+    """
+
+    def __init__(self):
+        self._key = None
+        # (channels, dtype) -> (sprite cropped to the drawn area, uint8 mask non-zero where opaque, origin),
+        # or None if nothing is drawn
+        self._variants = {}
+
+    @staticmethod
+    def _render(shape: tuple[int, ...], dtype, draw: Callable[[MatLike], None]):
+        # Draw twice on different backgrounds: pixels the overlay covers come out identical in both
+        canvas = np.zeros(shape, dtype)
+        probe = np.full(shape, 255, dtype)
+        draw(canvas)
+        draw(probe)
+        mask = canvas == probe
+        if mask.ndim == 3:
+            mask = np.all(mask, axis=2)
+        if not mask.any():
+            return None
+        ys, xs = np.nonzero(mask)
+        y0, y1, x0, x1 = ys.min(), ys.max() + 1, xs.min(), xs.max() + 1
+        return canvas[y0:y1, x0:x1].copy(), mask[y0:y1, x0:x1].astype(np.uint8), (y0, x0)
+
+    def apply(self, frame: MatLike, key: Hashable, draw: Callable[[MatLike], None]) -> MatLike:
+        """Blit the overlay for `key` onto frame in place; `draw(canvas)` is only called on a cache miss."""
+        height, width = frame.shape[:2]
+        full_key = (key, height, width)
+        if full_key != self._key:
+            self._key = full_key
+            self._variants = {}
+        variant_key = (frame.shape[2:], frame.dtype)
+        if variant_key not in self._variants:
+            self._variants[variant_key] = self._render(frame.shape, frame.dtype, draw)
+        variant = self._variants[variant_key]
+        if variant is None:
+            return frame
+        sprite, mask, (y0, x0) = variant
+        roi = frame[y0 : y0 + sprite.shape[0], x0 : x0 + sprite.shape[1]]
+        # copyTo writes through the ROI view, so this is a single masked copy into the frame
+        cv2.copyTo(sprite, mask, roi)
+        return frame
+
+
+def draw_status_text(frame: MatLike, text: str, line: int = 0) -> MatLike:
+    """White-on-black status line at the top right of the frame; line stacks several of them."""
+    font_face = cv2.FONT_HERSHEY_SIMPLEX
+    (text_w, text_h), baseline = cv2.getTextSize(text, font_face, 0.5, 1)
+    x, y = frame.shape[1] - text_w - 10, 25 + line * 25
+    cv2.rectangle(frame, (x - 5, y - text_h - 5), (x + text_w + 5, y + baseline + 3), (0, 0, 0), -1)
+    cv2.putText(frame, text, (x, y), font_face, 0.5, (255, 255, 255), 1, cv2.LINE_AA)
+    return frame
@@ -0,0 +1,56 @@
+import json
+import os
+
+from mode_handlers.base import BaseModeHandler
+
+
+def preset_key(mode_key: str, submode_key: str) -> str:
+    """Presets are keyed like --compare: mode key + submode key, e.g. "5q"."""
+    return f"{mode_key}{submode_key}"
+
+
+def load_presets(path: str) -> dict[str, dict[str, int]]:
+    """Read a preset file ({"5q": {"Canny Threshold1": 50, ...}, ...}); a missing file has no presets."""
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        presets = json.load(f)
+    if not isinstance(presets, dict):
+        raise ValueError(f"{path}: expected a JSON object of <mode><submode> -> {{trackbar name: value}}")
+    return {key: {name: int(value) for name, value in values.items()} for key, values in presets.items()}
+
+
+def preset_params(path: str | None, mode_key: str, submode_key: str) -> dict[str, int]:
+    """The saved values for one mode/submode, empty if there are none."""
+    if not path:
+        return {}
+    return dict(load_presets(path).get(preset_key(mode_key, submode_key), {}))
+
+
+def save_preset(path: str, mode_key: str, submode_key: str, values: dict[str, int]):
+    """Store the values of one mode/submode (by unique parameter name), keeping every other preset in the file."""
+    presets = load_presets(path)
+    presets[preset_key(mode_key, submode_key)] = values
+    # Write a temporary file first, so an interrupted save never leaves a truncated preset file
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(presets, f, indent=2, sort_keys=True)
+        f.write("\n")
+    os.replace(tmp_path, path)
+
+
+def apply_params(handler: BaseModeHandler, values: dict[str, int], strict: bool = True) -> list[str]:
+    """
+    set_param() every value. Unknown names raise KeyError, or with strict=False are skipped and
+    returned (e.g. a preset saved before a trackbar was renamed). Names shared by several pipeline
+    stages always raise ValueError: values are keyed by unique names such as "2:Canny Threshold1".
+    """
+    unknown = []
+    for name, value in values.items():
+        try:
+            handler.set_param(name, value)
+        except KeyError:
+            if strict:
+                raise
+            unknown.append(name)
+    return unknown
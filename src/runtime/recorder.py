@@ -0,0 +1,119 @@
+import os
+import threading
+import time
+from collections import deque
+
+import cv2
+import numpy as np
+from cv2.typing import MatLike
+
+from mode_handlers.buffers import BufferPool
+from runtime.frames import to_bgr8
+
+VIDEO_FOURCC = {".mp4": "mp4v", ".avi": "MJPG", ".mkv": "MJPG", ".mov": "mp4v"}
+
+
+def open_writer(path: str, fps: float, size: tuple[int, int]) -> cv2.VideoWriter:
+    fourcc = cv2.VideoWriter_fourcc(*VIDEO_FOURCC[os.path.splitext(path)[1].lower()])
+    writer = cv2.VideoWriter(path, fourcc, fps, size)
+    if not writer.isOpened():
+        raise RuntimeError(f"Cannot open video writer: {path}")
+    return writer
+
+
+class Recorder(threading.Thread):
+    """
+    Encodes displayed frames to a video file on its own thread.
+    submit() only copies the frame into a free slot of a small ring and returns; when every slot
+    is waiting for the encoder the frame is dropped instead, so the caller never blocks on encoding.
+    The video size is fixed by the first frame; later frames of another size are resized to it.
+    """
+
+    def __init__(self, path: str, fps: float, maxlen: int = 8):
+        super().__init__(name="recorder", daemon=True)
+        self.path = path
+        self.fps = fps
+        self.maxlen = maxlen
+        self._queue: deque[np.ndarray] = deque()
+        self._free: list[np.ndarray] = []  # Slots already encoded, ready for reuse
+        self._slots = 0
+        self._cond = threading.Condition()
+        self._stopping = False
+        self.buffers = BufferPool()  # Encoder-side conversion buffers
+        self.size: tuple[int, int] | None = None
+        self.error: Exception | None = None
+        self.submitted = 0
+        self.written = 0
+        self.dropped = 0
+        self.started_at = time.perf_counter()
+
+    @property
+    def depth(self) -> int:
+        """Frames waiting to be encoded."""
+        return len(self._queue)
+
+    def submit(self, frame: MatLike) -> bool:
+        """Queue a copy of frame for encoding. Returns False if it was dropped."""
+        with self._cond:
+            self.submitted += 1
+            if self._stopping or self.error is not None:
+                return False
+            slot = self._take_slot(frame)
+            if slot is None:
+                self.dropped += 1
+                return False
+        # Copy outside the lock; the slot belongs to this caller until it is queued
+        np.copyto(slot, frame)
+        with self._cond:
+            self._queue.append(slot)
+            self._cond.notify()
+        return True
+
+    def _take_slot(self, frame: MatLike) -> np.ndarray | None:
+        for i, slot in enumerate(self._free):
+            if slot.shape == frame.shape and slot.dtype == frame.dtype:
+                return self._free.pop(i)
+        if self._slots < self.maxlen:
+            self._slots += 1
+            return np.empty_like(frame)
+        if self._free:
+            # Frame format changed: replace a stale slot
+            self._free.pop()
+            return np.empty_like(frame)
+        return None
+
+    def run(self):
+        writer = None
+        try:
+            while True:
+                with self._cond:
+                    self._cond.wait_for(lambda: self._queue or self._stopping)
+                    if not self._queue:
+                        break
+                    slot = self._queue.popleft()
+                frame = to_bgr8(slot, self.buffers)
+                if writer is None:
+                    self.size = (frame.shape[1], frame.shape[0])
+                    writer = open_writer(self.path, self.fps, self.size)
+                if (frame.shape[1], frame.shape[0]) != self.size:
+                    frame = cv2.resize(frame, self.size, dst=self.buffers.get("resized", self.size[::-1] + (3,)))
+                writer.write(frame)
+                self.written += 1
+                with self._cond:
+                    self._free.append(slot)
+        except Exception as e:
+            self.error = e
+        finally:
+            if writer is not None:
+                writer.release()
+
+    def stop(self):
+        """Finish encoding what is queued, then close the file."""
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+        self.join()
+
+    def status(self) -> str:
+        seconds = time.perf_counter() - self.started_at
+        return f"REC {seconds:.0f}s  queue {self.depth}/{self.maxlen}  dropped {self.dropped}"
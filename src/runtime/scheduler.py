@@ -0,0 +1,138 @@
+import time
+
+import cv2
+import numpy as np
+from cv2.typing import MatLike
+
+from mode_handlers.base import BaseModeHandler
+from mode_handlers.buffers import BufferPool
+from mode_handlers.frame_context import FrameContext
+from runtime.overlay import draw_status_text
+
+# Degradation levels, cheapest last: (proxy scale, process every Nth frame)
+LEVELS = (
+    (1.0, 1),
+    (0.75, 1),
+    (0.5, 1),
+    (0.5, 2),
+    (0.5, 3),
+    (0.5, 4),
+)
+
+
+class FrameScheduler:
+    """
+    Keeps the active handler within a frame budget derived from a target FPS.
+    The handler's cost is measured on every processed frame and normalized to full resolution
+    (cost scales with pixel count), which predicts the cost of every level. When the current level
+    does not fit the budget the scheduler steps down: first the handler runs on a downscaled proxy
+    that is upscaled back, then only every Nth frame is processed and the last result is reused.
+    It steps back up once the next better level fits with headroom to spare.
+    """
+
+    def __init__(
+        self,
+        target_fps: float,
+        budget_fraction: float = 0.8,
+        recover_margin: float = 0.7,
+        min_frames_between_changes: int = 10,
+        smoothing: float = 0.2,
+    ):
+        # The rest of the budget is left for capture, overlay and display
+        self.budget = budget_fraction / target_fps
+        self.target_fps = target_fps
+        self.recover_margin = recover_margin
+        self.min_frames_between_changes = min_frames_between_changes
+        self.smoothing = smoothing
+        self.buffers = BufferPool()
+        self.context_buffers = BufferPool()
+        self.reset()
+
+    def reset(self):
+        """Forget the measured cost and go back to full quality (e.g. after a handler switch)."""
+        self.level = 0
+        self.full_cost: float | None = None  # Smoothed cost of one full-resolution frame (seconds)
+        self.active = LEVELS[0]  # (scale, skip) actually applied to the current handler
+        self.frame_index = 0
+        self.frames_since_change = 0
+        self.last_output: np.ndarray | None = None  # Clean copy of the last processed output, kept while skipping
+
+    def process(self, handler: BaseModeHandler, frame: MatLike, ctx: FrameContext) -> MatLike:
+        scale, skip = self.active = self._level(handler, self.level)
+        self.frame_index += 1
+        if skip > 1 and self.last_output is not None and self.frame_index % skip != 0:
+            # Callers draw overlays on the returned frame, so hand out a copy and keep the kept output clean
+            output = self.buffers.like("output", self.last_output)
+            np.copyto(output, self.last_output)
+            return output
+
+        start = time.perf_counter()
+        if scale < 1.0:
+            output = self._process_proxy(handler, frame, scale)
+        else:
+            output = handler.process_frame(frame, ctx)
+        cost = time.perf_counter() - start
+
+        full_cost = cost / (scale * scale)
+        if self.full_cost is None:
+            self.full_cost = full_cost
+        else:
+            self.full_cost += self.smoothing * (full_cost - self.full_cost)
+        if skip > 1:
+            # The output is the handler's own buffer (or the input frame), overwritten or drawn on later
+            self.last_output = self.buffers.like("last", output)
+            np.copyto(self.last_output, output)
+        else:
+            self.last_output = None
+        self._adapt(handler)
+        return output
+
+    def predicted_cost(self, handler: BaseModeHandler, level: int) -> float:
+        """Average per-frame processing cost at a level, from the measured full-resolution cost."""
+        scale, skip = self._level(handler, level)
+        return self.full_cost * scale * scale / skip
+
+    def _level(self, handler: BaseModeHandler, level: int) -> tuple[float, int]:
+        scale, skip = LEVELS[level]
+        if not handler.allow_proxy_resolution:
+            scale = 1.0
+        return scale, skip
+
+    def _adapt(self, handler: BaseModeHandler):
+        self.frames_since_change += 1
+        if self.frames_since_change < self.min_frames_between_changes:
+            return
+        if self.predicted_cost(handler, self.level) > self.budget and self.level < len(LEVELS) - 1:
+            self.level += 1
+        elif self.level > 0 and self.predicted_cost(handler, self.level - 1) < self.budget * self.recover_margin:
+            self.level -= 1
+        else:
+            return
+        self.frames_since_change = 0
+
+    def _process_proxy(self, handler: BaseModeHandler, frame: MatLike, scale: float) -> MatLike:
+        height, width = frame.shape[:2]
+        proxy_size = (max(1, int(width * scale)), max(1, int(height * scale)))
+        proxy_shape = (proxy_size[1], proxy_size[0]) + frame.shape[2:]
+        proxy = cv2.resize(
+            frame, proxy_size, dst=self.buffers.get("proxy", proxy_shape, frame.dtype), interpolation=cv2.INTER_AREA
+        )
+        output = handler.process_frame(proxy, FrameContext(proxy, self.context_buffers))
+        upscaled = self.buffers.get("upscaled", (height, width) + output.shape[2:], output.dtype)
+        return cv2.resize(output, (width, height), dst=upscaled, interpolation=cv2.INTER_LINEAR)
+
+    def status(self) -> str | None:
+        """Short description of the active degradation, None at full quality."""
+        scale, skip = self.active
+        if scale == 1.0 and skip == 1:
+            return None
+        parts = []
+        if scale < 1.0:
+            parts.append(f"{scale:.0%} res")
+        if skip > 1:
+            parts.append(f"every {skip} frames")
+        return f"Degraded (L{self.level}): " + ", ".join(parts)
+
+    def draw_status(self, frame: MatLike) -> MatLike:
+        text = self.status()
+        return frame if text is None else draw_status_text(frame, text)
@@ -0,0 +1,137 @@
+from multiprocessing import shared_memory
+
+import numpy as np
+
+# Slot states. A slot is only ever written while WRITING and only read while READING.
+FREE, WRITING, READY, READING = range(4)
+
+
+def _open_shared_memory(name: str | None, size: int = 0, track: bool = True) -> shared_memory.SharedMemory:
+    create = name is None
+    try:
+        # Only the owning process should track (and on exit clean up) the segment
+        return shared_memory.SharedMemory(name, create=create, size=size, track=track)
+    except TypeError:  # Python < 3.13 has no track argument
+        return shared_memory.SharedMemory(name, create=create, size=size)
+
+
+class SharedFrameRing:
+    """
+    Fixed-size frame slots in one shared memory segment, for handing frames between processes
+    without pickling them. The producer claim()s a slot, writes the frame straight into frame(slot)
+    and publish()es it with a sequence number and a few float fields (timestamps, timings...).
+    The consumer acquire_latest()s the newest published slot as a NumPy view and release()s it when done.
+
+    The lock only guards the small slot-state table, never the frame copies. Under backpressure the
+    producer reuses the oldest published slot the consumer has not taken yet, and drops the frame if
+    every slot is busy; a slot that is being read is never overwritten. Intended for one producer and
+    one consumer per ring.
+    """
+
+    def __init__(self, shm: shared_memory.SharedMemory, shape: tuple[int, ...], dtype, slots: int, fields: int, lock):
+        self.shm = shm
+        self.shape = tuple(shape)
+        self.dtype = np.dtype(dtype)
+        self.slots = slots
+        self.fields = fields
+        self.lock = lock
+        self.owner = False
+        # Layout: state[slots] int64, seq[slots] int64, meta[slots, fields] float64, then the frames
+        offset = 0
+        self._state = np.ndarray((slots,), np.int64, shm.buf, offset)
+        offset += self._state.nbytes
+        self._seq = np.ndarray((slots,), np.int64, shm.buf, offset)
+        offset += self._seq.nbytes
+        self._meta = np.ndarray((slots, fields), np.float64, shm.buf, offset)
+        offset += self._meta.nbytes
+        self._frames = np.ndarray((slots,) + self.shape, self.dtype, shm.buf, offset)
+        self.claimed = 0  # Producer side: slots written
+        self.dropped = 0  # Producer side: frames dropped because every slot was busy
+        self.overwritten = 0  # Producer side: published frames replaced before the consumer took them
+        self.skipped = 0  # Consumer side: published frames passed over for a newer one
+
+    @staticmethod
+    def nbytes(shape: tuple[int, ...], dtype, slots: int, fields: int) -> int:
+        return slots * (16 + 8 * fields + int(np.prod(shape)) * np.dtype(dtype).itemsize)
+
+    @classmethod
+    def create(cls, shape: tuple[int, ...], dtype, lock, slots: int = 4, fields: int = 1) -> "SharedFrameRing":
+        """Allocate a new ring. `lock` must be a multiprocessing Lock shared with the other side."""
+        if slots < 2:
+            raise ValueError("A shared frame ring needs at least 2 slots")
+        shm = _open_shared_memory(None, cls.nbytes(shape, dtype, slots, fields))
+        ring = cls(shm, shape, dtype, slots, fields, lock)
+        ring.owner = True
+        ring._state.fill(FREE)
+        ring._seq.fill(0)
+        return ring
+
+    @classmethod
+    def attach(cls, spec: tuple, lock, owner: bool = False) -> "SharedFrameRing":
+        """
+        Open a ring created by another process from its spec (see `spec`) and the same lock.
+        owner=True takes over removing the segment, e.g. when the creator may exit first.
+        """
+        name, shape, dtype, slots, fields = spec
+        ring = cls(_open_shared_memory(name, track=owner), shape, dtype, slots, fields, lock)
+        ring.owner = owner
+        return ring
+
+    @property
+    def spec(self) -> tuple:
+        """Picklable description another process can attach() with."""
+        return self.shm.name, self.shape, self.dtype.str, self.slots, self.fields
+
+    def frame(self, slot: int) -> np.ndarray:
+        """View of a slot's pixels; only valid to touch while the slot is claimed or acquired."""
+        return self._frames[slot]
+
+    def claim(self) -> int | None:
+        """Reserve a slot for writing. Returns None (frame dropped) if no slot can be reused."""
+        with self.lock:
+            free = np.flatnonzero(self._state == FREE)
+            if free.size:
+                slot = int(free[0])
+            else:
+                ready = np.flatnonzero(self._state == READY)
+                if not ready.size:
+                    self.dropped += 1
+                    return None
+                slot = int(ready[np.argmin(self._seq[ready])])
+                self.overwritten += 1
+            self._state[slot] = WRITING
+        self.claimed += 1
+        return slot
+
+    def publish(self, slot: int, seq: int, *meta: float):
+        """Hand a written slot to the consumer."""
+        with self.lock:
+            self._seq[slot] = seq
+            self._meta[slot, : len(meta)] = meta
+            self._state[slot] = READY
+
+    def acquire_latest(self) -> tuple[int, int, np.ndarray] | None:
+        """Take the newest published slot. Returns (slot, seq, meta) or None; older published slots are freed."""
+        with self.lock:
+            ready = np.flatnonzero(self._state == READY)
+            if not ready.size:
+                return None
+            slot = int(ready[np.argmax(self._seq[ready])])
+            for older in ready:
+                if older != slot:
+                    self._state[older] = FREE
+                    self.skipped += 1
+            self._state[slot] = READING
+            return slot, int(self._seq[slot]), self._meta[slot].copy()
+
+    def release(self, slot: int):
+        with self.lock:
+            self._state[slot] = FREE
+
+    def close(self):
+        """Detach this process; the owner also removes the segment."""
+        # Drop the views first, the segment cannot be closed while they exist
+        self._state = self._seq = self._meta = self._frames = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
@@ -0,0 +1,275 @@
+import os
+import time
+
+import cv2
+import numpy as np
+from cv2.typing import MatLike
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp", ".tif", ".tiff", ".webp")
+SYNTHETIC_PATTERNS = ("chessboard", "aruco", "shapes")
+
+
+class FrameSource:
+    """Anything that produces frames. Mirrors the cv2.VideoCapture read()/release() contract."""
+
+    fps: float = 0.0
+
+    def read(self) -> tuple[bool, MatLike | None]:
+        raise NotImplementedError
+
+    def isOpened(self) -> bool:
+        return True
+
+    def release(self):
+        pass
+
+
+class _Pacer:
+    """Sleeps so that consecutive ticks are 1/fps apart. fps <= 0 means run as fast as possible."""
+
+    def __init__(self, fps: float):
+        self.interval = 1.0 / fps if fps and fps > 0 else 0.0
+        self.next_time = None
+
+    def wait(self):
+        if not self.interval:
+            return
+        now = time.perf_counter()
+        if self.next_time is None:
+            self.next_time = now
+        elif self.next_time > now:
+            time.sleep(self.next_time - now)
+        # Do not try to catch up after a stall, just restart the schedule
+        self.next_time = max(self.next_time, now) + self.interval
+
+
+def _resize(frame: MatLike, width: int | None, height: int | None) -> MatLike:
+    if not width and not height:
+        return frame
+    h, w = frame.shape[:2]
+    width = width or int(round(w * height / h))
+    height = height or int(round(h * width / w))
+    if (w, h) == (width, height):
+        return frame
+    return cv2.resize(frame, (width, height), interpolation=cv2.INTER_AREA)
+
+
+class CameraSource(FrameSource):
+    def __init__(self, index: int = 0, width: int | None = None, height: int | None = None, fps: float = 0.0):
+        self.cap = cv2.VideoCapture(index)
+        if width:
+            self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+        if height:
+            self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+        if fps:
+            self.cap.set(cv2.CAP_PROP_FPS, fps)
+        self.fps = self.cap.get(cv2.CAP_PROP_FPS) or fps
+
+    def read(self):
+        return self.cap.read()
+
+    def isOpened(self):
+        return self.cap.isOpened()
+
+    def release(self):
+        self.cap.release()
+
+
+class VideoFileSource(FrameSource):
+    """Plays a video file. With fps=0 frames are decoded as fast as possible (for benchmarking)."""
+
+    def __init__(
+        self,
+        path: str,
+        width: int | None = None,
+        height: int | None = None,
+        fps: float = 0.0,
+        loop: bool = False,
+    ):
+        self.path = path
+        self.cap = cv2.VideoCapture(path)
+        if not self.cap.isOpened():
+            raise RuntimeError(f"Cannot open video file: {path}")
+        self.width = width
+        self.height = height
+        self.loop = loop
+        self.fps = fps or self.cap.get(cv2.CAP_PROP_FPS)
+        self.pacer = _Pacer(fps)
+
+    def read(self):
+        ret, frame = self.cap.read()
+        if not ret and self.loop:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            ret, frame = self.cap.read()
+        if not ret:
+            return False, None
+        self.pacer.wait()
+        return True, _resize(frame, self.width, self.height)
+
+    def isOpened(self):
+        return self.cap.isOpened()
+
+    def release(self):
+        self.cap.release()
+
+
+class ImageDirectorySource(FrameSource):
+    """Plays the images of a directory in file-name order."""
+
+    def __init__(
+        self,
+        path: str,
+        width: int | None = None,
+        height: int | None = None,
+        fps: float = 0.0,
+        loop: bool = False,
+    ):
+        self.files = sorted(
+            os.path.join(path, name) for name in os.listdir(path) if name.lower().endswith(IMAGE_EXTENSIONS)
+        )
+        if not self.files:
+            raise RuntimeError(f"No images found in directory: {path}")
+        self.width = width
+        self.height = height
+        self.loop = loop
+        self.fps = fps
+        self.pacer = _Pacer(fps)
+        self.index = 0
+
+    def read(self):
+        if self.index >= len(self.files):
+            if not self.loop:
+                return False, None
+            self.index = 0
+        frame = cv2.imread(self.files[self.index], cv2.IMREAD_COLOR)
+        self.index += 1
+        if frame is None:
+            return False, None
+        self.pacer.wait()
+        return True, _resize(frame, self.width, self.height)
+
+
+class SyntheticSource(FrameSource):
+    """
+    Deterministic generated frames: frame i is always the same image for the same settings,
+    so handler throughput can be compared run to run without a camera.
+    """
+
+    def __init__(
+        self,
+        pattern: str = "shapes",
+        width: int | None = None,
+        height: int | None = None,
+        fps: float = 30.0,
+        num_frames: int = 0,
+    ):
+        if pattern not in SYNTHETIC_PATTERNS:
+            raise ValueError(f"Unknown synthetic pattern '{pattern}', expected one of {SYNTHETIC_PATTERNS}")
+        self.pattern = pattern
+        self.width = width or 640
+        self.height = height or 480
+        self.fps = fps
+        self.num_frames = num_frames  # 0 = endless
+        self.pacer = _Pacer(fps)
+        self.index = 0
+        if pattern == "chessboard":
+            self.target = self._make_chessboard()
+        elif pattern == "aruco":
+            self.target = self._make_aruco()
+
+    def _make_chessboard(self) -> np.ndarray:
+        # 9x6 internal corners, same as assets/A4_Chessboard_9x6.png and the calibration mode
+        cols, rows = 10, 7
+        square = max(8, min(self.width, self.height) // 12)
+        margin = square // 2
+        board = np.full((rows * square + 2 * margin, cols * square + 2 * margin, 3), 255, np.uint8)
+        for r in range(rows):
+            for c in range(cols):
+                if (r + c) % 2 == 0:
+                    y, x = margin + r * square, margin + c * square
+                    board[y : y + square, x : x + square] = 0
+        return board
+
+    def _make_aruco(self) -> np.ndarray:
+        # Marker id 0 of the dictionary the AR mode detects
+        aruco_dict = cv2.aruco.getPredefinedDictionary(cv2.aruco.DICT_6X6_250)
+        size = max(48, min(self.width, self.height) // 3)
+        marker = cv2.aruco.generateImageMarker(aruco_dict, 0, size)
+        margin = size // 4
+        marker = cv2.copyMakeBorder(marker, margin, margin, margin, margin, cv2.BORDER_CONSTANT, value=255)
+        return cv2.cvtColor(marker, cv2.COLOR_GRAY2BGR)
+
+    def _render_target(self, i: int) -> np.ndarray:
+        # Slowly sway, tilt and zoom the target around the frame center
+        t = i / 30.0
+        h, w = self.target.shape[:2]
+        angle = 15 * np.sin(t * 0.7)
+        scale = 0.9 + 0.1 * np.sin(t * 0.5)
+        matrix = cv2.getRotationMatrix2D((w / 2, h / 2), angle, scale)
+        matrix[0, 2] += (self.width - w) / 2 + 0.1 * self.width * np.sin(t * 0.9)
+        matrix[1, 2] += (self.height - h) / 2 + 0.1 * self.height * np.cos(t * 1.1)
+        return cv2.warpAffine(
+            self.target, matrix, (self.width, self.height), borderMode=cv2.BORDER_CONSTANT, borderValue=(128, 128, 128)
+        )
+
+    def _render_shapes(self, i: int) -> np.ndarray:
+        t = i / 30.0
+        w, h = self.width, self.height
+        frame = np.empty((h, w, 3), np.uint8)
+        # Horizontal gradient background so the intensity transforms have something to work on
+        frame[:] = np.linspace(30, 200, w, dtype=np.uint8)[None, :, None]
+        r = max(4, min(w, h) // 10)
+        cx = int(w / 2 + w / 3 * np.sin(t))
+        cy = int(h / 2 + h / 3 * np.cos(t * 0.8))
+        cv2.circle(frame, (cx, cy), r, (0, 0, 255), -1)
+        cv2.circle(frame, (w - cx, h - cy), r // 2, (255, 255, 255), 2)
+        x = int((t * 60) % max(1, w - 2 * r))
+        cv2.rectangle(frame, (x, h // 5), (x + 2 * r, h // 5 + r), (0, 255, 0), -1)
+        angle = t * 0.6
+        dx, dy = int(w / 2 * np.cos(angle)), int(w / 2 * np.sin(angle))
+        cv2.line(frame, (w // 2 - dx, h // 2 - dy), (w // 2 + dx, h // 2 + dy), (255, 0, 0), 3)
+        return frame
+
+    def read(self):
+        if self.num_frames and self.index >= self.num_frames:
+            return False, None
+        if self.pattern == "shapes":
+            frame = self._render_shapes(self.index)
+        else:
+            frame = self._render_target(self.index)
+        self.index += 1
+        self.pacer.wait()
+        return True, frame
+
+
+def open_source(
+    spec: str,
+    width: int | None = None,
+    height: int | None = None,
+    fps: float = 0.0,
+    loop: bool = False,
+) -> FrameSource:
+    """
+    Build a frame source from a spec string:
+      camera:0 (or just 0), video:clip.mp4, images:folder, synthetic:chessboard|aruco|shapes.
+    A bare path is treated as an image directory if it is a directory, otherwise as a video file.
+    """
+    kind, _, value = spec.partition(":")
+    if not value:
+        if spec.isdigit():
+            kind, value = "camera", spec
+        else:
+            kind, value = ("images" if os.path.isdir(spec) else "video"), spec
+
+    if kind == "camera":
+        return CameraSource(int(value or 0), width, height, fps)
+    if kind == "video":
+        return VideoFileSource(value, width, height, fps, loop)
+    if kind == "images":
+        return ImageDirectorySource(value, width, height, fps, loop)
+    if kind == "synthetic":
+        return SyntheticSource(value, width, height, fps or 30.0)
+    # Windows paths such as C:\clip.mp4 also contain a colon
+    if os.path.isdir(spec):
+        return ImageDirectorySource(spec, width, height, fps, loop)
+    return VideoFileSource(spec, width, height, fps, loop)
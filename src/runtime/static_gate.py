@@ -0,0 +1,92 @@
+from typing import Callable
+
+import cv2
+import numpy as np
+from cv2.typing import MatLike
+
+from mode_handlers.base import BaseModeHandler
+from mode_handlers.buffers import BufferPool
+from runtime.overlay import draw_status_text
+
+
+class StaticSceneGate:
+    """
+    Reuses the handler's previous output while the scene does not change.
+    Each frame is shrunk to a tiny gray probe (probe_width pixels wide) and compared with the probe of
+    the frame the cached output was computed from; if no probe pixel moved by more than threshold
+    gray levels and no tracker value changed, the cached output is returned instead of running the
+    handler. Comparing against that reference frame, not the previous one, keeps slow drift from
+    accumulating. Handlers with allow_static_reuse = False always run.
+    """
+
+    def __init__(self, threshold: float = 8.0, probe_width: int = 64, max_reuse: int = 0):
+        self.threshold = threshold
+        self.probe_width = probe_width
+        self.max_reuse = max_reuse  # Recompute after this many reused frames in a row (0 = never forced)
+        self.buffers = BufferPool()
+        self.hits = 0
+        self.misses = 0
+        self.reset()
+
+    def reset(self):
+        """Drop the cached output (e.g. after a handler switch)."""
+        self._key = None
+        self._reference: np.ndarray | None = None
+        self._cached: np.ndarray | None = None
+        self._reused = 0
+        # Probes alternate between two buffers, so a new probe never overwrites the reference one
+        self._probe_slot = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def _probe(self, frame: MatLike) -> np.ndarray:
+        height, width = frame.shape[:2]
+        size = (self.probe_width, max(1, round(height * self.probe_width / width)))
+        # Averaging every pixel is not needed for a probe this small; every step-th row and column will do
+        step = max(1, width // (self.probe_width * 4))
+        small = self.buffers.get("small", size[::-1] + frame.shape[2:], frame.dtype)
+        small = cv2.resize(frame[::step, ::step], size, dst=small, interpolation=cv2.INTER_AREA)
+        if small.ndim == 3:
+            code = cv2.COLOR_BGRA2GRAY if small.shape[2] == 4 else cv2.COLOR_BGR2GRAY
+            small = cv2.cvtColor(small, code, dst=self.buffers.get("probe_gray", size[::-1], frame.dtype))
+        probe = self.buffers.get(("probe", self._probe_slot), size[::-1], np.float32)
+        np.copyto(probe, small)
+        return probe
+
+    def process(self, handler: BaseModeHandler, frame: MatLike, run: Callable[[], MatLike]) -> MatLike:
+        """Return run()'s output, or the cached output if frame and handler parameters are unchanged."""
+        if not handler.allow_static_reuse:
+            return run()
+        key = (id(handler), handler.param_state(), frame.shape, frame.dtype)
+        probe = self._probe(frame)
+        if (
+            key == self._key
+            and self._cached is not None
+            and (self.max_reuse <= 0 or self._reused < self.max_reuse)
+            and cv2.norm(probe, self._reference, cv2.NORM_INF) <= self.threshold
+        ):
+            self.hits += 1
+            self._reused += 1
+            # Callers draw overlays on the returned frame, so hand out a copy and keep the cache clean
+            output = self.buffers.like("output", self._cached)
+            np.copyto(output, self._cached)
+            return output
+
+        self.misses += 1
+        output = run()
+        self._key = key
+        self._reference = probe
+        self._probe_slot ^= 1
+        self._cached = self.buffers.like("cached", output)
+        np.copyto(self._cached, output)
+        self._reused = 0
+        return output
+
+    def status(self) -> str:
+        return f"Static reuse {self.hit_rate:.0%} ({self.hits}/{self.hits + self.misses})"
+
+    def draw_status(self, frame: MatLike, line: int = 0) -> MatLike:
+        return draw_status_text(frame, self.status(), line)
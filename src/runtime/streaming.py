@@ -0,0 +1,172 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import cv2
+import numpy as np
+from cv2.typing import MatLike
+
+from mode_handlers.buffers import BufferPool
+from runtime.frames import to_bgr8
+
+BOUNDARY = "frame"
+INDEX_HTML = b"""<!doctype html>
+<html><head><title>AT82.08 CV stream</title></head>
+<body style="margin:0;background:#000"><img src="/stream.mjpg" style="max-width:100%"></body></html>
+"""
+
+
+class FrameBroadcaster:
+    """
+    Shares the latest processed frame with any number of HTTP clients.
+    publish() only copies the frame (and only while someone is watching); a single encoder thread
+    JPEG-encodes each new frame once, and every client sends the newest JPEG whenever it is ready
+    for one. A slow client simply skips frames, so the processing loop never waits on the network.
+    """
+
+    def __init__(self, quality: int = 80, idle_timeout: float = 2.0):
+        self.quality = quality
+        self.idle_timeout = idle_timeout  # Keep encoding this long after the last snapshot request
+        self._frame_seq = 0
+        self._latest_slot = 0  # Slot holding the newest published frame
+        self._encoding_slot: int | None = None  # Slot the encoder is reading, never written meanwhile
+        self._jpeg: bytes | None = None
+        self.jpeg_seq = 0
+        self._cond = threading.Condition()
+        self._stopping = False
+        self._wanted_until = 0.0
+        self._slots: list[np.ndarray | None] = [None, None]
+        self.buffers = BufferPool()  # Frame slots, written by publish()
+        self._encoder_buffers = BufferPool()  # BGR conversion, used by the encoder thread only
+        self.clients = 0
+        self.encoded = 0
+        self.sent = 0
+        self.skipped = 0  # Encoded frames a client never received because it was still busy
+        self._encoder = threading.Thread(target=self._encode_loop, name="stream-encoder", daemon=True)
+        self._encoder.start()
+
+    @property
+    def wanted(self) -> bool:
+        return self.clients > 0 or time.perf_counter() < self._wanted_until
+
+    def publish(self, frame: MatLike):
+        if not self.wanted:
+            return
+        with self._cond:
+            # Two slots: write the one the encoder is not reading. A frame that was not encoded yet
+            # is simply replaced by the newer one.
+            slot = 1 if self._encoding_slot == 0 else 0
+            self._slots[slot] = self.buffers.like(("frame", slot), frame)
+            np.copyto(self._slots[slot], frame)
+            self._latest_slot = slot
+            self._frame_seq += 1
+            self._cond.notify_all()
+
+    def _encode_loop(self):
+        encoded_seq = 0
+        params = [cv2.IMWRITE_JPEG_QUALITY, self.quality]
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._frame_seq != encoded_seq or self._stopping)
+                if self._stopping:
+                    return
+                encoded_seq = self._frame_seq
+                self._encoding_slot = self._latest_slot
+                frame = self._slots[self._encoding_slot]
+            # Encode outside the lock, so publish() and the clients never wait for it
+            ok, jpeg = cv2.imencode(".jpg", to_bgr8(frame, self._encoder_buffers), params)
+            with self._cond:
+                self._encoding_slot = None
+                if ok:
+                    self._jpeg = jpeg.tobytes()
+                    self.jpeg_seq += 1
+                    self.encoded += 1
+                    self._cond.notify_all()
+
+    def wait_jpeg(self, after_seq: int, timeout: float = 5.0) -> tuple[int, bytes | None]:
+        """Block until a JPEG newer than after_seq exists. Returns (seq, jpeg), jpeg None on timeout/stop."""
+        with self._cond:
+            self._cond.wait_for(lambda: self.jpeg_seq > after_seq or self._stopping, timeout)
+            if self.jpeg_seq <= after_seq:
+                return after_seq, None
+            self.skipped += self.jpeg_seq - after_seq - 1
+            return self.jpeg_seq, self._jpeg
+
+    def request_snapshot(self) -> tuple[int, bytes | None]:
+        """Newest JPEG for a single-frame request, waiting for a fresh frame if none is recent."""
+        with self._cond:
+            self._wanted_until = time.perf_counter() + self.idle_timeout
+            seq = self.jpeg_seq
+        return self.wait_jpeg(seq)
+
+    def stop(self):
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+        self._encoder.join(timeout=1.0)
+
+    def status(self) -> str:
+        return f"clients {self.clients}, encoded {self.encoded}, sent {self.sent}, skipped {self.skipped}"
+
+
+class StreamRequestHandler(BaseHTTPRequestHandler):
+    broadcaster: FrameBroadcaster  # Set on the subclass built by start_stream_server
+
+    def do_GET(self):
+        if self.path in ("/", "/index.html"):
+            self._send(200, "text/html", INDEX_HTML)
+        elif self.path.startswith("/frame.jpg"):
+            _, jpeg = self.broadcaster.request_snapshot()
+            if jpeg is None:
+                self._send(503, "text/plain", b"No frame available\n")
+            else:
+                self._send(200, "image/jpeg", jpeg)
+        elif self.path.startswith("/stream.mjpg"):
+            self._stream()
+        else:
+            self._send(404, "text/plain", b"Not found\n")
+
+    def _send(self, status: int, content_type: str, body: bytes):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _stream(self):
+        self.send_response(200)
+        self.send_header("Content-Type", f"multipart/x-mixed-replace; boundary={BOUNDARY}")
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        broadcaster = self.broadcaster
+        with broadcaster._cond:
+            broadcaster.clients += 1
+            seq = broadcaster.jpeg_seq  # Start with a fresh frame, not one encoded before this client came
+        try:
+            while not broadcaster._stopping:
+                seq, jpeg = broadcaster.wait_jpeg(seq)
+                if jpeg is None:
+                    continue
+                header = f"--{BOUNDARY}\r\nContent-Type: image/jpeg\r\nContent-Length: {len(jpeg)}\r\n\r\n"
+                self.wfile.write(header.encode() + jpeg + b"\r\n")
+                broadcaster.sent += 1
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        finally:
+            with broadcaster._cond:
+                broadcaster.clients -= 1
+
+    def log_message(self, format, *args):
+        # One line per request would flood the console during streaming
+        pass
+
+
+def start_stream_server(host: str, port: int, quality: int = 80) -> tuple[ThreadingHTTPServer, FrameBroadcaster]:
+    """Serve / (viewer page), /stream.mjpg and /frame.jpg on a background thread."""
+    broadcaster = FrameBroadcaster(quality)
+    handler_class = type("BoundStreamRequestHandler", (StreamRequestHandler,), {"broadcaster": broadcaster})
+    server = ThreadingHTTPServer((host, port), handler_class)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="stream-server", daemon=True).start()
+    return server, broadcaster
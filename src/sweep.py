@@ -0,0 +1,233 @@
+"""
+Parameter sweeps: run one mode_map handler over a clip for many parameter combinations in parallel.
+
+Examples (run from src/):
+    python sweep.py clip.mp4 --mode 5 --sweep "Canny Threshold1=0:250:25" --sweep "Canny Threshold2=50:300:50"
+    python sweep.py clip.mp4 --mode 7 --submode e --sweep "Param1 (1-255)" --sweep "Param2 (1-100)" --samples 200
+    python sweep.py frames/ --mode 7 --submode q --steps 4 --out harris.csv
+
+--sweep takes NAME=START:STOP[:STEP], NAME=V1,V2,... or just NAME for the trackbar's whole range in
+--steps values. Without --sweep every parameter of the handler is swept; pipeline stage parameters are
+numbered ("2:Canny Threshold1"). Slider positions the handler maps to the same value (e.g. 0 and 1 for a
+threshold clamped to >= 1) run once, and the CSV shows the value used next to the slider position. --samples N evaluates a random
+sample of N combinations instead of the full grid. Frames are decoded once and handed to every worker;
+each combination reports its processing time and simple output statistics (non-zero pixels of
+single-channel outputs such as edge maps, detected lines/circles/corner pixels) in a CSV table.
+"""
+
+import argparse
+import csv
+import itertools
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import cv2
+import numpy as np
+
+from runtime.headless import build_handler, parse_params
+from runtime.presets import preset_params
+from runtime.sources import open_source
+
+# Set once per worker process by init_worker, so frames are not pickled with every task
+_frames: list[np.ndarray] = []
+_job: dict = {}
+
+
+def parse_sweep(spec: str, minimum: int, maximum: int, steps: int) -> list[int]:
+    """Candidate values for one --sweep entry (the part after NAME=), limited to the trackbar range."""
+    if not spec:
+        values = np.linspace(minimum, maximum, max(1, steps)).round().astype(int).tolist()
+    elif ":" in spec:
+        parts = [int(part) for part in spec.split(":")]
+        start, stop = parts[0], parts[1]
+        step = parts[2] if len(parts) > 2 else max(1, (stop - start) // max(1, steps - 1))
+        values = list(range(start, stop + 1, step))
+    else:
+        values = [int(value) for value in spec.split(",")]
+    return sorted({max(minimum, min(maximum, value)) for value in values})
+
+
+def build_grid(axes: dict[str, list[int]], samples: int, seed: int) -> list[dict[str, int]]:
+    """Every combination of the axes, or `samples` distinct random ones if the grid is larger."""
+    names = list(axes)
+    total = int(np.prod([len(values) for values in axes.values()]))
+    if samples <= 0 or samples >= total:
+        return [dict(zip(names, combo)) for combo in itertools.product(*axes.values())]
+    rng = random.Random(seed)
+    combos = set()
+    while len(combos) < samples:
+        combos.add(tuple(rng.choice(values) for values in axes.values()))
+    return [dict(zip(names, combo)) for combo in sorted(combos)]
+
+
+def effective_values(handler, name: str, candidates: list[int]) -> dict[int, object]:
+    """
+    Slider position -> value the handler uses (Tracker.converted_value), for the first position of each
+    distinct value.
+    """
+    tracker, trackbar = handler.param_items()[name]
+    param = handler.param(name)
+    original = param.value
+    values = {}
+    for raw in candidates:
+        # Move away first: setting the current position again does not call the tracker
+        handler.set_param(name, param.minimum if raw != param.minimum else param.maximum)
+        handler.set_param(name, raw)
+        value = tracker.converted_value(trackbar)
+        if value not in values.values():
+            values[raw] = value
+    handler.set_param(name, original)
+    return values
+
+
+def load_frames(source: str, count: int, step: int) -> list[np.ndarray]:
+    cap = open_source(source)
+    frames = []
+    index = 0
+    while len(frames) < count:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        if index % step == 0:
+            frames.append(frame)
+        index += 1
+    cap.release()
+    return frames
+
+
+def init_worker(frames: list[np.ndarray], job: dict):
+    global _frames, _job
+    # Combinations already run in parallel; OpenCV's own thread pool would oversubscribe the cores
+    cv2.setNumThreads(job["threads"])
+    _frames, _job = frames, job
+
+
+def evaluate(combo: dict[str, int]) -> dict:
+    """Worker: run the handler with one parameter combination over every frame."""
+    height, width = _frames[0].shape[:2]
+    handler = build_handler(_job["mode"], _job["submode"], {**_job["params"], **combo}, width, height)
+    # Warm-up: buffers are allocated on the first frame, which would skew short clips
+    handler.process_frame(_frames[0])
+    times, nonzero, intensity, detections = [], [], [], []
+    for frame in _frames:
+        start = time.perf_counter()
+        output = handler.process_frame(frame)
+        times.append(time.perf_counter() - start)
+        if output.ndim == 2:
+            nonzero.append(cv2.countNonZero(output))
+        intensity.append(float(np.mean(output)))
+        if handler.detections is not None:
+            detections.append(handler.detections)
+    times_ms = np.array(times) * 1000
+    return {
+        **combo,
+        "ms_mean": round(float(times_ms.mean()), 3),
+        "ms_p95": round(float(np.percentile(times_ms, 95)), 3),
+        "nonzero_mean": round(float(np.mean(nonzero)), 1) if nonzero else "",
+        "intensity_mean": round(float(np.mean(intensity)), 2),
+        "detections_mean": round(float(np.mean(detections)), 2) if detections else "",
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Evaluate a handler over a grid of parameter values in parallel")
+    parser.add_argument("source", help="Clip to evaluate on: video file, image folder or synthetic:<pattern>")
+    parser.add_argument("--mode", required=True, help="Mode key from mode_map, e.g. 5")
+    parser.add_argument("--submode", default="q", help="Submode key, e.g. q (default: q)")
+    parser.add_argument(
+        "--sweep",
+        action="append",
+        default=[],
+        metavar="NAME[=RANGE]",
+        help='Swept trackbar: "NAME=START:STOP[:STEP]", "NAME=V1,V2,..." or "NAME" (repeatable, default: all)',
+    )
+    parser.add_argument(
+        "--param",
+        action="append",
+        default=[],
+        metavar="NAME=VALUE",
+        help='Fixed trackbar value for parameters that are not swept (repeatable)',
+    )
+    parser.add_argument("--preset", default=None, help="Preset file for the fixed values; --param overrides it")
+    parser.add_argument("--steps", type=int, default=5, help="Values per parameter swept over its whole range")
+    parser.add_argument("--samples", type=int, default=0, help="Random sample of this many combinations (0 = grid)")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for --samples")
+    parser.add_argument("--frames", type=int, default=30, help="Frames of the clip to evaluate each combination on")
+    parser.add_argument("--frame-step", type=int, default=1, help="Use every Nth frame of the clip")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Worker processes (default: all cores)")
+    parser.add_argument("--out", default="sweep.csv", help="Results table (CSV)")
+    parser.add_argument("--sort", default="ms_mean", help="Column to sort the printed summary by")
+    parser.add_argument("--top", type=int, default=10, help="Rows of the summary to print")
+    args = parser.parse_args()
+
+    params = {**preset_params(args.preset, args.mode, args.submode), **parse_params(args.param)}
+    frames = load_frames(args.source, args.frames, max(1, args.frame_step))
+    if not frames:
+        raise RuntimeError(f"No frames read from {args.source}")
+    height, width = frames[0].shape[:2]
+
+    # Ranges come from the trackbars the handler declares (pipeline stage parameters are numbered, "2:...")
+    handler = build_handler(args.mode, args.submode, params, width, height)
+    if not handler.param_names():
+        raise ValueError(f"Mode {args.mode}{args.submode} has no parameters to sweep")
+    axes = {}
+    effective = {}
+    for item in args.sweep or handler.param_names():
+        name, _, spec = item.partition("=")
+        name = handler.resolve_param_name(name.strip())
+        param = handler.param(name)
+        candidates = parse_sweep(spec.strip(), param.minimum, param.maximum, args.steps)
+        # Slider positions the handler clamps or rounds to the same value would only repeat a run
+        effective[name] = effective_values(handler, name, candidates)
+        axes[name] = list(effective[name])
+    grid = build_grid(axes, args.samples, args.seed)
+
+    workers = max(1, min(args.workers or 1, len(grid)))
+    job = {
+        "mode": args.mode,
+        "submode": args.submode,
+        "params": params,
+        "threads": 1 if workers > 1 else -1,
+    }
+    print(
+        f"Evaluating {len(grid)} combinations of {', '.join(axes)} on {len(frames)} frames "
+        f"({width}x{height}) with {workers} workers..."
+    )
+
+    start_time = time.perf_counter()
+    results = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(frames, job)) as executor:
+        chunksize = max(1, len(grid) // (workers * 8))
+        for i, result in enumerate(executor.map(evaluate, grid, chunksize=chunksize), 1):
+            results.append(result)
+            if i % max(1, len(grid) // 10) == 0 or i == len(grid):
+                elapsed = time.perf_counter() - start_time
+                print(f"  {i}/{len(grid)} done, {elapsed:.1f}s elapsed, ~{elapsed / i * (len(grid) - i):.0f}s left")
+
+    # Next to each slider position, the value the handler actually used where they differ
+    converted = [name for name in axes if any(raw != value for raw, value in effective[name].items())]
+    for row in results:
+        for name in converted:
+            row[f"{name} (value)"] = effective[name][row[name]]
+    names = [column for name in axes for column in ([name, f"{name} (value)"] if name in converted else [name])]
+    columns = names + ["ms_mean", "ms_p95", "nonzero_mean", "intensity_mean", "detections_mean"]
+    with open(args.out, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=columns)
+        writer.writeheader()
+        writer.writerows(results)
+    elapsed = time.perf_counter() - start_time
+    print(f"Wrote {len(results)} rows to {args.out} in {elapsed:.1f}s")
+
+    if args.sort not in columns:
+        raise KeyError(f"Unknown --sort column '{args.sort}', available: {columns}")
+    ranked = sorted(results, key=lambda row: (row[args.sort] == "", row[args.sort]))
+    widths = [max(len(column), 8) for column in columns]
+    print("  ".join(column.rjust(w) for column, w in zip(columns, widths)))
+    for row in ranked[: args.top]:
+        print("  ".join(str(row[column]).rjust(w) for column, w in zip(columns, widths)))
+
+
+if __name__ == "__main__":
+    main()